@@ -0,0 +1,116 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from models.entities import Base, Clip, Playlist, Profile, playlist_clips
+from services.loading import STRATEGIES, profile_options
+from services.mappers import to_profile_dto
+from storage.projections import profile_page
+
+PROJECTED = "columns"
+
+
+def seed(session_factory, clips: int, playlists: int, per_playlist: int) -> str:
+    profile_id = uuid.uuid4()
+    clip_ids = [uuid.uuid4() for _ in range(clips)]
+    db = session_factory()
+    try:
+        db.add(Profile(id=profile_id, handle="bench", display_name="Bench"))
+        db.execute(Clip.__table__.insert(), [
+            {"id": clip_id, "profile_id": profile_id, "title": f"clip {i}", "clip_metadata": {"tags": "bench"}}
+            for i, clip_id in enumerate(clip_ids)
+        ])
+        playlist_ids = [uuid.uuid4() for _ in range(playlists)]
+        db.execute(Playlist.__table__.insert(), [
+            {"id": playlist_id, "profile_id": profile_id, "name": f"playlist {i}"}
+            for i, playlist_id in enumerate(playlist_ids)
+        ])
+        db.execute(playlist_clips.insert(), [
+            {"playlist_id": playlist_id, "clip_id": clip_ids[(i * per_playlist + j) % clips]}
+            for i, playlist_id in enumerate(playlist_ids)
+            for j in range(per_playlist)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return "bench"
+
+
+def count_rows(engine, statements) -> int:
+    rows = 0
+    with engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        for statement, parameters in statements:
+            rows += len(raw.execute(statement, parameters).fetchall())
+    return rows
+
+
+def load_profile(db, handle: str, strategy: str):
+    if strategy == PROJECTED:
+        return profile_page(db, 1)[0][0]
+    return db.query(Profile).options(*profile_options(strategy)).filter(Profile.handle == handle).first()
+
+
+def measure(engine, session_factory, handle: str, strategy: str, repeat: int) -> dict:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    timings = []
+    for attempt in range(repeat):
+        if attempt == 0:
+            event.listen(engine, "before_cursor_execute", capture)
+        db = session_factory()
+        started = time.perf_counter()
+        try:
+            to_profile_dto(load_profile(db, handle, strategy))
+        finally:
+            db.close()
+        timings.append(time.perf_counter() - started)
+        if attempt == 0:
+            event.remove(engine, "before_cursor_execute", capture)
+
+    timings.sort()
+    return {
+        "strategy": strategy,
+        "statements": len(statements),
+        "rows": count_rows(engine, statements),
+        "median_ms": timings[len(timings) // 2] * 1000,
+        "min_ms": timings[0] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ORM loading strategies on a synthetic large profile')
+    parser.add_argument('--clips', type=int, default=300, help='Clips owned by the profile')
+    parser.add_argument('--playlists', type=int, default=10, help='Playlists owned by the profile')
+    parser.add_argument('--per-playlist', type=int, default=30, help='Clips in each playlist')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per strategy')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        handle = seed(session_factory, args.clips, args.playlists, args.per_playlist)
+
+        print(f"Profile with {args.clips} clips, {args.playlists} playlists x {args.per_playlist} clips")
+        print(f"{'strategy':<10}{'statements':>12}{'rows':>12}{'median ms':>12}{'min ms':>10}")
+        for strategy in (*STRATEGIES, PROJECTED):
+            result = measure(engine, session_factory, handle, strategy, args.repeat)
+            print(f"{result['strategy']:<10}{result['statements']:>12}{result['rows']:>12}"
+                  f"{result['median_ms']:>12.1f}{result['min_ms']:>10.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
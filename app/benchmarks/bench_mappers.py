@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.entities import Clip, Playlist, Profile
+from services.mappers import ClipIndex, create_clips_dto_from_playlist, to_playlist_dto
+
+
+def build(clips: int, playlists: int, per_playlist: int) -> Profile:
+    profile = Profile(id=uuid.uuid4(), handle="bench", display_name="Bench")
+    profile.clips = [
+        Clip(id=uuid.uuid4(), title=f"clip {i}", clip_metadata={"tags": "bench"})
+        for i in range(clips)
+    ]
+    profile.playlists = [Playlist(id=uuid.uuid4(), name=f"playlist {i}") for i in range(playlists)]
+    for i, playlist in enumerate(profile.playlists):
+        playlist.clips = [profile.clips[(i * per_playlist + j) % clips] for j in range(per_playlist)]
+    return profile
+
+
+def quadratic(profile: Profile) -> list:
+    return [
+        create_clips_dto_from_playlist([clip for clip in profile.clips if clip in playlist.clips])
+        for playlist in profile.playlists
+    ]
+
+
+def indexed(profile: Profile) -> list:
+    index = ClipIndex(profile.clips)
+    return [to_playlist_dto(playlist, index=index).clips for playlist in profile.playlists]
+
+
+def measure(fn, profile: Profile, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(profile)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {"median_ms": timings[len(timings) // 2] * 1000, "min_ms": timings[0] * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare playlist membership in the DTO mappers')
+    parser.add_argument('--clips', type=int, default=1000, help='Clips owned by the profile')
+    parser.add_argument('--playlists', type=int, default=50, help='Playlists owned by the profile')
+    parser.add_argument('--per-playlist', type=int, default=100, help='Clips in each playlist')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per implementation')
+    args = parser.parse_args()
+
+    profile = build(args.clips, args.playlists, args.per_playlist)
+    print(f"Profile with {args.clips} clips, {args.playlists} playlists x {args.per_playlist} clips")
+    print(f"{'mapper':<12}{'median ms':>12}{'min ms':>10}")
+    for name, fn in (("quadratic", quadratic), ("indexed", indexed)):
+        result = measure(fn, profile, args.repeat)
+        print(f"{name:<12}{result['median_ms']:>12.1f}{result['min_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from config.async_session import get_async_db_sqlite, get_async_db_sqlite_read
+from config.settings import settings
+from main import create_app
+from models.entities import Base
+from services.responses import RENDERERS, renderer_available
+from storage import SqlRepository, get_json_repository
+
+ENDPOINTS = (
+    ("/api/v1/profiles", {"limit": 100}),
+    ("/api/v1/playlists", {"limit": 100}),
+    ("/api/v1/clips", {"size": 500, "sort": "id"}),
+    ("/api/v2/profiles", {"size": 100}),
+)
+
+
+def profile_payload(index: int, clips: int, playlists: int) -> dict:
+    import uuid
+    clip_items = [
+        {"id": str(uuid.uuid4()), "title": f"clip {index}-{i}", "audio_url": f"https://cdn.example/{index}/{i}.mp3",
+         "metadata": {"tags": "bench, pop", "prompt": "la " * 40, "duration": 180.5}}
+        for i in range(clips)
+    ]
+    return {
+        "user_id": str(uuid.uuid4()),
+        "handle": f"bench{index:04d}",
+        "display_name": f"Bench {index}",
+        "clips": clip_items,
+        "playlists": [
+            {"id": str(uuid.uuid4()), "name": f"playlist {i}", "playlist_clips": [{"clip": clip} for clip in clip_items[i::playlists]]}
+            for i in range(playlists)
+        ],
+    }
+
+
+def measure(client: TestClient, path: str, params: dict, repeat: int) -> dict:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, params=params)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        size = len(response.content)
+    timings.sort()
+    return {"median_ms": timings[len(timings) // 2] * 1000, "min_ms": timings[0] * 1000, "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON renderers on the largest list endpoints')
+    parser.add_argument('--profiles', type=int, default=100, help='Profiles to seed')
+    parser.add_argument('--clips', type=int, default=20, help='Clips per profile')
+    parser.add_argument('--playlists', type=int, default=3, help='Playlists per profile')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed requests per endpoint and renderer')
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        payloads = [profile_payload(i, args.clips, args.playlists) for i in range(args.profiles)]
+        repository = SqlRepository(session_factory(), owns_session=True)
+        repository.save_profiles(payloads)
+        repository.close()
+
+        settings.json_storage_dir = os.path.join(directory, "json")
+        get_json_repository.cache_clear()
+        get_json_repository().save_profiles(payloads)
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+        async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override():
+            async with async_sessions() as db:
+                yield db
+
+        print(f"{args.profiles} profiles x {args.clips} clips, {args.playlists} playlists")
+        print(f"{'endpoint':<20}{'renderer':<10}{'median ms':>12}{'min ms':>10}{'bytes':>12}")
+        for path, params in ENDPOINTS:
+            for renderer in RENDERERS:
+                if not renderer_available(renderer):
+                    continue
+                app = create_app(renderer)
+                app.dependency_overrides[get_async_db_sqlite] = override
+                app.dependency_overrides[get_async_db_sqlite_read] = override
+                client = TestClient(app)
+                client.get(path, params=params)
+                result = measure(client, path, params, args.repeat)
+                print(f"{path:<20}{renderer:<10}{result['median_ms']:>12.1f}{result['min_ms']:>10.1f}{result['bytes']:>12}")
+        get_json_repository.cache_clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from typing import Dict
+
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from config.session import set_read_only, sqlite_pragmas
+from config.settings import settings
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+class ReadOnlySession(Session):
+    pass
+
+
+event.listen(ReadOnlySession, "after_begin", set_read_only)
+
+_engines: Dict[str, AsyncEngine] = {}
+_sessions: Dict[str, async_sessionmaker] = {}
+
+
+def async_url(url: str) -> str:
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def create_async_sqlite_engine(path: str, read_only: bool = False, pool_size: int = 5, tuned: bool = True) -> AsyncEngine:
+    engine = create_async_engine(
+        async_url(f"sqlite:///{path}"),
+        connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000},
+        pool_size=pool_size,
+        max_overflow=pool_size,
+    )
+    if tuned:
+        pragmas = sqlite_pragmas(read_only)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return engine
+
+
+def create_async_postgres_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        async_url(url),
+        pool_size=settings.async_pool_size,
+        max_overflow=settings.async_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=300,
+    )
+
+
+ENGINE_FACTORIES = {
+    "sqlite": lambda: create_async_sqlite_engine(settings.sqlite_path, pool_size=settings.sqlite_write_pool_size, tuned=settings.sqlite_tuned),
+    "sqlite_read": lambda: create_async_sqlite_engine(settings.sqlite_path, read_only=True, pool_size=settings.sqlite_read_pool_size, tuned=settings.sqlite_tuned),
+    "postgres": lambda: create_async_postgres_engine(settings.postgres_url),
+}
+
+
+def get_async_engine(name: str) -> AsyncEngine:
+    engine = _engines.get(name)
+    if engine is None:
+        try:
+            engine = ENGINE_FACTORIES[name]()
+        except ImportError as e:
+            logger.warning(f"Async driver for {name} is not installed: {e}")
+            raise HTTPException(status_code=503, detail=f"Async {name} database unavailable")
+        _engines[name] = engine
+    return engine
+
+
+def get_async_sessionmaker(name: str, read_only: bool = False) -> async_sessionmaker:
+    key = f"{name}:ro" if read_only else name
+    sessions = _sessions.get(key)
+    if sessions is None:
+        sessions = async_sessionmaker(
+            get_async_engine(name),
+            autoflush=False,
+            expire_on_commit=False,
+            sync_session_class=ReadOnlySession if read_only else Session,
+        )
+        _sessions[key] = sessions
+    return sessions
+
+
+async def _session(name: str, read_only: bool = False):
+    db = get_async_sessionmaker(name, read_only)()
+    try:
+        yield db
+    finally:
+        if read_only:
+            await db.rollback()
+        await db.close()
+
+
+async def get_async_db_sqlite():
+    async for db in _session("sqlite"):
+        yield db
+
+
+async def get_async_db_sqlite_read():
+    async for db in _session("sqlite_read"):
+        yield db
+
+
+async def get_async_db_pg():
+    async for db in _session("postgres"):
+        yield db
+
+
+async def get_async_db_pg_read():
+    async for db in _session("postgres", read_only=True):
+        yield db
+
+
+async def dispose_async_engines():
+    engines = list(_engines.values())
+    _engines.clear()
+    _sessions.clear()
+    for engine in engines:
+        await engine.dispose()
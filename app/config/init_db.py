@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from models.entities import Base
 from config.session import engine_embed, engine_postgres
+from config.migrations import migrate
 
 
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +20,7 @@ def init_db(engine: Engine):
             # We'll check if the tables exist and have the right columns
             Base.metadata.create_all(engine)
             logger.info(f"Database tables created or updated successfully for SQLite!")
+            migrate(engine)
         else:
             # For PostgreSQL, use the original logic
             inspector = inspect(engine)
@@ -33,6 +35,7 @@ def init_db(engine: Engine):
                 logger.info(f"Missing tables: {missing_tables}")
                 Base.metadata.create_all(engine)
                 logger.info(f"Database tables created successfully!")
+            migrate(engine)
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         if "postgres" in str(engine.url):
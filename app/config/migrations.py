@@ -0,0 +1,116 @@
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Engine, Integer, MetaData, String, Table, select, text
+from sqlalchemy.exc import IntegrityError
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+logger = logging.getLogger(__name__)
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations", migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Advisory lock key shared by every worker migrating the same Postgres database.
+MIGRATION_LOCK_KEY = 0x5350_4D49
+
+# Frozen at the indexes migration 1 shipped with; new model indexes get a new migration.
+HOT_LOOKUP_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_playlist_clips_clip_id ON playlist_clips (clip_id)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_profile_id ON clips (profile_id)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_user_id ON clips (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_created_at_id ON clips (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_play_count_id ON clips (play_count, id)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_upvote_count_id ON clips (upvote_count, id)",
+    "CREATE INDEX IF NOT EXISTS ix_playlists_profile_id ON playlists (profile_id)",
+    "CREATE INDEX IF NOT EXISTS ix_playlists_upvote_count_id ON playlists (upvote_count, id)",
+    "CREATE INDEX IF NOT EXISTS ix_entity_fetches_type_fetched_at ON entity_fetches (entity_type, fetched_at)",
+]
+
+POSTGRES_ORDER_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_clips_created_at_desc ON clips (created_at DESC NULLS LAST, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_play_count_desc ON clips (play_count DESC NULLS LAST, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_clips_upvote_count_desc ON clips (upvote_count DESC NULLS LAST, id DESC)",
+]
+
+
+def create_hot_lookup_indexes(conn):
+    for statement in HOT_LOOKUP_INDEXES:
+        conn.execute(text(statement))
+
+
+def create_postgres_order_indexes(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    for statement in POSTGRES_ORDER_INDEXES:
+        conn.execute(text(statement))
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "hot lookup indexes", create_hot_lookup_indexes),
+    (2, "postgres keyset order indexes", create_postgres_order_indexes),
+]
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Serializes migrate() across the workers that all run it at startup."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    elif engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+        from filelock import FileLock
+
+        with FileLock(f"{engine.url.database}.migrate.lock"):
+            yield
+    else:
+        yield
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    migration_metadata.create_all(engine)
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version))]
+
+
+def migrate(engine: Engine) -> List[int]:
+    with migration_lock(engine):
+        applied = set(applied_versions(engine))
+        ran = []
+        for version, name, upgrade in MIGRATIONS:
+            if version in applied:
+                continue
+            try:
+                with engine.begin() as conn:
+                    upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(
+                        version=version, name=name, applied_at=datetime.now(timezone.utc).replace(tzinfo=None)
+                    ))
+            except IntegrityError:
+                # A process that does not share the lock recorded it first.
+                logger.info(f"Migration {version} was already applied: {name}")
+                continue
+            logger.info(f"Applied migration {version}: {name}")
+            ran.append(version)
+        return ran
+
+
+if __name__ == "__main__":
+    from config.session import engine_embed, engine_postgres
+    for engine in (engine_embed, engine_postgres):
+        if engine is not None:
+            logger.info(f"Migrations applied to {engine.url.render_as_string()}: {migrate(engine)}")
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from config.settings import settings
 from fastapi import HTTPException
@@ -27,12 +27,46 @@ try:
 except Exception as e:
     logger.warning(f"Unexpected error creating PostgreSQL engine: {e}.")
 
-os.makedirs("app", exist_ok=True)
+def sqlite_pragmas(read_only: bool = False) -> list:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size={settings.sqlite_cache_size}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
 
-engine_embed = create_engine(
-    "sqlite:///app/suno.db",
-    connect_args={"check_same_thread": False}
-)
+
+def create_sqlite_engine(path: str, read_only: bool = False, pool_size: int = 5, tuned: bool = True):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+        pool_size=pool_size,
+        max_overflow=pool_size,
+    )
+    if tuned:
+        pragmas = sqlite_pragmas(read_only)
+
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return engine
+
+
+engine_embed = create_sqlite_engine(settings.sqlite_path, pool_size=settings.sqlite_write_pool_size, tuned=settings.sqlite_tuned)
 
 try:
     if engine_postgres is not None and "memory" not in str(engine_postgres.url):
@@ -42,6 +76,13 @@ try:
 except:
     raise HTTPException(status_code=503, detail="PostgreSQL service unavailable")
 
+
+
+def set_read_only(session, transaction, connection):
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_embed)
 
 
@@ -61,3 +102,4 @@ def get_db_sqlite():
         yield db
     finally:
         db.close()
+
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 import os
-from typing import Union
+from typing import Optional, Union
 from pydantic import field_validator
 
 
@@ -48,6 +48,70 @@ class Settings(BaseSettings):
     
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     log_file: str = os.getenv("LOG_FILE", "app.log")
+
+    suno_api_url: str = os.getenv("SUNO_API_URL", "https://studio-api.prod.suno.com/api")
+    upstream_timeout: float = 3.0
+    upstream_connect_timeout: float = 3.0
+    upstream_max_connections: int = 100
+    upstream_max_keepalive_connections: int = 20
+    upstream_keepalive_expiry: float = 30.0
+    upstream_http2: bool = True
+    upstream_rate_limit: float = 10.0
+    upstream_burst: int = 10
+    upstream_max_in_flight: int = 20
+    upstream_min_rate: float = 0.5
+
+    clip_ttl_seconds: int = 3600
+    profile_ttl_seconds: int = 21600
+    playlist_ttl_seconds: int = 21600
+
+    refresh_enabled: bool = True
+    refresh_interval_seconds: float = 30.0
+    refresh_budget: int = 20
+    refresh_lock_path: Optional[str] = os.getenv("REFRESH_LOCK_PATH", "app/refresh.lock")
+
+    http_cache_enabled: bool = True
+    http_cache_path: str = os.getenv("HTTP_CACHE_PATH", "app/http_cache.db")
+
+    breaker_failure_rate: float = 0.5
+    breaker_window_seconds: float = 30.0
+    breaker_min_calls: int = 5
+    breaker_open_seconds: float = 15.0
+    breaker_half_open_calls: int = 1
+
+    singleflight_lock_dir: Optional[str] = os.getenv("SINGLEFLIGHT_LOCK_DIR")
+    singleflight_lock_timeout: float = 30.0
+
+    sqlite_path: str = os.getenv("SQLITE_PATH", "app/suno.db")
+    sqlite_tuned: bool = True
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size: int = -65536
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_write_pool_size: int = 4
+    sqlite_read_pool_size: int = 16
+
+    storage_backend: str = os.getenv("STORAGE_BACKEND", "sqlite")
+    json_storage_dir: str = os.getenv("JSON_STORAGE_DIR", "json")
+    json_cache_size: int = 1024
+
+    write_behind_enabled: bool = False
+    write_behind_backend: str = "sqlite"
+    write_behind_journal: Optional[str] = os.getenv("WRITE_BEHIND_JOURNAL")
+    write_behind_batch_size: int = 200
+    write_behind_flush_interval: float = 0.5
+    write_behind_fsync: bool = False
+
+    json_renderer: str = os.getenv("JSON_RENDERER", "orjson")
+
+    dto_cache_enabled: bool = True
+    dto_cache_size: int = 1024
+    dto_cache_max_bytes: int = 67108864
+
+    async_pool_size: int = 20
+    async_max_overflow: int = 10
+
+    orm_loading_strategy: str = os.getenv("ORM_LOADING_STRATEGY", "selectin")
     
     @field_validator('debug', mode='before')
     @classmethod
@@ -3,6 +3,7 @@ import os
 import uvicorn
 import argparse
 from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -13,16 +14,35 @@ from v2 import router as api_v2_router
 from v3 import router as api_v3_router
 from config.init_db import init_db
 from config.session import engine_embed, engine_postgres
+from config.async_session import dispose_async_engines
+from services.http_client import close_client
+from services.responses import response_class
+from services.refresh_scheduler import refresh_scheduler
+from services.write_behind import write_behind
+from config.settings import settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db(engine_embed)
     init_db(engine_postgres)
+    if settings.write_behind_enabled:
+        write_behind.start()
+    if settings.refresh_enabled:
+        refresh_scheduler.start()
     yield
+    await refresh_scheduler.stop()
+    await write_behind.stop()
+    await close_client()
+    await dispose_async_engines()
 
-def create_app():
-    app = FastAPI(title="Suno Prompt Generator API", version="1.0", lifespan=lifespan)
+def create_app(json_renderer: Optional[str] = None):
+    app = FastAPI(
+        title="Suno Prompt Generator API",
+        version="1.0",
+        lifespan=lifespan,
+        default_response_class=response_class(json_renderer),
+    )
     
     app.add_middleware(
         CORSMiddleware,
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Table, UUID
+from sqlalchemy import JSON, Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Index, Table, UUID
 from sqlalchemy.orm import declarative_base, relationship
 
 
@@ -9,6 +9,7 @@ playlist_clips = Table(
     "playlist_clips", Base.metadata,
     Column("playlist_id", UUID(as_uuid=True), ForeignKey("playlists.id"), primary_key=True),
     Column("clip_id", UUID(as_uuid=True), ForeignKey("clips.id"), primary_key=True),
+    Index("ix_playlist_clips_clip_id", "clip_id"),
 )
 
 
@@ -25,6 +26,13 @@ class Profile(Base):
 
 class Clip(Base):
     __tablename__ = "clips"
+    __table_args__ = (
+        Index("ix_clips_profile_id", "profile_id"),
+        Index("ix_clips_user_id", "user_id"),
+        Index("ix_clips_created_at_id", "created_at", "id"),
+        Index("ix_clips_play_count_id", "play_count", "id"),
+        Index("ix_clips_upvote_count_id", "upvote_count", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True)
     profile_id = Column(UUID(as_uuid=True), ForeignKey("profiles.id"))
     title = Column(String)
@@ -74,6 +82,10 @@ class Clip(Base):
 
 class Playlist(Base):
     __tablename__ = "playlists"
+    __table_args__ = (
+        Index("ix_playlists_profile_id", "profile_id"),
+        Index("ix_playlists_upvote_count_id", "upvote_count", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True)
     profile_id = Column(UUID(as_uuid=True), ForeignKey("profiles.id"))
     name = Column(String)
@@ -171,6 +183,16 @@ class PromptTemplateTag(Base):
     created_at = Column(DateTime)
 
 
+class EntityFetch(Base):
+    __tablename__ = "entity_fetches"
+    __table_args__ = (
+        Index("ix_entity_fetches_type_fetched_at", "entity_type", "fetched_at"),
+    )
+    entity_type = Column(String, primary_key=True)
+    entity_id = Column(String, primary_key=True)
+    fetched_at = Column(DateTime)
+
+
 class PlaylistClip(Base):
     __tablename__ = "playlist_clips_entity"
     id = Column(String(36), primary_key=True)
@@ -1,10 +1,11 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 
 
 class TagResponse(BaseModel):
-    id: str
+    id: UUID
     name: str
     description: Optional[str]
     tag_type: Optional[str]
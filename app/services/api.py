@@ -1,10 +1,28 @@
-import requests
+import asyncio
 import json
 import os
 
+from services.http_client import get_json_response
+from services.circuit_breaker import CircuitOpenError, get_breaker
+from services.metrics import classify_error, upstream_metrics
 from config.logging_config import get_logger
 logger = get_logger(__name__)
 
+PROFILE_PARAMS = {"playlists_sort_by": "upvote_count", "clips_sort_by": "created_at"}
+
+
+class Snapshot(dict):
+    pass
+
+
+def is_live(data) -> bool:
+    return bool(data) and not isinstance(data, Snapshot)
+
+
+def is_snapshot(data) -> bool:
+    return bool(data) and isinstance(data, Snapshot)
+
+
 def save_to_file_json(folder_name, filename, data):
     folder = f"json/{folder_name}"
     logger.info(f"Saved: {folder_name}/{filename}")
@@ -13,39 +31,41 @@ def save_to_file_json(folder_name, filename, data):
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
 
-def fetch_clip_from_suno(clip_id: str) -> dict:
+def load_from_file_json(folder_name, filename) -> dict:
+    path = os.path.join(f"json/{folder_name}", f"{os.path.basename(filename)}.json")
     try:
-        url = "https://studio-api.prod.suno.com/api/clip/" + clip_id
-        r = requests.get(url, timeout=3)
-        r.raise_for_status()
-        logger.info(f"Successfully fetched clip: {clip_id}")
-        save_to_file_json("clips", clip_id, r.json())
-        return r.json()
-    except Exception:
-        logger.info(f"Fail fetched clip: {clip_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        logger.info(f"Loaded snapshot: {folder_name}/{filename}")
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
         return {}
 
-def fetch_profile_from_suno(handle: str) -> dict:
+async def fetch_from_suno(folder_name: str, key: str, path: str, params: dict = None) -> dict:
     try:
-        url = "https://studio-api.prod.suno.com/api/profiles/" + handle
-        params = {"playlists_sort_by": "upvote_count", "clips_sort_by": "created_at"}
-        r = requests.get(url, params=params, timeout=3)
-        r.raise_for_status()
-        logger.info(f"Successfully fetched profile: {handle}")
-        save_to_file_json("profiles", handle, r.json())
-        return r.json()
-    except Exception:
-        logger.info(f"Fail fetched profile: {handle}")
-        return {}
+        response = await get_breaker(folder_name).call(lambda: get_json_response(path, params=params))
+        if response.not_modified:
+            logger.info(f"Not modified {folder_name}: {key}")
+        else:
+            logger.info(f"Successfully fetched {folder_name}: {key}")
+            await asyncio.to_thread(save_to_file_json, folder_name, key, response.data)
+        return response.data
+    except CircuitOpenError as e:
+        reason = classify_error(e)
+        upstream_metrics.observe_error(folder_name, e)
+        logger.info(f"Circuit open for {folder_name}, serving snapshot: {key}")
+    except Exception as e:
+        reason = classify_error(e)
+        logger.warning(f"Fail fetched {folder_name}: {key} ({reason}: {e})")
+    snapshot = Snapshot(await asyncio.to_thread(load_from_file_json, folder_name, key))
+    upstream_metrics.observe_fallback(folder_name, reason, served=bool(snapshot))
+    return snapshot
 
-def fetch_playlist_from_suno(playlist_id: str) -> dict:
-    try:
-        url = f"https://studio-api.prod.suno.com/api/playlist/" + playlist_id
-        r = requests.get(url, timeout=3)
-        r.raise_for_status()
-        logger.info(f"Successfully fetched playlist: {playlist_id}")
-        save_to_file_json("playlists", playlist_id, r.json())
-        return r.json()
-    except Exception:
-        logger.info(f"Fail fetched playlist: {playlist_id}")
-        return {}
+async def fetch_clip_from_suno(clip_id: str) -> dict:
+    return await fetch_from_suno("clips", clip_id, "/clip/" + clip_id)
+
+async def fetch_profile_from_suno(handle: str) -> dict:
+    return await fetch_from_suno("profiles", handle, "/profiles/" + handle, PROFILE_PARAMS)
+
+async def fetch_playlist_from_suno(playlist_id: str) -> dict:
+    return await fetch_from_suno("playlists", playlist_id, "/playlist/" + playlist_id)
@@ -0,0 +1,82 @@
+from typing import Iterable, List, Sequence
+
+from sqlalchemy import Table, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+MAX_BIND_PARAMS = 30000
+
+
+def to_row(entity) -> dict:
+    return {column.key: getattr(entity, column.key) for column in entity.__table__.columns}
+
+
+def dedupe_rows(rows: Iterable[dict], key_columns: Sequence[str]) -> List[dict]:
+    """Merge rows sharing a key; each column keeps its first non-null value."""
+    unique = {}
+    for row in rows:
+        key = tuple(row[column] for column in key_columns)
+        merged = unique.get(key)
+        if merged is None:
+            unique[key] = dict(row)
+            continue
+        for column, value in row.items():
+            if merged.get(column) is None:
+                merged[column] = value
+    return list(unique.values())
+
+
+def dialect_insert(dialect: str, table: Table):
+    if dialect not in DIALECT_INSERTS:
+        raise ValueError(f"Bulk upsert supports {', '.join(sorted(DIALECT_INSERTS))}, not {dialect}")
+    return DIALECT_INSERTS[dialect](table)
+
+
+def batches(rows: List[dict], columns: int, batch_size: int):
+    size = max(1, min(batch_size, MAX_BIND_PARAMS // max(columns, 1)))
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def upsert_statement(dialect: str, table: Table, rows: List[dict], index_elements: Sequence[str],
+                     keep_existing: Sequence[str] = ()):
+    stmt = dialect_insert(dialect, table).values(rows)
+    updates = {}
+    for column in rows[0]:
+        if column in index_elements:
+            continue
+        if column in keep_existing:
+            updates[column] = func.coalesce(table.c[column], stmt.excluded[column])
+        else:
+            updates[column] = func.coalesce(stmt.excluded[column], table.c[column])
+    if updates:
+        return stmt.on_conflict_do_update(index_elements=list(index_elements), set_=updates)
+    return stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+
+
+def bulk_upsert(db, table: Table, rows: Iterable[dict], index_elements: Sequence[str],
+                keep_existing: Sequence[str] = (), batch_size: int = 500) -> int:
+    rows = dedupe_rows(rows, index_elements)
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    for chunk in batches(rows, len(rows[0]), batch_size):
+        db.execute(upsert_statement(dialect, table, chunk, index_elements, keep_existing))
+    return len(rows)
+
+
+def upsert_returning(db, table: Table, row: dict, index_elements: Sequence[str],
+                     keep_existing: Sequence[str] = (), returning: str = "id"):
+    stmt = upsert_statement(db.get_bind().dialect.name, table, [row], index_elements, keep_existing)
+    return db.execute(stmt.returning(table.c[returning])).scalar()
+
+
+def bulk_insert_ignore(db, table: Table, rows: Iterable[dict], index_elements: Sequence[str],
+                       batch_size: int = 500) -> int:
+    rows = dedupe_rows(rows, index_elements)
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    for chunk in batches(rows, len(rows[0]), batch_size):
+        db.execute(dialect_insert(dialect, table).values(chunk).on_conflict_do_nothing(index_elements=list(index_elements)))
+    return len(rows)
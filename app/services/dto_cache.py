@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from config.settings import settings
+
+CacheKey = Tuple[str, str]
+
+
+class DtoCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, enabled: bool = True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[datetime, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key, stamp: Optional[datetime]) -> Optional[bytes]:
+        if not self.enabled or stamp is None:
+            return None
+        cache_key = (kind, str(key))
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is None or cached[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return cached[1]
+
+    def put(self, kind: str, key, stamp: Optional[datetime], body: bytes):
+        if not self.enabled or stamp is None or len(body) > self.max_bytes:
+            return
+        cache_key = (kind, str(key))
+        with self._lock:
+            self._remove(cache_key)
+            self._entries[cache_key] = (stamp, body)
+            self.size_bytes += len(body)
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def invalidate(self, kind: str, keys: Iterable):
+        with self._lock:
+            for key in keys:
+                if self._remove((kind, str(key))):
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def _remove(self, cache_key: CacheKey) -> bool:
+        cached = self._entries.pop(cache_key, None)
+        if cached is None:
+            return False
+        self.size_bytes -= len(cached[1])
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self.size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+dto_cache = DtoCache(settings.dto_cache_size, settings.dto_cache_max_bytes, settings.dto_cache_enabled)
@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from config.settings import settings
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+    fetched_at: float
+
+
+class HttpCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        row = self._conn().execute(
+            "SELECT url, etag, last_modified, body, fetched_at FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO http_cache (url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, "
+            "body = excluded.body, fetched_at = excluded.fetched_at",
+            (url, etag, last_modified, body, time.time()),
+        )
+        conn.commit()
+
+    def touch(self, url: str):
+        conn = self._conn()
+        conn.execute("UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+        conn.commit()
+
+    def delete(self, url: str):
+        conn = self._conn()
+        conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+        conn.commit()
+
+
+http_cache: Optional[HttpCache] = HttpCache(settings.http_cache_path) if settings.http_cache_enabled else None
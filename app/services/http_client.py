@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config.settings import settings
+from services import http_cache as cache
+from services.metrics import endpoint_name, upstream_metrics
+from services.rate_limiter import upstream_limiter
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+@dataclass
+class JsonResponse:
+    data: Any
+    status_code: int
+    not_modified: bool = False
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_client() -> httpx.AsyncClient:
+    http2 = settings.upstream_http2 and http2_available()
+    logger.info(f"Creating upstream client for {settings.suno_api_url}, http2={http2}")
+    return httpx.AsyncClient(
+        base_url=settings.suno_api_url,
+        http2=http2,
+        timeout=httpx.Timeout(settings.upstream_timeout, connect=settings.upstream_connect_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.upstream_max_connections,
+            max_keepalive_connections=settings.upstream_max_keepalive_connections,
+            keepalive_expiry=settings.upstream_keepalive_expiry,
+        ),
+    )
+
+
+async def close_quietly(client: httpx.AsyncClient):
+    try:
+        await client.aclose()
+    except Exception as e:
+        logger.warning(f"Failed to close upstream client of a finished event loop: {e}")
+
+
+def release_stale_clients(current: asyncio.AbstractEventLoop):
+    for loop, client in list(_clients.items()):
+        if loop is not current and (loop.is_closed() or client.is_closed):
+            _clients.pop(loop)
+            if not client.is_closed:
+                current.create_task(close_quietly(client))
+
+
+def get_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        release_stale_clients(loop)
+        client = _clients[loop] = create_client()
+    return client
+
+
+async def close_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def get_json_response(path: str, params: Optional[dict] = None) -> JsonResponse:
+    client = get_client()
+    request = client.build_request("GET", path, params=params)
+    url = str(request.url)
+    # HttpCache is blocking sqlite3 (one connection per thread), so every call runs in the default executor.
+    http_cache = cache.http_cache
+    cached = await asyncio.to_thread(http_cache.get, url) if http_cache else None
+    if cached:
+        if cached.etag:
+            request.headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            request.headers["If-Modified-Since"] = cached.last_modified
+
+    endpoint = endpoint_name(path)
+    async with upstream_limiter:
+        started = time.perf_counter()
+        try:
+            r = await client.send(request)
+        except Exception as e:
+            upstream_metrics.observe_error(endpoint, e, time.perf_counter() - started)
+            raise
+        upstream_metrics.observe_response(endpoint, r.status_code, time.perf_counter() - started, len(r.content))
+        upstream_limiter.observe(r.status_code, r.headers.get("Retry-After"))
+
+    if r.status_code == 304 and cached:
+        upstream_metrics.observe_cache(endpoint, hit=True)
+        await asyncio.to_thread(http_cache.touch, url)
+        return JsonResponse(json.loads(cached.body), 304, not_modified=True)
+
+    if http_cache:
+        upstream_metrics.observe_cache(endpoint, hit=False)
+    try:
+        r.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        upstream_metrics.observe_error(endpoint, e)
+        raise
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if http_cache and (etag or last_modified):
+        await asyncio.to_thread(http_cache.put, url, etag, last_modified, r.content)
+    return JsonResponse(r.json(), r.status_code)
+
+
+async def get_json(path: str, params: Optional[dict] = None) -> Any:
+    return (await get_json_response(path, params)).data
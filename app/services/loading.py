@@ -0,0 +1,36 @@
+from typing import Literal, Optional
+
+from fastapi import Query
+from sqlalchemy.orm import joinedload, selectinload
+
+from config.settings import settings
+from models.entities import Playlist, Profile
+
+JOINED = "joined"
+SELECTIN = "selectin"
+STRATEGIES = {JOINED: joinedload, SELECTIN: selectinload}
+
+
+def loader(strategy: Optional[str] = None):
+    strategy = strategy or settings.orm_loading_strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown loading strategy: {strategy}")
+    return STRATEGIES[strategy]
+
+
+def loading_strategy(
+    strategy: Optional[Literal["joined", "selectin"]] = Query(None, description="Relationship loading strategy; defaults to ORM_LOADING_STRATEGY"),
+) -> Optional[str]:
+    return strategy
+
+
+def profile_options(strategy: Optional[str] = None, nested: bool = True) -> list:
+    load = loader(strategy)
+    playlists = load(Profile.playlists)
+    if nested:
+        playlists = playlists.options(load(Playlist.clips))
+    return [load(Profile.clips), playlists]
+
+
+def playlist_options(strategy: Optional[str] = None) -> list:
+    return [joinedload(Playlist.profile), loader(strategy)(Playlist.clips)]
@@ -87,44 +87,64 @@ def create_metadata_dto(metadata_dict: dict) -> MetadataDTO:
     if not isinstance(metadata_dict, dict):
         metadata_dict = {}
     
-    duration_value = metadata_dict.get('duration')
-    duration_str = str(duration_value) if duration_value is not None else None
     return MetadataDTO(
         tags=metadata_dict.get('tags'),
         prompt=metadata_dict.get('prompt'),
-        duration=safe_str_optional(duration_str, None)
+        duration=str(metadata_dict.get('duration'))
     )
 
 
-def create_clips_dto_from_profile(profile: Profile):
-    clips = getattr(profile, 'clips', [])
-    result = []
-    for clip in clips:
-        metadata = getattr(clip, 'clip_metadata', {})
-        result.append(ClipSlimDTO(
-            id=safe_str_convert(clip.id, ""),
-            title=safe_str_convert(clip.title, ""),
-            audio_url=safe_str_optional(clip.audio_url, None),
-            video_url=safe_str_optional(clip.video_url, None),
-            image_url=safe_str_optional(clip.image_url, None),
-            metadata=create_metadata_dto(metadata)
-        ))
-    return result
+CLIP_SLIM_FIELDS = ('id', 'title', 'audio_url', 'video_url', 'image_url', 'clip_metadata')
+CLIP_FIELDS = (
+    'id', 'title', 'video_url', 'audio_url', 'image_url', 'image_large_url', 'clip_metadata',
+    'user_id', 'display_name', 'handle', 'avatar_image_url',
+)
+PLAYLIST_FIELDS = ('id', 'name', 'description', 'image_url')
+
+
+def to_clip_slim_dto(clip: Clip) -> ClipSlimDTO:
+    metadata = getattr(clip, 'clip_metadata', {})
+    return ClipSlimDTO(
+        id=safe_str_convert(clip.id, ""),
+        title=safe_str_convert(clip.title, ""),
+        audio_url=safe_str_optional(clip.audio_url, None),
+        video_url=safe_str_optional(clip.video_url, None),
+        image_url=safe_str_optional(clip.image_url, None),
+        metadata=create_metadata_dto(metadata)
+    )
+
+
+class ClipIndex:
+    def __init__(self, clips):
+        self.clips = []
+        self.positions = {}
+        self._dtos = {}
+        for clip in clips or []:
+            if clip.id not in self.positions:
+                self.positions[clip.id] = len(self.clips)
+                self.clips.append(clip)
+
+    def members(self, playlist_clips) -> list:
+        positions = sorted({self.positions[clip.id] for clip in playlist_clips or [] if clip.id in self.positions})
+        return [self.clips[position] for position in positions]
+
+    def dto(self, clip: Clip) -> ClipSlimDTO:
+        dto = self._dtos.get(clip.id)
+        if dto is None:
+            dto = self._dtos[clip.id] = to_clip_slim_dto(clip)
+        return dto
+
+    def dtos(self, clips) -> list:
+        return [self.dto(clip) for clip in clips]
+
+
+def create_clips_dto_from_profile(profile: Profile, index: Optional[ClipIndex] = None):
+    index = index or ClipIndex(getattr(profile, 'clips', []))
+    return index.dtos(index.clips)
 
 
 def create_clips_dto_from_playlist(clips):
-    result = []
-    for clip in clips:
-        metadata = getattr(clip, 'clip_metadata', {})
-        result.append(ClipSlimDTO(
-            id=safe_str_convert(clip.id, ""),
-            title=safe_str_convert(clip.title, ""),
-            audio_url=safe_str_optional(clip.audio_url, None),
-            video_url=safe_str_optional(clip.video_url, None),
-            image_url=safe_str_optional(clip.image_url, None),
-            metadata=create_metadata_dto(metadata)
-        ))
-    return result
+    return [to_clip_slim_dto(clip) for clip in clips]
 
 
 def create_base_clips_dto(clips: Clip):
@@ -137,33 +157,42 @@ def create_base_clips_dto(clips: Clip):
         ) for clip in clips
     ]
 
-def create_playlist_dto(profile: Profile):
+def create_playlist_dto(profile: Profile, index: Optional[ClipIndex] = None):
     playlists = getattr(profile, 'playlists', []) or []
-    clips = getattr(profile, 'clips', [])
+    index = index or ClipIndex(getattr(profile, 'clips', []))
     result = []
     for playlist in playlists:
         try:
             if hasattr(playlist, 'clips') and hasattr(playlist, 'profile'):
-                result.append(to_playlist_dto(playlist, clips))
+                result.append(to_playlist_dto(playlist, index=index))
             else:
                 continue
         except Exception as e:
             continue
     return result
 
-def to_playlist(playlist: Playlist) -> PlaylistDTO:
+def build_playlist_dto(playlist: Playlist, handle: str, clips: list) -> PlaylistDTO:
     return PlaylistDTO(
         id=safe_str_convert(playlist.id, ""),
         name=safe_str_convert(playlist.name, ""),
-        handle=safe_str_convert(getattr(playlist, 'user_handle', ''), ""),
+        handle=handle,
         description=safe_str_optional(playlist.description, None),
         image_url=safe_str_optional(playlist.image_url, None),
-        clips=create_clips_dto_from_playlist(playlist.clips)
+        clips=clips
     )
 
-def to_playlist_dto(playlist: Playlist, clips) -> PlaylistDTO:
+
+def to_playlist(playlist: Playlist) -> PlaylistDTO:
+    return build_playlist_dto(
+        playlist,
+        safe_str_convert(getattr(playlist, 'user_handle', ''), ""),
+        create_clips_dto_from_playlist(playlist.clips)
+    )
+
+def to_playlist_dto(playlist: Playlist, clips=None, index: Optional[ClipIndex] = None) -> PlaylistDTO:
     try:
-        playlist_clips = [clip for clip in clips if clip in playlist.clips]
+        index = index or ClipIndex(clips)
+        playlist_clips = index.members(playlist.clips)
         profile_handle = ""
         if hasattr(playlist, 'profile') and playlist.profile:
             try:
@@ -173,27 +202,21 @@ def to_playlist_dto(playlist: Playlist, clips) -> PlaylistDTO:
         elif hasattr(playlist, 'user_handle'):
             profile_handle = safe_str_convert(playlist.user_handle, "")
         
-        return PlaylistDTO(
-            id=safe_str_convert(playlist.id, ""),
-            name=safe_str_convert(playlist.name, ""),
-            handle=profile_handle,
-            description=safe_str_optional(playlist.description, None),
-            image_url=safe_str_optional(playlist.image_url, None),
-            clips=create_clips_dto_from_playlist(playlist_clips)
-        )
+        return build_playlist_dto(playlist, profile_handle, index.dtos(playlist_clips))
     except Exception as e:
         raise
 
 def to_profile_dto(profile: Profile) -> ProfileDTO:
     try:
+        index = ClipIndex(getattr(profile, 'clips', []))
         return ProfileDTO(
             id=safe_str_convert(profile.id, ""),
             handle=safe_str_convert(profile.handle, ""),
             display_name=safe_str_convert(profile.display_name, ""),
             profile_description=safe_str_optional(profile.profile_description, None),
             avatar_image_url=safe_str_optional(profile.avatar_image_url, None),
-            clips=create_clips_dto_from_profile(profile),
-            playlists=create_playlist_dto(profile)
+            clips=create_clips_dto_from_profile(profile, index),
+            playlists=create_playlist_dto(profile, index)
         )
     except Exception as e:
         raise
@@ -201,18 +224,15 @@ def to_profile_dto(profile: Profile) -> ProfileDTO:
 
 def create_playlist_dto_for_profile(profile: Profile):
     playlists = getattr(profile, 'playlists', []) or []
-    all_clips = getattr(profile, 'clips', []) or []
+    index = ClipIndex(getattr(profile, 'clips', []))
     
     playlist_dtos = []
     for playlist in playlists:
-        playlist_clips = [clip for clip in all_clips if clip in playlist.clips]
-        playlist_dtos.append(PlaylistDTO(
-            id=safe_str_convert(playlist.id, ""),
-            name=safe_str_convert(playlist.name, ""),
-            handle=safe_str_convert(getattr(playlist, 'user_handle', ''), ""),
-            description=safe_str_optional(playlist.description, None),
-            image_url=safe_str_optional(playlist.image_url, None),
-            clips=create_clips_dto_from_playlist(playlist_clips)
+        playlist_clips = index.members(playlist.clips)
+        playlist_dtos.append(build_playlist_dto(
+            playlist,
+            safe_str_convert(getattr(playlist, 'user_handle', ''), ""),
+            index.dtos(playlist_clips)
         ))
     
     return playlist_dtos
@@ -0,0 +1,157 @@
+import bisect
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from services.circuit_breaker import CircuitOpenError
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ENDPOINT_ALIASES = {"clip": "clips", "playlist": "playlists"}
+
+
+def endpoint_name(path: str) -> str:
+    parts = [part for part in path.split("?")[0].split("/") if part]
+    if parts and parts[0] == "api":
+        parts = parts[1:]
+    return ENDPOINT_ALIASES.get(parts[0], parts[0]) if parts else "root"
+
+
+def classify_error(error: Exception) -> str:
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"http_{error.response.status_code}"
+    if isinstance(error, httpx.TransportError):
+        return "transport"
+    return type(error).__name__
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class UpstreamMetrics:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._latency: Dict[str, Histogram] = defaultdict(lambda: Histogram(self.buckets))
+            self._status: Dict[str, Counter] = defaultdict(Counter)
+            self._errors: Dict[str, Counter] = defaultdict(Counter)
+            self._bytes: Counter = Counter()
+            self._cache: Dict[str, Counter] = defaultdict(Counter)
+            self._fallbacks: Dict[str, Counter] = defaultdict(Counter)
+
+    def observe_response(self, endpoint: str, status_code: int, seconds: float, size: int = 0):
+        with self._lock:
+            self._latency[endpoint].observe(seconds)
+            self._status[endpoint][str(status_code)] += 1
+            self._bytes[endpoint] += size
+
+    def observe_error(self, endpoint: str, error: Exception, seconds: Optional[float] = None):
+        with self._lock:
+            if seconds is not None:
+                self._latency[endpoint].observe(seconds)
+            self._errors[endpoint][classify_error(error)] += 1
+
+    def observe_cache(self, endpoint: str, hit: bool):
+        with self._lock:
+            self._cache[endpoint]["hit" if hit else "miss"] += 1
+
+    def observe_fallback(self, endpoint: str, reason: str, served: bool):
+        with self._lock:
+            self._fallbacks[endpoint][f"{reason}_{'served' if served else 'empty'}"] += 1
+
+    def endpoints(self) -> List[str]:
+        names = set(self._latency) | set(self._status) | set(self._errors) | set(self._cache) | set(self._fallbacks)
+        return sorted(names)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {
+                    "latency_seconds": self._latency.get(endpoint, Histogram(self.buckets)).to_dict(),
+                    "status_codes": dict(self._status.get(endpoint, {})),
+                    "errors": dict(self._errors.get(endpoint, {})),
+                    "bytes_downloaded": self._bytes.get(endpoint, 0),
+                    "cache": {"hit": self._cache.get(endpoint, {}).get("hit", 0), "miss": self._cache.get(endpoint, {}).get("miss", 0)},
+                    "fallbacks": dict(self._fallbacks.get(endpoint, {})),
+                }
+                for endpoint in self.endpoints()
+            }
+
+    def render_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = ["# TYPE suno_upstream_request_seconds histogram"]
+        for endpoint, data in snapshot.items():
+            latency = data["latency_seconds"]
+            for bound, count in latency["buckets"].items():
+                lines.append(f'suno_upstream_request_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+            lines.append(f'suno_upstream_request_seconds_sum{{endpoint="{endpoint}"}} {latency["sum"]}')
+            lines.append(f'suno_upstream_request_seconds_count{{endpoint="{endpoint}"}} {latency["count"]}')
+        lines.append("# TYPE suno_upstream_responses_total counter")
+        for endpoint, data in snapshot.items():
+            for status, count in sorted(data["status_codes"].items()):
+                lines.append(f'suno_upstream_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+        lines.append("# TYPE suno_upstream_errors_total counter")
+        for endpoint, data in snapshot.items():
+            for error, count in sorted(data["errors"].items()):
+                lines.append(f'suno_upstream_errors_total{{endpoint="{endpoint}",error="{error}"}} {count}')
+        lines.append("# TYPE suno_upstream_bytes_total counter")
+        for endpoint, data in snapshot.items():
+            lines.append(f'suno_upstream_bytes_total{{endpoint="{endpoint}"}} {data["bytes_downloaded"]}')
+        lines.append("# TYPE suno_upstream_cache_total counter")
+        for endpoint, data in snapshot.items():
+            for result, count in data["cache"].items():
+                lines.append(f'suno_upstream_cache_total{{endpoint="{endpoint}",result="{result}"}} {count}')
+        lines.append("# TYPE suno_upstream_fallbacks_total counter")
+        for endpoint, data in snapshot.items():
+            for outcome, count in sorted(data["fallbacks"].items()):
+                lines.append(f'suno_upstream_fallbacks_total{{endpoint="{endpoint}",outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+upstream_metrics = UpstreamMetrics()
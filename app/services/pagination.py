@@ -0,0 +1,137 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, and_, tuple_
+
+from models.entities import Clip, Playlist, Profile
+from models.page import Page
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Keyset:
+    name: str
+    id_column: Any
+    column: Any = None
+
+    def order_by(self) -> list:
+        if self.column is None:
+            return [self.id_column.asc()]
+        return [self.column.desc().nulls_last(), self.id_column.desc()]
+
+    def values(self, row) -> list:
+        last_id = str(getattr(row, self.id_column.key))
+        if self.column is None:
+            return [last_id]
+        value = getattr(row, self.column.key)
+        return [value.isoformat() if isinstance(value, datetime) else value, last_id]
+
+    def after(self, values: list):
+        """Rows after the cursor within its phase: non-NULL values first, then the NULL tail.
+
+        Each phase is a single index range, so the query seeks instead of scanning.
+        """
+        last_id = uuid.UUID(values[-1])
+        if self.column is None:
+            return self.id_column > last_id
+        value = values[0]
+        if value is None:
+            return and_(self.column.is_(None), self.id_column < last_id)
+        if isinstance(self.column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        return tuple_(self.column, self.id_column) < (value, last_id)
+
+
+def encode_cursor(keyset: Keyset, values: list) -> str:
+    payload = json.dumps({"s": keyset.name, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(keyset: Keyset, cursor: str) -> list:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = payload["k"]
+        uuid.UUID(values[-1])
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if payload.get("s") != keyset.name or len(values) != (1 if keyset.column is None else 2):
+        raise InvalidCursor(f"Cursor does not match sort order '{keyset.name}'")
+    return values
+
+
+def page_query(query, keyset: Keyset, limit: int, cursor: Optional[str] = None, offset: int = 0):
+    query = query.order_by(*keyset.order_by())
+    if cursor:
+        query = query.filter(keyset.after(decode_cursor(keyset, cursor)))
+    elif offset:
+        query = query.offset(offset)
+    return query.limit(limit + 1)
+
+
+def tail_query(query, keyset: Keyset, limit: int, cursor: Optional[str], fetched: int):
+    """Query that continues a short non-NULL page into the NULL tail, or None when the page is complete."""
+    if keyset.column is None or not cursor or fetched > limit:
+        return None
+    if decode_cursor(keyset, cursor)[0] is None:
+        return None
+    return query.filter(keyset.column.is_(None)).order_by(keyset.id_column.desc()).limit(limit - fetched + 1)
+
+
+def page_rows(rows: List[Any], keyset: Keyset, limit: int) -> Tuple[List[Any], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(keyset, keyset.values(rows[-1]))
+
+
+def paginate(query, keyset: Keyset, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    rows = page_query(query, keyset, limit, cursor, offset).all()
+    tail = tail_query(query, keyset, limit, cursor, len(rows))
+    if tail is not None:
+        rows += tail.all()
+    return page_rows(rows, keyset, limit)
+
+
+def paginate_rows(db, stmt, keyset: Keyset, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    rows = db.execute(page_query(stmt, keyset, limit, cursor, offset)).all()
+    tail = tail_query(stmt, keyset, limit, cursor, len(rows))
+    if tail is not None:
+        rows += db.execute(tail).all()
+    return page_rows(rows, keyset, limit)
+
+
+async def paginate_async(db, stmt, keyset: Keyset, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    rows = list((await db.execute(page_query(stmt, keyset, limit, cursor, offset))).scalars().unique())
+    tail = tail_query(stmt, keyset, limit, cursor, len(rows))
+    if tail is not None:
+        rows += (await db.execute(tail)).scalars().unique()
+    return page_rows(rows, keyset, limit)
+
+
+CLIP_KEYSETS = {
+    "created_at": Keyset("created_at", Clip.id, Clip.created_at),
+    "play_count": Keyset("play_count", Clip.id, Clip.play_count),
+    "id": Keyset("id", Clip.id),
+}
+PLAYLIST_KEYSET = Keyset("id", Playlist.id)
+PROFILE_KEYSET = Keyset("id", Profile.id)
+
+
+def page_response(response: Response, items: list, next_cursor: Optional[str], cursor: Optional[str]):
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if cursor is None:
+        return items
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def invalid_cursor(e: InvalidCursor) -> HTTPException:
+    return HTTPException(status_code=400, detail=str(e))
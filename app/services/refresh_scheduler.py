@@ -0,0 +1,142 @@
+import asyncio
+import os
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RefreshKey = Tuple[str, str, str]
+Refresher = Callable[[str], Awaitable[bool]]
+
+
+class RefreshScheduler:
+    def __init__(self, interval_seconds: float, budget: int, popularity_decay: float = 0.5, lock_path: Optional[str] = None):
+        self.interval_seconds = interval_seconds
+        self.budget = budget
+        self.popularity_decay = popularity_decay
+        self.lock_path = lock_path
+        self._lease = None
+        self._refreshers: Dict[Tuple[str, str], Refresher] = {}
+        self._stale_sources: List[Callable[[int], List[Tuple[RefreshKey, float]]]] = []
+        self._popularity: Dict[RefreshKey, float] = {}
+        self._pending: Dict[RefreshKey, float] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, store: str, entity_type: str, refresher: Refresher):
+        self._refreshers[(store, entity_type)] = refresher
+
+    def register_stale_source(self, source: Callable[[int], List[Tuple[RefreshKey, float]]]):
+        self._stale_sources.append(source)
+
+    def record_request(self, store: str, entity_type: str, entity_id: str):
+        key = (store, entity_type, str(entity_id))
+        with self._lock:
+            self._popularity[key] = self._popularity.get(key, 0.0) + 1
+
+    def request_refresh(self, store: str, entity_type: str, entity_id: str, staleness: float = 1.0):
+        key = (store, entity_type, str(entity_id))
+        with self._lock:
+            self._pending[key] = max(self._pending.get(key, 0.0), staleness)
+
+    def is_pending(self, store: str, entity_type: str, entity_id: str) -> bool:
+        with self._lock:
+            return (store, entity_type, str(entity_id)) in self._pending
+
+    def priority(self, key: RefreshKey, staleness: float) -> float:
+        return (1 + self._popularity.get(key, 0.0)) * staleness
+
+    def is_leader(self) -> bool:
+        """Only one process scans the stale sources; the others refresh what their own requests asked for."""
+        if self.lock_path is None:
+            return True
+        from filelock import FileLock, Timeout
+
+        if self._lease is None:
+            directory = os.path.dirname(self.lock_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._lease = FileLock(self.lock_path, thread_local=False)
+        if self._lease.is_locked:
+            return True
+        try:
+            self._lease.acquire(timeout=0)
+        except Timeout:
+            return False
+        logger.info(f"Refresh scheduler took the stale scan lease {self.lock_path}")
+        return True
+
+    def release_lease(self):
+        if self._lease is not None and self._lease.is_locked:
+            self._lease.release(force=True)
+
+    def next_batch(self, scan_stale: bool = True) -> List[RefreshKey]:
+        candidates: Dict[RefreshKey, float] = {}
+        for source in self._stale_sources if scan_stale else []:
+            try:
+                for key, staleness in source(self.budget * 4):
+                    candidates[key] = max(candidates.get(key, 0.0), staleness)
+            except Exception as e:
+                logger.error(f"Failed to load stale entities: {e}")
+
+        with self._lock:
+            for key, staleness in self._pending.items():
+                candidates[key] = max(candidates.get(key, 0.0), staleness)
+            ranked = sorted(candidates, key=lambda key: self.priority(key, candidates[key]), reverse=True)
+        return [key for key in ranked if key[:2] in self._refreshers][:self.budget]
+
+    async def run_once(self) -> int:
+        # Stale sources query the database synchronously, so keep them off the event loop.
+        batch = await asyncio.to_thread(self.next_batch, await asyncio.to_thread(self.is_leader))
+        if batch:
+            logger.info(f"Refreshing {len(batch)} stale entities")
+        results = await asyncio.gather(*[self._refresh(key) for key in batch])
+
+        with self._lock:
+            for key in self._popularity:
+                self._popularity[key] *= self.popularity_decay
+            self._popularity = {key: count for key, count in self._popularity.items() if count >= 0.1}
+        return sum(1 for refreshed in results if refreshed)
+
+    async def _refresh(self, key: RefreshKey) -> bool:
+        store, entity_type, entity_id = key
+        try:
+            refreshed = await self._refreshers[(store, entity_type)](entity_id)
+        except Exception as e:
+            logger.error(f"Refresh failed for {entity_type} {entity_id} in {store}: {e}")
+            refreshed = False
+        with self._lock:
+            self._pending.pop(key, None)
+        return bool(refreshed)
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Refresh cycle failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.release_lease()
+
+
+refresh_scheduler = RefreshScheduler(
+    settings.refresh_interval_seconds,
+    settings.refresh_budget,
+    lock_path=settings.refresh_lock_path,
+)
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional, Type
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from config.settings import settings
+from config.logging_config import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = get_logger(__name__)
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgspecResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content, enc_hook=jsonable_encoder)
+
+
+RENDERERS: Dict[str, Type[JSONResponse]] = {
+    "json": JSONResponse,
+    "orjson": OrjsonResponse,
+    "msgspec": MsgspecResponse,
+}
+MODULES = {"orjson": "orjson", "msgspec": "msgspec"}
+
+
+def renderer_available(name: str) -> bool:
+    if name not in MODULES:
+        return name in RENDERERS
+    try:
+        __import__(MODULES[name])
+        return True
+    except ImportError:
+        return False
+
+
+def response_class(name: Optional[str] = None) -> Type[JSONResponse]:
+    name = name or settings.json_renderer
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown JSON renderer '{name}', expected one of {sorted(RENDERERS)}")
+    if not renderer_available(name):
+        logger.warning(f"JSON renderer '{name}' is not installed, falling back to json")
+        return JSONResponse
+    return RENDERERS[name]
+
+
+def app_response_class(request: Request) -> Type[Response]:
+    default = request.app.router.default_response_class
+    return getattr(default, "value", default)
+
+
+def render(request: Request, content: Any, response: Optional[Response] = None) -> Response:
+    if isinstance(content, BaseModel):
+        content = content.model_dump(mode="json")
+    rendered = app_response_class(request)(content)
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in ("content-length", "content-type"):
+                rendered.headers[key] = value
+    return rendered
+
+
+def raw_json(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,117 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import inspect
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from config.settings import settings
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Result handed to followers when the leader is cancelled; they retry instead of inheriting the cancellation.
+_ABANDONED = object()
+
+
+class SingleFlight:
+    def __init__(self, name: str, lock_dir: Optional[str] = None, lock_timeout: float = 30.0):
+        self.name = name
+        self.lock_dir = lock_dir
+        self.lock_timeout = lock_timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, concurrent.futures.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = concurrent.futures.Future()
+                    self._calls[key] = future
+
+            if leader:
+                return await self._lead(key, future, fn, recheck)
+
+            logger.info(f"Joining in-flight {self.name} call: {key}")
+            # Shielded so that a follower's own cancellation or timeout never cancels the shared call.
+            result = await asyncio.shield(asyncio.wrap_future(future))
+            if result is not _ABANDONED:
+                return result
+            logger.info(f"Leader of {self.name} call {key} was cancelled, retrying")
+
+    async def _lead(self, key: Hashable, future: concurrent.futures.Future, fn, recheck) -> Any:
+        try:
+            result = await self._run(key, fn, recheck)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]], recheck: Optional[Callable[[], Any]]) -> Any:
+        if not self.lock_dir:
+            return await fn()
+
+        from filelock import FileLock, Timeout
+
+        lock = FileLock(self._lock_path(key), thread_local=False)
+        contended = False
+        try:
+            lock.acquire(timeout=0)
+        except Timeout:
+            contended = True
+            try:
+                await asyncio.to_thread(lock.acquire, timeout=self.lock_timeout)
+            except Timeout:
+                logger.warning(f"Timed out waiting for {self.name} lease on {key}, fetching anyway")
+                return await fn()
+
+        try:
+            if contended and recheck is not None:
+                result = recheck()
+                if inspect.isawaitable(result):
+                    result = await result
+                if result is not None:
+                    return result
+            return await fn()
+        finally:
+            lock.release()
+
+    def _lock_path(self, key: Hashable) -> str:
+        os.makedirs(self.lock_dir, exist_ok=True)
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.lock_dir, f"{self.name}-{digest}.lock")
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_flight(name: str) -> SingleFlight:
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = SingleFlight(name, settings.singleflight_lock_dir, settings.singleflight_lock_timeout)
+            _flights[name] = flight
+        return flight
@@ -0,0 +1,323 @@
+import asyncio
+import json
+import os
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+JOURNAL_SLOTS = 64
+
+
+def claim_journal(path: str, slots: int = JOURNAL_SLOTS):
+    from filelock import FileLock, Timeout
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    for slot in range(slots):
+        journal = f"{path}.{slot}"
+        lock = FileLock(f"{journal}.lock", thread_local=False)
+        try:
+            lock.acquire(timeout=0)
+        except Timeout:
+            continue
+        return journal, lock
+    raise RuntimeError(f"All {slots} write-behind journal slots under {path} are in use")
+
+
+def claim_orphans(path: str, own: str, slots: int = JOURNAL_SLOTS):
+    """Locks the journals of workers that exited without draining them."""
+    from filelock import FileLock, Timeout
+
+    orphans = []
+    for slot in range(slots):
+        journal = f"{path}.{slot}"
+        if journal == own or not os.path.exists(journal):
+            continue
+        lock = FileLock(f"{journal}.lock", thread_local=False)
+        try:
+            lock.acquire(timeout=0)
+        except Timeout:
+            continue
+        orphans.append((journal, lock))
+    return orphans
+
+
+def read_journal(path: str) -> Dict[Tuple[str, str], dict]:
+    entries = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    entries[(entry["kind"], entry["key"])] = entry["data"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class WriteBehindQueue:
+    def __init__(self, backend: str = "sqlite", batch_size: int = 200, flush_interval: float = 0.5,
+                 journal_path: Optional[str] = None, fsync: bool = False, max_attempts: int = 3):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.journal_path = journal_path
+        self.fsync = fsync
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], dict] = {}
+        self._attempts: Counter = Counter()
+        self._failing_since: Dict[Tuple[str, str], int] = {}
+        self._saves = 0
+        self._journal = None
+        self._journal_lock = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.flushed: Counter = Counter()
+        self.coalesced = 0
+        self.failures = 0
+        self.dead_lettered = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def pending(self, kind: str, key) -> Optional[dict]:
+        with self._lock:
+            return self._pending.get((kind, str(key)))
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, kind: str, key, data: dict):
+        entry = (kind, str(key))
+        with self._lock:
+            if entry in self._pending:
+                self.coalesced += 1
+            self._pending[entry] = data
+            self._attempts.pop(entry, None)
+            self._failing_since.pop(entry, None)
+            if self._journal is not None:
+                self._append(kind, entry[1], data)
+            size = len(self._pending)
+        if size >= self.batch_size:
+            self._notify()
+
+    def _append(self, kind: str, key: str, data: dict):
+        self._journal.write(json.dumps({"kind": kind, "key": key, "data": data}, separators=(",", ":")) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _notify(self):
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def start(self):
+        if self.running:
+            return
+        if self.journal_path and self._journal is None:
+            journal, self._journal_lock = claim_journal(self.journal_path)
+            orphans = claim_orphans(self.journal_path, journal)
+            for path in [journal] + [orphan for orphan, _ in orphans]:
+                recovered = read_journal(path)
+                with self._lock:
+                    for entry, data in recovered.items():
+                        self._pending.setdefault(entry, data)
+                if recovered:
+                    logger.info(f"Recovered {len(recovered)} write-behind entries from {path}")
+            self._journal = open(journal, "a", encoding="utf-8")
+            self._compact()
+            for orphan, lock in orphans:
+                os.remove(orphan)
+                lock.release()
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self._journal_lock.release()
+            self._journal_lock = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending.items())
+            if not batch:
+                return 0
+            by_kind: Dict[str, List[Tuple[str, dict]]] = defaultdict(list)
+            for (kind, key), data in batch:
+                by_kind[kind].append((key, data))
+
+            mark = self._saves
+            saved = 0
+            suspects: List[Tuple[str, str, dict]] = []
+            for kind, entries in by_kind.items():
+                fresh = []
+                with self._lock:
+                    for key, data in entries:
+                        if self._attempts[(kind, key)] < self.max_attempts:
+                            fresh.append((key, data))
+                        else:
+                            suspects.append((kind, key, data))
+                for start in range(0, len(fresh), self.batch_size):
+                    chunk = fresh[start:start + self.batch_size]
+                    done, failed = await self._save_bisecting(kind, chunk)
+                    if failed:
+                        self.failures += 1
+                    saved += self._settle(kind, done)
+                    with self._lock:
+                        for key, data in failed:
+                            if self._pending.get((kind, key)) is data:
+                                self._attempts[(kind, key)] += 1
+                                self._failing_since.setdefault((kind, key), mark)
+
+            retried, dropped = await self._retry_suspects(suspects)
+            saved += retried
+            if (saved or dropped) and self._journal is not None:
+                self._compact()
+            return saved
+
+    async def _save_bisecting(self, kind: str, chunk: List[Tuple[str, dict]]):
+        """Saves a chunk, splitting it on failure to isolate the entries that fail on their own.
+
+        When the second half fails as well after the first failed entirely, the
+        backend itself is assumed to be down and the split stops there.
+        """
+        try:
+            await asyncio.to_thread(self._save, kind, [data for _, data in chunk])
+            return chunk, []
+        except Exception as e:
+            logger.error(f"Write-behind flush of {len(chunk)} {kind} entities failed: {e}")
+        if len(chunk) == 1:
+            return [], chunk
+        middle = len(chunk) // 2
+        left_done, left_failed = await self._save_bisecting(kind, chunk[:middle])
+        if left_done:
+            right_done, right_failed = await self._save_bisecting(kind, chunk[middle:])
+            return left_done + right_done, left_failed + right_failed
+        try:
+            await asyncio.to_thread(self._save, kind, [data for _, data in chunk[middle:]])
+        except Exception:
+            return [], chunk
+        return chunk[middle:], left_failed
+
+    async def _retry_suspects(self, suspects: List[Tuple[str, str, dict]]) -> Tuple[int, int]:
+        """Retries entries that kept failing one by one and dead-letters those that still fail.
+
+        An entry is only dead-lettered once other saves have succeeded since the
+        flush in which it started failing. Until then the failure is blamed on
+        the backend, the entry moves to the back of the queue and the retries stop.
+        """
+        saved = dropped = 0
+        for kind, key, data in suspects:
+            try:
+                await asyncio.to_thread(self._save, kind, [data])
+            except Exception as e:
+                with self._lock:
+                    proven = self._saves > self._failing_since.get((kind, key), self._saves)
+                    if not proven and self._pending.get((kind, key)) is data:
+                        self._pending[(kind, key)] = self._pending.pop((kind, key))
+                if not proven:
+                    break
+                self._dead_letter(kind, key, data, e)
+                dropped += 1
+                continue
+            saved += self._settle(kind, [(key, data)])
+        return saved, dropped
+
+    def _settle(self, kind: str, entries: List[Tuple[str, dict]]) -> int:
+        with self._lock:
+            for key, data in entries:
+                if self._pending.get((kind, key)) is data:
+                    del self._pending[(kind, key)]
+                    self._attempts.pop((kind, key), None)
+                    self._failing_since.pop((kind, key), None)
+        self.flushed[kind] += len(entries)
+        return len(entries)
+
+    def _dead_letter(self, kind: str, key: str, data: dict, error: Exception):
+        logger.error(f"Dropping write-behind {kind} {key} after {self.max_attempts} failed flushes: {error}")
+        with self._lock:
+            if self._pending.get((kind, key)) is data:
+                del self._pending[(kind, key)]
+                self._attempts.pop((kind, key), None)
+                self._failing_since.pop((kind, key), None)
+            self.dead_lettered += 1
+            if self.journal_path:
+                with open(f"{self.journal_path}.dead", "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"kind": kind, "key": key, "error": str(error), "data": data}, separators=(",", ":")) + "\n")
+
+    def _save(self, kind: str, items: List[dict]):
+        from storage import create_repository
+
+        with create_repository(self.backend) as repository:
+            repository.save(kind, items)
+        with self._lock:
+            self._saves += 1
+
+    def _compact(self):
+        with self._lock:
+            path = self._journal.name
+            self._journal.close()
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for (kind, key), data in self._pending.items():
+                    f.write(json.dumps({"kind": kind, "key": key, "data": data}, separators=(",", ":")) + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self._journal = open(path, "a", encoding="utf-8")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = Counter(kind for kind, _ in self._pending)
+        return {
+            "running": self.running,
+            "pending": dict(pending),
+            "flushed": dict(self.flushed),
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+write_behind = WriteBehindQueue(
+    backend=settings.write_behind_backend,
+    batch_size=settings.write_behind_batch_size,
+    flush_interval=settings.write_behind_flush_interval,
+    journal_path=settings.write_behind_journal,
+    fsync=settings.write_behind_fsync,
+)
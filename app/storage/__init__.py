@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from config.settings import settings
+from storage.base import KINDS, Repository
+from storage.json_files import JsonRepository
+from storage.sql import SqlRepository
+
+BACKENDS: Dict[str, Callable[[], Repository]] = {}
+
+
+def register_backend(name: str, factory: Callable[[], Repository]):
+    BACKENDS[name] = factory
+
+
+def create_repository(name: Optional[str] = None) -> Repository:
+    name = name or settings.storage_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return BACKENDS[name]()
+
+
+@lru_cache(maxsize=None)
+def get_json_repository(root: Optional[str] = None) -> JsonRepository:
+    return JsonRepository(root or settings.json_storage_dir, settings.json_cache_size)
+
+
+def sqlite_repository() -> SqlRepository:
+    from config.session import SessionLocal
+    return SqlRepository(SessionLocal(), owns_session=True)
+
+
+def postgres_repository() -> SqlRepository:
+    from config.session import SessionPG
+    return SqlRepository(SessionPG(), owns_session=True)
+
+
+register_backend("sqlite", sqlite_repository)
+register_backend("postgres", postgres_repository)
+register_backend("json", get_json_repository)
+
+__all__ = [
+    "BACKENDS",
+    "KINDS",
+    "JsonRepository",
+    "Repository",
+    "SqlRepository",
+    "create_repository",
+    "get_json_repository",
+    "register_backend",
+]
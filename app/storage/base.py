@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from models.entities import Clip, Playlist, Profile
+
+KINDS = ("profile", "playlist", "clip")
+
+
+class Repository(ABC):
+    @abstractmethod
+    def get_profile(self, handle: str) -> Optional[Profile]:
+        ...
+
+    @abstractmethod
+    def list_profiles(self, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Profile], Optional[str]]:
+        ...
+
+    @abstractmethod
+    def get_playlist(self, playlist_id) -> Optional[Playlist]:
+        ...
+
+    @abstractmethod
+    def list_playlists(self, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Playlist], Optional[str]]:
+        ...
+
+    @abstractmethod
+    def get_clip(self, clip_id) -> Optional[Clip]:
+        ...
+
+    @abstractmethod
+    def list_clips(self, limit: int, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at") -> Tuple[List[Clip], Optional[str]]:
+        ...
+
+    @abstractmethod
+    def save_profiles(self, items: List[dict]) -> int:
+        ...
+
+    @abstractmethod
+    def save_playlists(self, items: List[dict]) -> int:
+        ...
+
+    @abstractmethod
+    def save_clips(self, items: List[dict]) -> int:
+        ...
+
+    def save(self, kind: str, items: List[dict]) -> int:
+        if kind == "profile":
+            return self.save_profiles(items)
+        if kind == "playlist":
+            return self.save_playlists(items)
+        if kind == "clip":
+            return self.save_clips(items)
+        raise ValueError(f"Unknown entity kind: {kind}")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,244 @@
+import uuid
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from models.entities import Clip, Playlist, Profile
+from services.bulk import to_row
+
+
+def parse_uuid(value) -> Optional[UUID]:
+    if value is None or isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def create_profile(data) -> Profile:
+    id_value = parse_uuid(data.get("id", data.get("user_id"))) or uuid.uuid4()
+    return Profile(
+        id=id_value,
+        handle=data["handle"],
+        display_name=data["display_name"],
+        profile_description=data.get("profile_description"),
+        avatar_image_url=data.get("avatar_image_url")
+    )
+
+def create_playlist(playlist_data):
+    playlist_id = uuid.UUID(playlist_data["id"]) if isinstance(playlist_data["id"], str) else playlist_data["id"]
+    return Playlist(
+        id=playlist_id,
+        name=playlist_data.get("name"),
+        description=playlist_data.get("description"),
+        image_url=playlist_data.get("image_url"),
+        upvote_count=playlist_data.get("upvote_count", 0),
+        play_count=playlist_data.get("play_count", 0),
+        song_count=playlist_data.get("song_count", 0),
+        is_public=playlist_data.get("is_public", True),
+        entity_type=playlist_data.get("entity_type"),
+        num_total_results=playlist_data.get("num_total_results"),
+        current_page=playlist_data.get("current_page"),
+        is_owned=playlist_data.get("is_owned"),
+        is_trashed=playlist_data.get("is_trashed"),
+        is_hidden=playlist_data.get("is_hidden"),
+        user_display_name=playlist_data.get("user_display_name"),
+        user_handle=playlist_data.get("user_handle"),
+        user_avatar_image_url=playlist_data.get("user_avatar_image_url"),
+        dislike_count=playlist_data.get("dislike_count"),
+        flag_count=playlist_data.get("flag_count"),
+        skip_count=playlist_data.get("skip_count"),
+        is_discover_playlist=playlist_data.get("is_discover_playlist"),
+        next_cursor=playlist_data.get("next_cursor")
+    )
+
+
+def create_playlist_profile(p, profile):
+    playlist_id = UUID(p["id"]) if isinstance(p["id"], str) else p["id"]
+    return Playlist(
+        id=playlist_id,
+        profile_id=profile.id,
+        name=p.get("name"),
+        description=p.get("description"),
+        image_url=p.get("image_url"),
+        upvote_count=p.get("upvote_count", 0),
+        play_count=p.get("play_count", 0),
+        song_count=p.get("song_count", 0),
+        is_public=p.get("is_public", True),
+        entity_type=p.get("entity_type"),
+        num_total_results=p.get("num_total_results"),
+        current_page=p.get("current_page"),
+        is_owned=p.get("is_owned"),
+        is_trashed=p.get("is_trashed"),
+        is_hidden=p.get("is_hidden"),
+        user_display_name=p.get("user_display_name"),
+        user_handle=p.get("user_handle"),
+        user_avatar_image_url=p.get("user_avatar_image_url"),
+        dislike_count=p.get("dislike_count"),
+        flag_count=p.get("flag_count"),
+        skip_count=p.get("skip_count"),
+        is_discover_playlist=p.get("is_discover_playlist"),
+        next_cursor=p.get("next_cursor")
+    )
+
+def create_clip_profile(c, profile):
+    clip_id = uuid.UUID(c["id"]) if isinstance(c["id"], str) else c["id"]
+    user_id = uuid.UUID(c["user_id"]) if c.get("user_id") and isinstance(c["user_id"], str) else c.get("user_id")
+
+    profile_id = profile.id if hasattr(profile, 'id') and profile.id else None
+
+    return Clip(
+        id=clip_id,
+        profile_id=profile_id,  # Use profile_id instead of profile object to avoid issues
+        title=c.get("title"),
+        status=c.get("status"),
+        play_count=c.get("play_count", 0),
+        upvote_count=c.get("upvote_count", 0),
+        audio_url=c.get("audio_url"),
+        video_url=c.get("video_url"),
+        image_url=c.get("image_url"),
+        image_large_url=c.get("image_large_url"),
+        allow_comments=c.get("allow_comments"),
+        entity_type=c.get("entity_type"),
+        major_model_version=c.get("major_model_version"),
+        model_name=c.get("model_name"),
+        clip_metadata=c.get("metadata"),
+        caption=c.get("caption"),
+        type=c.get("type"),
+        duration=str(c.get("duration")) if c.get("duration") is not None else None,
+        refund_credits=c.get("refund_credits"),
+        stream=c.get("stream"),
+        make_instrumental=c.get("make_instrumental"),
+        can_remix=c.get("can_remix"),
+        is_remix=c.get("is_remix"),
+        priority=c.get("priority"),
+        has_stem=c.get("has_stem"),
+        video_is_stale=c.get("video_is_stale"),
+        uses_latest_model=c.get("uses_latest_model"),
+        is_liked=c.get("is_liked"),
+        user_id=user_id,
+        display_name=c.get("display_name"),
+        handle=c.get("handle"),
+        is_handle_updated=c.get("is_handle_updated"),
+        avatar_image_url=c.get("avatar_image_url"),
+        is_trashed=c.get("is_trashed"),
+        is_public=c.get("is_public"),
+        explicit=c.get("explicit"),
+        comment_count=c.get("comment_count"),
+        flag_count=c.get("flag_count"),
+        is_contest_clip=c.get("is_contest_clip"),
+        has_hook=c.get("has_hook"),
+        batch_index=c.get("batch_index"),
+        is_pinned=c.get("is_pinned")
+    )
+
+def create_clip(clip_data):
+    clip_id = UUID(clip_data["id"]) if isinstance(clip_data["id"], str) else clip_data["id"]
+    user_id = UUID(clip_data["user_id"]) if clip_data.get("user_id") and isinstance(clip_data["user_id"], str) else clip_data.get("user_id")
+
+    return Clip(
+        id=clip_id,
+        title=clip_data.get("title"),
+        status=clip_data.get("status"),
+        play_count=clip_data.get("play_count", 0),
+        upvote_count=clip_data.get("upvote_count", 0),
+        audio_url=clip_data.get("audio_url"),
+        video_url=clip_data.get("video_url"),
+        image_url=clip_data.get("image_url"),
+        image_large_url=clip_data.get("image_large_url"),
+        allow_comments=clip_data.get("allow_comments"),
+        entity_type=clip_data.get("entity_type"),
+        major_model_version=clip_data.get("major_model_version"),
+        model_name=clip_data.get("model_name"),
+        clip_metadata=clip_data.get("metadata"),
+        caption=clip_data.get("caption"),
+        type=clip_data.get("type"),
+        duration=str(clip_data.get("duration")) if clip_data.get("duration") is not None else None,
+        refund_credits=clip_data.get("refund_credits"),
+        stream=clip_data.get("stream"),
+        make_instrumental=clip_data.get("make_instrumental"),
+        can_remix=clip_data.get("can_remix"),
+        is_remix=clip_data.get("is_remix"),
+        priority=clip_data.get("priority"),
+        has_stem=clip_data.get("has_stem"),
+        video_is_stale=clip_data.get("video_is_stale"),
+        uses_latest_model=clip_data.get("uses_latest_model"),
+        is_liked=clip_data.get("is_liked"),
+        user_id=user_id,
+        display_name=clip_data.get("display_name"),
+        handle=clip_data.get("handle"),
+        is_handle_updated=clip_data.get("is_handle_updated"),
+        avatar_image_url=clip_data.get("avatar_image_url"),
+        is_trashed=clip_data.get("is_trashed"),
+        is_public=clip_data.get("is_public"),
+        explicit=clip_data.get("explicit"),
+        comment_count=clip_data.get("comment_count"),
+        flag_count=clip_data.get("flag_count"),
+        is_contest_clip=clip_data.get("is_contest_clip"),
+        has_hook=clip_data.get("has_hook"),
+        batch_index=clip_data.get("batch_index"),
+        is_pinned=clip_data.get("is_pinned")
+    )
+
+
+def playlist_entries(playlist_data: dict) -> List[dict]:
+    entries = playlist_data.get("playlist_clips") or playlist_data.get("clips") or []
+    return [entry["clip"] if "clip" in entry else entry for entry in entries if isinstance(entry, dict)]
+
+
+def profile_graph(data: dict, profile_id: UUID) -> Tuple[List[dict], List[dict], List[dict]]:
+    owner = Profile(id=profile_id)
+    clip_rows = [to_row(create_clip_profile(c=c, profile=owner)) for c in data.get("clips", []) if c.get("id")]
+    playlist_rows = []
+    links = []
+    for p in data.get("playlists", []):
+        if not p.get("id"):
+            continue
+        playlist = create_playlist_profile(p, owner)
+        playlist.handle = p.get("handle", data.get("handle"))
+        playlist_rows.append(to_row(playlist))
+        for clip_data in playlist_entries(p):
+            if clip_data.get("id"):
+                clip_row = to_row(create_clip_profile(c=clip_data, profile=owner))
+                clip_rows.append(clip_row)
+                links.append({"playlist_id": playlist.id, "clip_id": clip_row["id"]})
+    return clip_rows, playlist_rows, links
+
+
+def playlists_graph(items: Iterable[dict]) -> Tuple[List[dict], List[dict], List[dict]]:
+    clip_rows = []
+    playlist_rows = []
+    links = []
+    for playlist_data in items:
+        if not isinstance(playlist_data, dict) or parse_uuid(playlist_data.get("id")) is None:
+            continue
+        playlist_row = to_row(create_playlist(playlist_data))
+        playlist_rows.append(playlist_row)
+        for clip_data in playlist_entries(playlist_data):
+            if parse_uuid(clip_data.get("id")) is None:
+                continue
+            clip_row = to_row(create_clip(clip_data))
+            clip_rows.append(clip_row)
+            links.append({"playlist_id": playlist_row["id"], "clip_id": clip_row["id"]})
+    return clip_rows, playlist_rows, links
+
+
+def build_profile(data: dict) -> Profile:
+    profile = create_profile(data)
+    profile.clips = [create_clip_profile(c=c, profile=profile) for c in data.get("clips", []) if c.get("id")]
+    playlists = []
+    for p in data.get("playlists", []):
+        if not p.get("id"):
+            continue
+        playlist = create_playlist_profile(p, profile)
+        playlist.handle = p.get("handle", data.get("handle"))
+        playlist.clips = [create_clip_profile(c=c, profile=profile) for c in playlist_entries(p) if c.get("id")]
+        playlists.append(playlist)
+    profile.playlists = playlists
+    return profile
+
+
+def build_playlist(data: dict) -> Playlist:
+    playlist = create_playlist(data)
+    playlist.clips = [create_clip(c) for c in playlist_entries(data) if c.get("id")]
+    return playlist
@@ -0,0 +1,237 @@
+import base64
+import bisect
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.entities import Clip, Playlist, Profile
+from services.pagination import InvalidCursor
+from storage.base import Repository
+from storage.builders import build_playlist, build_profile, create_clip
+
+FOLDERS = {"profile": "profiles", "playlist": "playlists", "clip": "clips"}
+CLIP_SORTS = ("created_at", "play_count", "id")
+
+SortEntry = Tuple[bool, Any, str]
+
+
+def encode_key(key: str, sort: str = "file", value: Any = None) -> str:
+    keys = [key] if sort == "file" else [value, key]
+    payload = json.dumps({"s": sort, "k": keys}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = "file") -> list:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        keys = payload["k"]
+        key = keys[-1]
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if payload.get("s") != sort or not isinstance(key, str) or len(keys) != (1 if sort == "file" else 2):
+        raise InvalidCursor(f"Cursor does not match sort order '{sort}'")
+    return keys
+
+
+def decode_key(cursor: str) -> str:
+    return decode_cursor(cursor)[0]
+
+
+class JsonRepository(Repository):
+    def __init__(self, root: str = "json", cache_size: int = 1024):
+        self.root = root
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, Tuple[int, List[str]]] = {}
+        self._sorted: Dict[Tuple[str, str], Tuple[Dict[str, int], List[SortEntry], Dict[str, Tuple[int, Any]]]] = {}
+        self._files: "OrderedDict[str, Tuple[int, dict]]" = OrderedDict()
+        self._bodies: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+
+    def path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, FOLDERS[kind], f"{os.path.basename(str(key))}.json")
+
+    def keys(self, kind: str) -> List[str]:
+        folder = os.path.join(self.root, FOLDERS[kind])
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            cached = self._indexes.get(kind)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        keys = sorted(name[:-5] for name in os.listdir(folder) if name.endswith(".json"))
+        with self._lock:
+            self._indexes[kind] = (mtime, keys)
+        return keys
+
+    def stamps(self, kind: str) -> Dict[str, int]:
+        stamps = {}
+        for key in self.keys(kind):
+            try:
+                stamps[key] = os.stat(self.path(kind, key)).st_mtime_ns
+            except FileNotFoundError:
+                continue
+        return stamps
+
+    def sorted_entries(self, kind: str, field: str) -> List[SortEntry]:
+        """Ascending (has value, value, key) entries; walked backwards they give value DESC NULLS LAST, key DESC.
+
+        Keyed on every file's mtime, so in-place edits re-sort too; only files that changed are re-read.
+        """
+        stamps = self.stamps(kind)
+        with self._lock:
+            cached = self._sorted.get((kind, field))
+            if cached and cached[0] == stamps:
+                return cached[1]
+        known = cached[2] if cached else {}
+        values = {}
+        for key, mtime in stamps.items():
+            hit = known.get(key)
+            values[key] = hit if hit and hit[0] == mtime else (mtime, (self.read(kind, key) or {}).get(field))
+        entries = sorted((value is not None, value, key) for key, (_, value) in values.items())
+        with self._lock:
+            self._sorted[(kind, field)] = (stamps, entries, values)
+        return entries
+
+    def read(self, kind: str, key: str) -> Optional[dict]:
+        path = self.path(kind, key)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        data = self._cached(self._files, path, mtime)
+        if data is None:
+            data = self._load(path, mtime)[0]
+        return data
+
+    def read_bytes(self, kind: str, key: str) -> Optional[bytes]:
+        """The file body as stored, for serving without a decode/encode round trip; None if it is not valid JSON."""
+        path = self.path(kind, key)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        body = self._cached(self._bodies, path, mtime)
+        if body is None:
+            body = self._load(path, mtime)[1]
+        return body
+
+    def _load(self, path: str, mtime: int) -> Tuple[Optional[dict], Optional[bytes]]:
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+            data = json.loads(body)
+        except (OSError, ValueError):
+            return None, None
+        if not isinstance(data, dict):
+            return None, None
+        self._store(self._files, path, mtime, data)
+        self._store(self._bodies, path, mtime, body)
+        return data, body
+
+    def _cached(self, cache: OrderedDict, path: str, mtime: int):
+        with self._lock:
+            cached = cache.get(path)
+            if cached and cached[0] == mtime:
+                cache.move_to_end(path)
+                return cached[1]
+        return None
+
+    def _store(self, cache: OrderedDict, path: str, mtime: int, value):
+        with self._lock:
+            cache[path] = (mtime, value)
+            cache.move_to_end(path)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def write(self, kind: str, key: str, data: dict):
+        path = self.path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+
+    def page(self, kind: str, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[dict], Optional[str]]:
+        keys = self.keys(kind)
+        start = bisect.bisect_right(keys, decode_key(cursor)) if cursor else offset
+        items = []
+        last = None
+        for index in range(start, len(keys)):
+            if len(items) == limit:
+                return items, encode_key(last)
+            data = self.read(kind, keys[index])
+            if data is not None:
+                items.append(data)
+                last = keys[index]
+        return items, None
+
+    def sorted_page(self, kind: str, field: str, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[dict], Optional[str]]:
+        entries = self.sorted_entries(kind, field)
+        if cursor:
+            value, key = decode_cursor(cursor, field)
+            try:
+                start = bisect.bisect_left(entries, (value is not None, value, key)) - 1
+            except TypeError as e:
+                raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+        else:
+            start = len(entries) - 1 - offset
+        items = []
+        last = None
+        for index in range(start, -1, -1):
+            if len(items) == limit:
+                return items, encode_key(last[2], field, last[1])
+            data = self.read(kind, entries[index][2])
+            if data is not None:
+                items.append(data)
+                last = entries[index]
+        return items, None
+
+    def get_profile(self, handle: str) -> Optional[Profile]:
+        data = self.read("profile", handle)
+        return build_profile(data) if data else None
+
+    def list_profiles(self, limit: int, cursor: Optional[str] = None, offset: int = 0):
+        items, next_cursor = self.page("profile", limit, cursor, offset)
+        return [build_profile(data) for data in items], next_cursor
+
+    def get_playlist(self, playlist_id) -> Optional[Playlist]:
+        data = self.read("playlist", playlist_id)
+        return build_playlist(data) if data else None
+
+    def list_playlists(self, limit: int, cursor: Optional[str] = None, offset: int = 0):
+        items, next_cursor = self.page("playlist", limit, cursor, offset)
+        return [build_playlist(data) for data in items], next_cursor
+
+    def get_clip(self, clip_id) -> Optional[Clip]:
+        data = self.read("clip", clip_id)
+        return create_clip(data) if data else None
+
+    def clip_page(self, limit: int, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at") -> Tuple[List[dict], Optional[str]]:
+        if sort not in CLIP_SORTS:
+            raise InvalidCursor(f"Unknown clip sort order '{sort}'")
+        if sort == "id":
+            return self.page("clip", limit, cursor, offset)
+        return self.sorted_page("clip", sort, limit, cursor, offset)
+
+    def list_clips(self, limit: int, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at"):
+        items, next_cursor = self.clip_page(limit, cursor, offset, sort)
+        return [create_clip(data) for data in items], next_cursor
+
+    def save_profiles(self, items: List[dict]) -> int:
+        for data in items:
+            self.write("profile", data["handle"], data)
+        return len(items)
+
+    def save_playlists(self, items: List[dict]) -> int:
+        for data in items:
+            self.write("playlist", data["id"], data)
+        return len(items)
+
+    def save_clips(self, items: List[dict]) -> int:
+        for data in items:
+            self.write("clip", data["id"], data)
+        return len(items)
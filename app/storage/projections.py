@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy import select
+
+from models.clip import ClipDTO, ClipSlimDTO
+from models.entities import Clip, Playlist, Profile, playlist_clips
+from models.playlist import PlaylistDTO
+from models.profile import ProfileDTO
+from services.mappers import CLIP_FIELDS, CLIP_SLIM_FIELDS, PLAYLIST_FIELDS
+from services.pagination import CLIP_KEYSETS, PLAYLIST_KEYSET, PROFILE_KEYSET, Keyset, paginate_rows
+
+PROFILE_FIELDS = ('id', 'handle', 'display_name', 'profile_description', 'avatar_image_url')
+
+PROJECTIONS = {
+    ClipSlimDTO: (Clip, CLIP_SLIM_FIELDS),
+    ClipDTO: (Clip, CLIP_FIELDS),
+    PlaylistDTO: (Playlist, PLAYLIST_FIELDS + ('profile_id', 'user_handle')),
+    ProfileDTO: (Profile, PROFILE_FIELDS),
+}
+
+
+def columns(dto, keyset: Optional[Keyset] = None) -> list:
+    entity, names = PROJECTIONS[dto]
+    selected = [getattr(entity, name) for name in names]
+    if keyset is not None and keyset.column is not None and keyset.column.key not in names:
+        selected.append(keyset.column)
+    return selected
+
+
+def view(row, **relations) -> SimpleNamespace:
+    return SimpleNamespace(**row._mapping, **relations)
+
+
+def clip_page(db, dto, limit: int, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at"):
+    keyset = CLIP_KEYSETS[sort]
+    rows, next_cursor = paginate_rows(db, select(*columns(dto, keyset)), keyset, limit, cursor, offset)
+    return [view(row) for row in rows], next_cursor
+
+
+def playlist_page(db, limit: int, cursor: Optional[str] = None, offset: int = 0):
+    rows, next_cursor = paginate_rows(db, select(*columns(PlaylistDTO)), PLAYLIST_KEYSET, limit, cursor, offset)
+    playlists = {row.id: view(row, clips=[]) for row in rows}
+    if playlists:
+        stmt = (
+            select(playlist_clips.c.playlist_id, *columns(ClipSlimDTO))
+            .join(Clip, Clip.id == playlist_clips.c.clip_id)
+            .where(playlist_clips.c.playlist_id.in_(playlists))
+        )
+        for row in db.execute(stmt):
+            playlists[row.playlist_id].clips.append(view(row))
+    return list(playlists.values()), next_cursor
+
+
+def profile_page(db, limit: int, cursor: Optional[str] = None, offset: int = 0):
+    rows, next_cursor = paginate_rows(db, select(*columns(ProfileDTO)), PROFILE_KEYSET, limit, cursor, offset)
+    profiles = {row.id: view(row, clips=[], playlists=[]) for row in rows}
+    if not profiles:
+        return [], next_cursor
+
+    clips = {}
+    for row in db.execute(select(Clip.profile_id, *columns(ClipSlimDTO)).where(Clip.profile_id.in_(profiles))):
+        clip = clips[row.id] = view(row)
+        profiles[row.profile_id].clips.append(clip)
+
+    playlists = {}
+    for row in db.execute(select(*columns(PlaylistDTO)).where(Playlist.profile_id.in_(profiles))):
+        owner = profiles[row.profile_id]
+        playlist = playlists[row.id] = view(row, profile=owner, clips=[])
+        owner.playlists.append(playlist)
+
+    if playlists:
+        links = select(playlist_clips.c.playlist_id, playlist_clips.c.clip_id).where(playlist_clips.c.playlist_id.in_(playlists))
+        for playlist_id, clip_id in db.execute(links):
+            if clip_id in clips:
+                playlists[playlist_id].clips.append(clips[clip_id])
+    return list(profiles.values()), next_cursor
@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, select, update
+
+from models.clip import ClipDTO
+from models.entities import Clip, EntityFetch, Playlist, Profile, playlist_clips
+from services.dto_cache import dto_cache
+from services.bulk import bulk_insert_ignore, bulk_upsert, to_row, upsert_returning
+from services.loading import JOINED, playlist_options, profile_options
+from services.mappers import create_clip_slim
+from services.pagination import PLAYLIST_KEYSET, PROFILE_KEYSET, paginate
+from storage.base import Repository
+from storage.builders import create_profile, parse_uuid, playlists_graph, profile_graph
+from storage.projections import clip_page, playlist_page, profile_page
+
+
+DEPENDENTS_CHUNK = 500
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def dependents(db, clip_ids: Iterable = (), playlist_ids: Iterable = ()) -> Dict[str, Set[str]]:
+    """Cached bodies that embed the given clips or playlists: containing playlists and owning profiles."""
+    found: Dict[str, Set[str]] = {"clip": {str(key) for key in clip_ids}, "playlist": set(), "profile": set()}
+    clip_ids = [parse_uuid(key) for key in found["clip"]]
+    playlist_ids = {parse_uuid(key) for key in playlist_ids}
+    for chunk in _chunks([key for key in clip_ids if key is not None]):
+        playlist_ids.update(db.execute(select(playlist_clips.c.playlist_id).where(playlist_clips.c.clip_id.in_(chunk))).scalars())
+        found["profile"].update(db.execute(
+            select(Profile.handle).join(Clip, Clip.profile_id == Profile.id).where(Clip.id.in_(chunk))
+        ).scalars())
+    playlist_ids.discard(None)
+    for chunk in _chunks(list(playlist_ids)):
+        found["profile"].update(db.execute(
+            select(Profile.handle).join(Playlist, Playlist.profile_id == Profile.id).where(Playlist.id.in_(chunk))
+        ).scalars())
+    found["playlist"] = {str(key) for key in playlist_ids}
+    return found
+
+
+def profile_children(db, profile_id) -> Dict[str, List[str]]:
+    return {
+        "clip": [str(key) for key in db.execute(select(Clip.id).where(Clip.profile_id == profile_id)).scalars()],
+        "playlist": [str(key) for key in db.execute(select(Playlist.id).where(Playlist.profile_id == profile_id)).scalars()],
+    }
+
+
+def profile_dependents(db, profile_id) -> Dict[str, Set[str]]:
+    children = profile_children(db, profile_id)
+    return dependents(db, children["clip"], children["playlist"])
+
+
+def touch_dependents(db, found: Dict[str, Set[str]]):
+    """Moves the fetch stamps of embedding profiles and playlists by a microsecond.
+
+    Other processes key their cached bodies on these stamps, so their next read
+    misses; the tiny step leaves the TTL of the embedding entity unchanged.
+    """
+    for kind in ("profile", "playlist"):
+        for chunk in _chunks(sorted(found.get(kind, ()))):
+            stamps = db.execute(
+                select(EntityFetch.entity_id, EntityFetch.fetched_at)
+                .where(EntityFetch.entity_type == kind, EntityFetch.entity_id.in_(chunk))
+            ).all()
+            for entity_id, fetched_at in stamps:
+                db.execute(
+                    update(EntityFetch)
+                    .where(EntityFetch.entity_type == kind, EntityFetch.entity_id == entity_id)
+                    .values(fetched_at=fetched_at + timedelta(microseconds=1))
+                )
+
+
+def retire(db, deleted: Dict[str, Iterable], found: Dict[str, Set[str]]):
+    """Drops the fetch stamps of deleted entities and moves those of the bodies that embedded them."""
+    for kind, keys in deleted.items():
+        for chunk in _chunks([str(key) for key in keys]):
+            db.execute(delete(EntityFetch).where(EntityFetch.entity_type == kind, EntityFetch.entity_id.in_(chunk)))
+    touch_dependents(db, found)
+
+
+def invalidate_dependents(found: Dict[str, Set[str]]):
+    for kind, keys in found.items():
+        dto_cache.invalidate(kind, keys)
+
+
+def _chunks(keys: list):
+    for start in range(0, len(keys), DEPENDENTS_CHUNK):
+        yield keys[start:start + DEPENDENTS_CHUNK]
+
+
+class SqlRepository(Repository):
+    def __init__(self, db, strategy: Optional[str] = None, owns_session: bool = False):
+        self.db = db
+        self.strategy = strategy
+        self.owns_session = owns_session
+
+    def get_profile(self, handle: str, strategy: Optional[str] = None) -> Optional[Profile]:
+        query = self.db.query(Profile).options(*profile_options(strategy or self.strategy)).populate_existing()
+        return query.filter(Profile.handle == handle).first()
+
+    def list_profiles(self, limit: int, cursor: Optional[str] = None, offset: int = 0, strategy: Optional[str] = None):
+        """Column views unless a loading strategy is chosen, in which case the ORM graph is loaded with it."""
+        strategy = strategy or self.strategy
+        if strategy is None:
+            return profile_page(self.db, limit, cursor, offset)
+        query = self.db.query(Profile).options(*profile_options(strategy))
+        return paginate(query, PROFILE_KEYSET, limit, cursor, offset)
+
+    def get_playlist(self, playlist_id, strategy: Optional[str] = JOINED) -> Optional[Playlist]:
+        playlist_id = parse_uuid(playlist_id)
+        if playlist_id is None:
+            return None
+        query = self.db.query(Playlist).options(*playlist_options(strategy)).populate_existing()
+        return query.filter(Playlist.id == playlist_id).first()
+
+    def list_playlists(self, limit: int, cursor: Optional[str] = None, offset: int = 0, strategy: Optional[str] = None):
+        strategy = strategy or self.strategy
+        if strategy is None:
+            return playlist_page(self.db, limit, cursor, offset)
+        query = self.db.query(Playlist).options(*playlist_options(strategy))
+        return paginate(query, PLAYLIST_KEYSET, limit, cursor, offset)
+
+    def get_clip(self, clip_id) -> Optional[Clip]:
+        clip_id = parse_uuid(clip_id)
+        if clip_id is None:
+            return None
+        return self.db.query(Clip).populate_existing().filter(Clip.id == clip_id).first()
+
+    def list_clips(self, limit: int, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at"):
+        return clip_page(self.db, ClipDTO, limit, cursor, offset, sort)
+
+    def upsert_profile(self, data: dict):
+        profile_id = upsert_returning(self.db, Profile.__table__, to_row(create_profile(data)), ["handle"], keep_existing=["id"])
+        self._write_graph(*profile_graph(data, profile_id))
+        return profile_id
+
+    def upsert_playlists(self, items: Iterable[dict]) -> List[dict]:
+        clip_rows, playlist_rows, links = playlists_graph(items)
+        self._write_graph(clip_rows, playlist_rows, links)
+        return playlist_rows
+
+    def upsert_clips(self, items: Iterable[dict]) -> List[dict]:
+        rows = [to_row(create_clip_slim(data)) for data in items if parse_uuid(data.get("id")) is not None]
+        bulk_upsert(self.db, Clip.__table__, rows, ["id"], keep_existing=["profile_id"])
+        found = dependents(self.db, clip_ids=[row["id"] for row in rows])
+        touch_dependents(self.db, found)
+        invalidate_dependents(found)
+        return rows
+
+    def _write_graph(self, clip_rows: List[dict], playlist_rows: List[dict], links: List[dict]):
+        bulk_upsert(self.db, Clip.__table__, clip_rows, ["id"], keep_existing=["profile_id"])
+        bulk_upsert(self.db, Playlist.__table__, playlist_rows, ["id"], keep_existing=["profile_id"])
+        bulk_insert_ignore(self.db, playlist_clips, links, ["playlist_id", "clip_id"])
+        found = dependents(
+            self.db,
+            clip_ids=[row["id"] for row in clip_rows],
+            playlist_ids=[row["id"] for row in playlist_rows],
+        )
+        touch_dependents(self.db, found)
+        invalidate_dependents(found)
+
+    def mark_fetched(self, kind: str, keys: Iterable) -> int:
+        fetched_at = utcnow()
+        rows = [{"entity_type": kind, "entity_id": str(key), "fetched_at": fetched_at} for key in keys]
+        dto_cache.invalidate(kind, [row["entity_id"] for row in rows])
+        return bulk_upsert(self.db, EntityFetch.__table__, rows, ["entity_type", "entity_id"])
+
+    def save_profiles(self, items: List[dict]) -> int:
+        for data in items:
+            self.upsert_profile(data)
+        self.mark_fetched("profile", [data["handle"] for data in items])
+        self.db.commit()
+        return len(items)
+
+    def save_playlists(self, items: List[dict]) -> int:
+        rows = self.upsert_playlists(items)
+        self.mark_fetched("playlist", [row["id"] for row in rows])
+        self.db.commit()
+        return len(rows)
+
+    def save_clips(self, items: List[dict]) -> int:
+        rows = self.upsert_clips(items)
+        self.mark_fetched("clip", [row["id"] for row in rows])
+        self.db.commit()
+        return len(rows)
+
+    def close(self):
+        if self.owns_session:
+            self.db.close()
@@ -0,0 +1,61 @@
+import sys
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.async_session import get_async_db_sqlite, get_async_db_sqlite_read
+from models.entities import Base
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session_factory(sqlite_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+
+
+@pytest.fixture
+def sqlite_session(sqlite_session_factory):
+    db = sqlite_session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def sqlite_file_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_sqlite_session_factory(sqlite_file_engine):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{sqlite_file_engine.url.database}", poolclass=NullPool)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def async_sqlite_overrides(async_sqlite_session_factory):
+    async def override():
+        async with async_sqlite_session_factory() as db:
+            yield db
+
+    def apply(app):
+        app.dependency_overrides[get_async_db_sqlite] = override
+        app.dependency_overrides[get_async_db_sqlite_read] = override
+        return app
+
+    return apply
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import sys
 import os
@@ -16,7 +17,7 @@ def test_api_parsing():
     
     try:
         # Fetch the playlist using our service function
-        playlist_data = fetch_playlist_from_suno(playlist_id)
+        playlist_data = asyncio.run(fetch_playlist_from_suno(playlist_id))
         
         print("Successfully parsed playlist data:")
         print(json.dumps(playlist_data, indent=2))
@@ -0,0 +1,143 @@
+import sys
+import os
+import asyncio
+import uuid
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config import async_session
+from config.async_session import async_url, get_async_db_sqlite, get_async_db_sqlite_read, get_async_engine
+from v1.router_tags import router as tags_router
+from v1.dao_sqlite_async import AsyncFreshnessDao, AsyncPlaylistDao, AsyncProfileDao
+from v3.postgres_dao_async import AsyncPostgresClipDAO, AsyncPostgresProfileDAO
+from test_profile_ingest import _profile_payload
+
+
+def _run(factory, fn):
+    async def main():
+        async with factory() as db:
+            return await fn(db)
+    return asyncio.run(main())
+
+
+class TestAsyncEngines:
+
+    def test_async_url_swaps_driver(self):
+        assert async_url("sqlite:///app/suno.db") == "sqlite+aiosqlite:///app/suno.db"
+        assert async_url("postgresql+psycopg2://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError):
+            async_url("mysql://u:p@host/db")
+
+    def test_missing_driver_is_unavailable(self, monkeypatch):
+        def missing():
+            raise ImportError("No module named 'asyncpg'")
+
+        monkeypatch.setitem(async_session.ENGINE_FACTORIES, "missing", missing)
+        with pytest.raises(HTTPException) as e:
+            get_async_engine("missing")
+        assert e.value.status_code == 503
+
+
+class TestAsyncDaos:
+
+    def test_profile_roundtrip(self, async_sqlite_session_factory):
+        data = _profile_payload(4)
+
+        async def scenario(db):
+            dao = AsyncProfileDao(db)
+            await dao.save_profile(data)
+            profile = await dao.get_profile_by_handle("singer")
+            profiles, next_cursor = await dao.get_page(10)
+            return profile, profiles, next_cursor
+
+        profile, profiles, next_cursor = _run(async_sqlite_session_factory, scenario)
+
+        assert len(profile.clips) == 4
+        assert sorted(len(playlist.clips) for playlist in profile.playlists) == [2, 2]
+        assert [p.handle for p in profiles] == ["singer"]
+        assert next_cursor is None
+
+    def test_playlist_lookup_and_pages(self, async_sqlite_session_factory):
+        data = _profile_payload(3, playlist_count=3)
+
+        async def scenario(db):
+            await AsyncProfileDao(db).save_profile(data)
+            dao = AsyncPlaylistDao(db)
+            first_page, cursor = await dao.get_page(2)
+            second_page, _ = await dao.get_page(2, cursor)
+            playlist = await dao.get_by_id(data["playlists"][0]["id"])
+            missing = await dao.get_by_id("not-a-uuid")
+            return first_page, second_page, playlist, missing
+
+        first_page, second_page, playlist, missing = _run(async_sqlite_session_factory, scenario)
+
+        assert len(first_page) + len(second_page) == 3
+        assert playlist.name == "playlist 0"
+        assert len(playlist.clips) == 1
+        assert missing is None
+
+    def test_freshness(self, async_sqlite_session_factory):
+        async def scenario(db):
+            dao = AsyncFreshnessDao(db)
+            before = await dao.is_stale("profile", "singer", 60)
+            await dao.mark_fetched("profile", "singer")
+            return before, await dao.is_stale("profile", "singer", 60), await dao.get_stale({"profile": 60}, 10)
+
+        before, after, stale = _run(async_sqlite_session_factory, scenario)
+
+        assert before is True
+        assert after is False
+        assert stale == []
+
+    def test_postgres_daos_share_the_async_path(self, async_sqlite_session_factory):
+        data = _profile_payload(2)
+        data["clips"] = [dict(clip, handle="singer") for clip in data["clips"]]
+
+        async def scenario(db):
+            profile = await AsyncPostgresProfileDAO(db).save_profile_with_relationships(data)
+            clips, _ = await AsyncPostgresClipDAO(db).get_clips_page(10, sort="id")
+            clip = await AsyncPostgresClipDAO(db).get_clip_by_id(data["clips"][0]["id"])
+            return profile, clips, clip
+
+        profile, clips, clip = _run(async_sqlite_session_factory, scenario)
+
+        assert profile.handle == "singer"
+        assert len(clips) == 2
+        assert str(clip.id) == data["clips"][0]["id"]
+
+
+class TestTagRoutes:
+
+    @pytest.fixture
+    def client(self, async_sqlite_session_factory):
+        app = FastAPI()
+        app.include_router(tags_router, prefix="/api/v1/tags")
+
+        async def override():
+            async with async_sqlite_session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db_sqlite] = override
+        app.dependency_overrides[get_async_db_sqlite_read] = override
+        return TestClient(app)
+
+    def test_crud(self, client):
+        created = client.post("/api/v1/tags/", json={"name": "lofi", "tag_type": "genre"})
+        assert created.status_code == 200
+        tag_id = created.json()["id"]
+
+        assert client.get(f"/api/v1/tags/{tag_id}").json()["name"] == "lofi"
+        assert [tag["name"] for tag in client.get("/api/v1/tags/", params={"tag_type": "genre"}).json()] == ["lofi"]
+
+        updated = client.put(f"/api/v1/tags/{tag_id}", json={"name": "chill", "tag_type": "mood"})
+        assert updated.json()["tag_type"] == "mood"
+
+        assert client.delete(f"/api/v1/tags/{tag_id}").status_code == 200
+        assert client.get(f"/api/v1/tags/{tag_id}").status_code == 404
+        assert client.get(f"/api/v1/tags/{uuid.uuid4()}").status_code == 404
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import sys
+import os
+import threading
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.entities import Profile
+from services import api
+from test_profile_ingest import _profile_payload
+from v1 import service_profile
+from v1.dao_sqlite import FreshnessDao
+from v1.dao_sqlite_async import AsyncProfileDao
+from v1.service_profile import ProfileService
+from services.http_client import JsonResponse
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+def _status_error(status_code):
+    request = httpx.Request("GET", "https://studio-api.prod.suno.com/api/clip/x")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+async def _fail():
+    raise httpx.ConnectTimeout("timeout")
+
+
+async def _ok():
+    return {"id": "x"}
+
+
+class TestCircuitBreaker:
+
+    def test_opens_when_failure_rate_exceeded(self):
+        breaker = CircuitBreaker("test", failure_rate_threshold=0.5, min_calls=4)
+
+        async def run():
+            await breaker.call(_ok)
+            await breaker.call(_ok)
+            for _ in range(2):
+                with pytest.raises(httpx.ConnectTimeout):
+                    await breaker.call(_fail)
+
+        asyncio.run(run())
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.call(_ok))
+
+    def test_stays_closed_below_min_calls(self):
+        breaker = CircuitBreaker("test", min_calls=5)
+        for _ in range(4):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_client_errors_do_not_count_as_failures(self):
+        breaker = CircuitBreaker("test", min_calls=1)
+
+        async def not_found():
+            raise _status_error(404)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(breaker.call(not_found))
+        assert breaker.state == CLOSED
+        assert breaker.failure_rate() == 0.0
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        assert asyncio.run(breaker.call(_ok)) == {"id": "x"}
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_reopens_on_failure(self):
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0)
+        breaker.record_failure()
+        breaker.before_call()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_cancelled_probe_frees_its_slot(self):
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0)
+        breaker.record_failure()
+
+        async def run():
+            probe = asyncio.create_task(breaker.call(lambda: asyncio.sleep(10)))
+            await asyncio.sleep(0)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            return breaker.state, await breaker.call(_ok)
+
+        state, result = asyncio.run(run())
+        assert state == HALF_OPEN
+        assert result == {"id": "x"}
+        assert breaker.state == CLOSED
+
+
+class TestStaleFallback:
+
+    def test_open_circuit_serves_snapshot(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        os.makedirs("json/profiles")
+        with open("json/profiles/someone.json", "w") as f:
+            json.dump({"handle": "someone", "clips": []}, f)
+
+        breaker = CircuitBreaker("profiles", min_calls=1, open_seconds=60)
+        breaker.record_failure()
+        monkeypatch.setattr(api, "get_breaker", lambda name: breaker)
+
+        async def unexpected(*args, **kwargs):
+            raise AssertionError("upstream must not be called while the circuit is open")
+
+        monkeypatch.setattr(api, "get_json_response", unexpected)
+
+        snapshot = asyncio.run(api.fetch_profile_from_suno("someone"))
+        assert snapshot == {"handle": "someone", "clips": []}
+        assert api.is_snapshot(snapshot) and not api.is_live(snapshot)
+        assert asyncio.run(api.fetch_profile_from_suno("nobody")) == {}
+
+    def test_snapshot_file_io_runs_off_the_event_loop(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        threads = []
+        save, load = api.save_to_file_json, api.load_from_file_json
+
+        def recording(function):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return function(*args)
+            return wrapper
+
+        async def response(*args, **kwargs):
+            return JsonResponse({"id": "x"}, 200)
+
+        async def failing(*args, **kwargs):
+            raise httpx.ConnectTimeout("timeout")
+
+        monkeypatch.setattr(api, "save_to_file_json", recording(save))
+        monkeypatch.setattr(api, "load_from_file_json", recording(load))
+        monkeypatch.setattr(api, "get_json_response", response)
+        monkeypatch.setattr(api, "get_breaker", lambda name: CircuitBreaker(name))
+
+        async def run():
+            live = await api.fetch_clip_from_suno("x")
+            monkeypatch.setattr(api, "get_json_response", failing)
+            snapshot = await api.fetch_clip_from_suno("x")
+            return threading.get_ident(), live, snapshot
+
+        loop_thread, live, snapshot = asyncio.run(run())
+        assert api.is_live(live) and api.is_snapshot(snapshot)
+        assert snapshot == {"id": "x"}
+        assert len(threads) == 2 and loop_thread not in threads
+
+    def test_snapshot_is_served_but_not_saved(self, sqlite_file_engine, async_sqlite_session_factory, monkeypatch):
+        data = _profile_payload(2)
+        monkeypatch.setattr(service_profile, "fetch_profile_from_suno", lambda handle: asyncio.sleep(0, api.Snapshot(data)))
+
+        async def scenario():
+            async with async_sqlite_session_factory() as db:
+                return await ProfileService(AsyncProfileDao(db)).refresh_profile("singer")
+
+        profile = asyncio.run(scenario())
+
+        assert profile.handle == "singer" and len(profile.clips) == 2
+        with Session(sqlite_file_engine) as db:
+            assert db.query(Profile).count() == 0
+            assert FreshnessDao(db).get_fetched_at("profile", "singer") is None
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import os
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from main import create_app
+from models.entities import EntityFetch
+from v1 import service_clip, refresh_jobs
+from services.refresh_scheduler import refresh_scheduler
+from v1.dao_sqlite import FreshnessDao, utcnow
+
+CLIP_ID = str(uuid.uuid4())
+
+
+def _clip_payload(title):
+    return {"id": CLIP_ID, "title": title, "audio_url": "https://cdn1.suno.ai/a.mp3", "metadata": {"tags": "pop"}}
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_file_engine):
+    return sqlite_file_engine
+
+
+@pytest.fixture
+def client(async_sqlite_overrides, async_sqlite_session_factory, monkeypatch):
+    app = async_sqlite_overrides(create_app())
+    monkeypatch.setattr(refresh_jobs, "get_async_sessionmaker", lambda name: async_sqlite_session_factory)
+    monkeypatch.setattr(refresh_scheduler, "_pending", {})
+    monkeypatch.setattr(refresh_scheduler, "_popularity", {})
+    return TestClient(app)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def fetch(clip_id):
+        calls.append(clip_id)
+        return _clip_payload(f"title {len(calls)}")
+
+    monkeypatch.setattr(service_clip, "fetch_clip_from_suno", fetch)
+    return calls
+
+
+class TestClipReadThrough:
+
+    def test_missing_clip_is_fetched_inline(self, client, upstream, sqlite_session):
+        response = client.get(f"/api/v1/clips/{CLIP_ID}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "title 1"
+        assert upstream == [CLIP_ID]
+        assert FreshnessDao(sqlite_session).get_fetched_at("clip", CLIP_ID) is not None
+
+    def test_fresh_clip_is_served_without_upstream_call(self, client, upstream):
+        client.get(f"/api/v1/clips/{CLIP_ID}")
+        response = client.get(f"/api/v1/clips/{CLIP_ID}")
+        assert response.json()["title"] == "title 1"
+        assert len(upstream) == 1
+
+    def test_stale_clip_is_served_then_refreshed_by_scheduler(self, client, upstream, sqlite_session):
+        client.get(f"/api/v1/clips/{CLIP_ID}")
+        fetch = sqlite_session.get(EntityFetch, ("clip", CLIP_ID))
+        fetch.fetched_at = utcnow() - timedelta(days=1)
+        sqlite_session.commit()
+
+        response = client.get(f"/api/v1/clips/{CLIP_ID}")
+        assert response.json()["title"] == "title 1"
+        assert len(upstream) == 1
+        assert refresh_scheduler.is_pending("sqlite", "clip", CLIP_ID)
+
+        assert asyncio.run(refresh_scheduler.run_once()) == 1
+        assert len(upstream) == 2
+        assert not refresh_scheduler.is_pending("sqlite", "clip", CLIP_ID)
+
+        response = client.get(f"/api/v1/clips/{CLIP_ID}")
+        assert response.json()["title"] == "title 2"
+        assert len(upstream) == 2
+
+    def test_live_freshness_refetches_inline(self, client, upstream):
+        client.get(f"/api/v1/clips/{CLIP_ID}")
+        response = client.get(f"/api/v1/clips/{CLIP_ID}", params={"freshness": "live"})
+        assert response.json()["title"] == "title 2"
+        assert len(upstream) == 2
+
+    def test_invalid_freshness_is_rejected(self, client, upstream):
+        response = client.get(f"/api/v1/clips/{CLIP_ID}", params={"freshness": "sometimes"})
+        assert response.status_code == 422
+        assert upstream == []
@@ -0,0 +1,274 @@
+import asyncio
+import sys
+import os
+import threading
+import uuid
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.entities import Clip, Playlist, Profile
+from services.http_client import JsonResponse
+from utils import crawler
+from utils.crawl_queue import DONE, FAILED, CrawlQueue
+from storage import SqlRepository
+from utils.crawler import Crawler, RepositoryStore, classify_error
+
+PROFILE_ID = str(uuid.uuid4())
+PLAYLIST_ID = str(uuid.uuid4())
+CLIP_IDS = [str(uuid.uuid4()) for _ in range(3)]
+
+
+def _clip(clip_id):
+    return {"id": clip_id, "title": f"clip {clip_id[:4]}", "metadata": {"tags": "rock"}}
+
+
+PAYLOADS = {
+    "/profiles/singer": {
+        "user_id": PROFILE_ID,
+        "handle": "singer",
+        "display_name": "Singer",
+        "clips": [_clip(clip_id) for clip_id in CLIP_IDS[:2]],
+        "playlists": [{"id": PLAYLIST_ID, "name": "Best"}],
+    },
+    f"/playlist/{PLAYLIST_ID}": {
+        "id": PLAYLIST_ID,
+        "name": "Best",
+        "playlist_clips": [{"clip": _clip(clip_id)} for clip_id in CLIP_IDS],
+    },
+}
+
+
+class RecordingStore:
+    def __init__(self):
+        self.saved = []
+
+    def save(self, kind, items):
+        self.saved.append((kind, [item.get("handle") or item.get("id") for item in items]))
+        return len(items)
+
+
+def _fake_upstream(monkeypatch, calls):
+    async def get_json_response(path, params=None):
+        calls.append(path)
+        if path in PAYLOADS:
+            return JsonResponse(PAYLOADS[path], 200)
+        request = httpx.Request("GET", "https://studio-api.prod.suno.com/api" + path)
+        raise httpx.HTTPStatusError("missing", request=request, response=httpx.Response(404, request=request))
+
+    monkeypatch.setattr(crawler, "get_json_response", get_json_response)
+    monkeypatch.setattr(crawler, "save_to_file_json", lambda *args: None)
+
+
+class TestCrawler:
+
+    def test_profiles_expand_into_playlists(self, monkeypatch):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+        store = RecordingStore()
+
+        stats = asyncio.run(Crawler(store, concurrency=4).run(handles=["singer", "singer"]))
+
+        assert sorted(calls) == sorted(["/profiles/singer", f"/playlist/{PLAYLIST_ID}"])
+        assert stats.fetched["profile"] == 1
+        assert stats.fetched["playlist"] == 1
+        assert ("profile", ["singer"]) in store.saved
+        assert ("playlist", [PLAYLIST_ID]) in store.saved
+
+    def test_fetch_clips_follows_every_clip(self, monkeypatch):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+
+        stats = asyncio.run(Crawler(RecordingStore(), fetch_clips=True).run(handles=["singer"]))
+
+        assert sum(1 for path in calls if path.startswith("/clip/")) == len(CLIP_IDS)
+        assert stats.failed["clip"] == len(CLIP_IDS)
+        assert stats.errors["http_404"] == len(CLIP_IDS)
+
+    def test_batches_are_written_in_bulk(self, monkeypatch):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+        store = RecordingStore()
+
+        asyncio.run(Crawler(store, batch_size=10, expand=False).run(handles=["singer"], playlist_ids=[PLAYLIST_ID]))
+
+        assert len(store.saved) == 2
+
+    def test_repository_store_persists_graph(self, monkeypatch, sqlite_session_factory, sqlite_session):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+        store = RepositoryStore(lambda: SqlRepository(sqlite_session_factory(), owns_session=True))
+
+        stats = asyncio.run(Crawler(store).run(handles=["singer"]))
+
+        assert stats.saved["profile"] == 1
+        assert stats.saved["playlist"] == 1
+        assert sqlite_session.query(Profile).count() == 1
+        assert sqlite_session.query(Playlist).count() == 1
+        assert sqlite_session.query(Clip).count() == len(CLIP_IDS)
+
+    def test_classify_error(self):
+        assert classify_error(httpx.ReadTimeout("slow")) == "timeout"
+        assert classify_error(httpx.ConnectError("refused")) == "transport"
+        assert classify_error(ValueError("bad")) == "ValueError"
+
+
+class TestCrawlQueue:
+
+    def test_restart_skips_done_and_retries_failures(self, monkeypatch, tmp_path):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+        saved_playlist = PAYLOADS.pop(f"/playlist/{PLAYLIST_ID}")
+        queue = CrawlQueue(str(tmp_path / "queue.db"), backoff_seconds=0)
+        try:
+            stats = asyncio.run(Crawler(RecordingStore(), queue=queue).run(handles=["singer"]))
+        finally:
+            PAYLOADS[f"/playlist/{PLAYLIST_ID}"] = saved_playlist
+
+        assert stats.failed["playlist"] == 1
+        assert queue.get("profile", "singer").status == DONE
+        failed = queue.get("playlist", PLAYLIST_ID)
+        assert failed.status == FAILED
+        assert failed.attempts == queue.max_attempts
+        assert "http_404" in failed.last_error
+
+        calls.clear()
+        asyncio.run(Crawler(RecordingStore(), queue=queue).run(handles=["singer"]))
+        assert calls == []
+
+    def test_transient_failures_back_off_and_retry(self, monkeypatch, tmp_path):
+        calls = []
+
+        async def flaky(path, params=None):
+            calls.append(path)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused")
+            return JsonResponse(PAYLOADS[path], 200)
+
+        monkeypatch.setattr(crawler, "get_json_response", flaky)
+        monkeypatch.setattr(crawler, "save_to_file_json", lambda *args: None)
+        queue = CrawlQueue(str(tmp_path / "queue.db"), backoff_seconds=0)
+
+        asyncio.run(Crawler(RecordingStore(), expand=False, queue=queue, retries=0).run(handles=["singer"]))
+        item = queue.get("profile", "singer")
+        assert item.status == FAILED
+        assert item.attempts == 1
+
+        asyncio.run(Crawler(RecordingStore(), expand=False, queue=queue).run())
+        assert queue.get("profile", "singer").status == DONE
+        assert len(calls) == 2
+
+    def test_transient_failures_are_retried_within_the_run(self, monkeypatch, tmp_path):
+        calls = []
+
+        async def flaky(path, params=None):
+            calls.append(path)
+            if len(calls) < 3:
+                raise httpx.ConnectError("refused")
+            return JsonResponse(PAYLOADS[path], 200)
+
+        monkeypatch.setattr(crawler, "get_json_response", flaky)
+        monkeypatch.setattr(crawler, "save_to_file_json", lambda *args: None)
+        queue = CrawlQueue(str(tmp_path / "queue.db"), backoff_seconds=60)
+        store = RecordingStore()
+
+        stats = asyncio.run(asyncio.wait_for(
+            Crawler(store, expand=False, queue=queue, retries=2, retry_backoff=0).run(handles=["singer"]),
+            timeout=5,
+        ))
+
+        assert len(calls) == 3
+        assert stats.failed["profile"] == 2
+        assert stats.retried["profile"] == 2
+        assert store.saved == [("profile", ["singer"])]
+        assert queue.get("profile", "singer").status == DONE
+
+    def test_in_run_retries_are_bounded(self, monkeypatch):
+        calls = []
+
+        async def down(path, params=None):
+            calls.append(path)
+            raise httpx.ConnectError("refused")
+
+        monkeypatch.setattr(crawler, "get_json_response", down)
+
+        stats = asyncio.run(Crawler(RecordingStore(), expand=False, retries=2, retry_backoff=0).run(handles=["singer"]))
+
+        assert len(calls) == 3
+        assert stats.retried["profile"] == 2
+
+    def test_failed_store_batches_are_refetched(self, monkeypatch):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+
+        class FlakyStore(RecordingStore):
+            def save(self, kind, items):
+                if not self.saved:
+                    self.saved.append(None)
+                    raise RuntimeError("database is locked")
+                return super().save(kind, items)
+
+        store = FlakyStore()
+        stats = asyncio.run(Crawler(store, expand=False, retry_backoff=0).run(handles=["singer"]))
+
+        assert calls == ["/profiles/singer", "/profiles/singer"]
+        assert stats.store_errors["profile"] == 1
+        assert store.saved[1:] == [("profile", ["singer"])]
+
+    def test_queue_io_runs_off_the_event_loop(self, monkeypatch, tmp_path):
+        _fake_upstream(monkeypatch, [])
+        threads = set()
+
+        class RecordingQueue(CrawlQueue):
+            def _conn(self):
+                threads.add(threading.get_ident())
+                return super()._conn()
+
+        queue = RecordingQueue(str(tmp_path / "queue.db"))
+
+        async def run():
+            await Crawler(RecordingStore(), queue=queue).run(handles=["singer"])
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        assert threads and loop_thread not in threads
+        assert queue.get("profile", "singer").status == DONE
+
+    def test_worker_survives_a_raising_item(self, monkeypatch, tmp_path):
+        calls = []
+        _fake_upstream(monkeypatch, calls)
+        fetch = Crawler.fetch
+
+        async def raising_fetch(self, kind, key):
+            if key == "broken":
+                raise RuntimeError("malformed payload")
+            return await fetch(self, kind, key)
+
+        monkeypatch.setattr(Crawler, "fetch", raising_fetch)
+        queue = CrawlQueue(str(tmp_path / "queue.db"), backoff_seconds=60)
+
+        stats = asyncio.run(asyncio.wait_for(
+            Crawler(RecordingStore(), concurrency=1, expand=False, queue=queue).run(handles=["broken", "singer"]),
+            timeout=5,
+        ))
+
+        assert stats.failed["profile"] == 1
+        assert stats.fetched["profile"] == 1
+        assert queue.get("profile", "singer").status == DONE
+        failed = queue.get("profile", "broken")
+        assert failed.attempts == 1
+        assert "malformed payload" in failed.last_error
+        assert not queue.is_ready(failed)
+
+    def test_recover_resets_interrupted_items(self, tmp_path):
+        queue = CrawlQueue(str(tmp_path / "queue.db"))
+        queue.add("clip", CLIP_IDS)
+        queue.start("clip", CLIP_IDS[0])
+
+        assert queue.recover() == 1
+        assert {item.key for item in queue.ready()} == set(CLIP_IDS)
+
+    def test_backoff_grows_and_is_capped(self):
+        queue = CrawlQueue(":memory:", backoff_seconds=10, max_backoff_seconds=60)
+        assert [queue.backoff(attempt) for attempt in (1, 2, 3, 4)] == [10, 20, 40, 60]
@@ -0,0 +1,195 @@
+import sys
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from main import create_app
+from services.dto_cache import DtoCache, dto_cache
+from services.refresh_scheduler import refresh_scheduler
+from storage import SqlRepository
+from storage import sql as sql_storage
+from v1 import service_clip, service_profile
+from models.entities import Clip, EntityFetch
+from v1.dao_sqlite import ProfileDao, utcnow
+from test_profile_ingest import _profile_payload
+
+STAMP = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_file_engine):
+    return sqlite_file_engine
+
+
+@pytest.fixture
+def client(async_sqlite_overrides, monkeypatch):
+    app = async_sqlite_overrides(create_app())
+    monkeypatch.setattr(refresh_scheduler, "_pending", {})
+    monkeypatch.setattr(refresh_scheduler, "_popularity", {})
+    dto_cache.clear()
+    yield TestClient(app)
+    dto_cache.clear()
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("DTO rebuilt for a cached entity")
+
+
+class TestDtoCache:
+
+    def test_entries_are_keyed_by_stamp(self):
+        cache = DtoCache()
+        cache.put("clip", "a", STAMP, b"{}")
+
+        assert cache.get("clip", "a", STAMP) == b"{}"
+        assert cache.get("clip", "a", datetime(2026, 1, 2)) is None
+        assert cache.get("clip", "a", None) is None
+        assert cache.stats()["hits"] == 1
+
+    def test_evicts_least_recently_used_by_count_and_bytes(self):
+        cache = DtoCache(max_entries=2, max_bytes=10)
+        cache.put("clip", "a", STAMP, b"aaaa")
+        cache.put("clip", "b", STAMP, b"bbbb")
+        cache.get("clip", "a", STAMP)
+        cache.put("clip", "c", STAMP, b"cccc")
+
+        assert cache.get("clip", "b", STAMP) is None
+        assert cache.get("clip", "a", STAMP) == b"aaaa"
+        assert cache.stats()["bytes"] == 8
+
+        cache.put("clip", "d", STAMP, b"dddddddd")
+        assert cache.stats()["entries"] == 1
+
+    def test_invalidate_drops_entries(self):
+        cache = DtoCache()
+        cache.put("playlist", "a", STAMP, b"{}")
+        cache.invalidate("playlist", ["a", "missing"])
+
+        assert cache.get("playlist", "a", STAMP) is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = DtoCache(enabled=False)
+        cache.put("clip", "a", STAMP, b"{}")
+
+        assert cache.get("clip", "a", STAMP) is None
+
+
+class TestCachedEndpoints:
+
+    def test_profile_is_served_from_cache_until_saved_again(self, client, sqlite_session, monkeypatch):
+        data = _profile_payload(4)
+        SqlRepository(sqlite_session).save_profiles([data])
+
+        first = client.get("/api/v1/profiles/singer")
+        assert first.status_code == 200
+        assert len(first.json()["clips"]) == 4
+
+        monkeypatch.setattr(service_profile, "to_profile_dto", _fail)
+        second = client.get("/api/v1/profiles/singer")
+        assert second.content == first.content
+        assert second.headers["content-type"] == "application/json"
+        assert refresh_scheduler._popularity[("sqlite", "profile", "singer")] == 2
+
+        data["display_name"] = "Renamed"
+        SqlRepository(sqlite_session).save_profiles([data])
+        assert dto_cache.stats()["entries"] == 0
+
+        monkeypatch.undo()
+        assert client.get("/api/v1/profiles/singer").json()["display_name"] == "Renamed"
+
+    def test_stamp_change_from_another_writer_misses(self, client, sqlite_session):
+        SqlRepository(sqlite_session).save_profiles([_profile_payload(2)])
+        client.get("/api/v1/profiles/singer")
+
+        fetch = sqlite_session.get(EntityFetch, ("profile", "singer"))
+        fetch.fetched_at = utcnow()
+        sqlite_session.commit()
+        misses = dto_cache.stats()["misses"]
+
+        assert dto_cache.stats()["entries"] == 1
+        assert client.get("/api/v1/profiles/singer").status_code == 200
+        assert dto_cache.stats()["misses"] == misses + 1
+
+    def test_clip_body_matches_response_model(self, client, sqlite_session, monkeypatch):
+        clip_id = str(uuid.uuid4())
+        SqlRepository(sqlite_session).save_clips([{"id": clip_id, "title": "cached", "metadata": {"tags": "pop"}}])
+
+        first = client.get(f"/api/v1/clips/{clip_id}")
+        assert first.json()["title"] == "cached"
+        assert "image_large_url" not in first.json()
+
+        monkeypatch.setattr(service_clip, "to_clip_dto", _fail)
+        assert client.get(f"/api/v1/clips/{clip_id}").content == first.content
+
+    def test_profile_delete_invalidates(self, sqlite_session):
+        profile = ProfileDao(sqlite_session).save_profile(_profile_payload(1))
+        dto_cache.put("profile", "singer", STAMP, b"{}")
+
+        ProfileDao(sqlite_session).delete(profile.id)
+
+        assert dto_cache.get("profile", "singer", STAMP) is None
+
+    def test_clip_delete_invalidates_owning_profile_and_playlists(self, client, sqlite_session):
+        data = _profile_payload(4)
+        repository = SqlRepository(sqlite_session)
+        repository.save_profiles([data])
+        clip_id = data["clips"][0]["id"]
+        playlist_id = data["playlists"][0]["id"]
+        repository.mark_fetched("playlist", [playlist_id])
+        sqlite_session.commit()
+
+        assert clip_id in [clip["id"] for clip in client.get("/api/v1/profiles/singer").json()["clips"]]
+        assert len(client.get(f"/api/v1/playlists/{playlist_id}").json()["clips"]) == 2
+        assert dto_cache.stats()["entries"] == 2
+
+        assert client.delete(f"/api/v1/clips/{clip_id}").status_code == 200
+
+        assert dto_cache.stats()["entries"] == 0
+        assert clip_id not in [clip["id"] for clip in client.get("/api/v1/profiles/singer").json()["clips"]]
+        assert len(client.get(f"/api/v1/playlists/{playlist_id}").json()["clips"]) == 1
+
+    def test_clip_save_invalidates_embedding_bodies(self, client, sqlite_session):
+        data = _profile_payload(2)
+        SqlRepository(sqlite_session).save_profiles([data])
+        client.get("/api/v1/profiles/singer")
+
+        SqlRepository(sqlite_session).save_clips([dict(data["clips"][0], title="Retitled")])
+
+        titles = [clip["title"] for clip in client.get("/api/v1/profiles/singer").json()["clips"]]
+        assert "Retitled" in titles
+
+    def test_clip_write_from_another_process_moves_the_profile_stamp(self, client, sqlite_session, monkeypatch):
+        data = _profile_payload(2)
+        SqlRepository(sqlite_session).save_profiles([data])
+        client.get("/api/v1/profiles/singer")
+        stamp = sqlite_session.get(EntityFetch, ("profile", "singer")).fetched_at
+
+        monkeypatch.setattr(sql_storage, "dto_cache", DtoCache())
+        SqlRepository(sqlite_session).save_clips([dict(data["clips"][0], title="Elsewhere")])
+
+        assert dto_cache.stats()["entries"] == 1
+        sqlite_session.expire_all()
+        assert sqlite_session.get(EntityFetch, ("profile", "singer")).fetched_at > stamp
+        titles = [clip["title"] for clip in client.get("/api/v1/profiles/singer").json()["clips"]]
+        assert "Elsewhere" in titles
+
+    def test_clip_delete_from_another_process_moves_the_profile_stamp(self, client, sqlite_session):
+        data = _profile_payload(2)
+        SqlRepository(sqlite_session).save_profiles([data])
+        clip_id = data["clips"][0]["id"]
+        client.get("/api/v1/profiles/singer")
+
+        found = sql_storage.dependents(sqlite_session, clip_ids=[clip_id])
+        sql_storage.retire(sqlite_session, {"clip": [clip_id]}, found)
+        sqlite_session.delete(sqlite_session.get(Clip, uuid.UUID(clip_id)))
+        sqlite_session.commit()
+
+        assert dto_cache.stats()["entries"] == 1
+        assert clip_id not in [clip["id"] for clip in client.get("/api/v1/profiles/singer").json()["clips"]]
+        assert sqlite_session.get(EntityFetch, ("clip", clip_id)) is None
@@ -0,0 +1,176 @@
+import asyncio
+import sys
+import os
+import threading
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import http_client
+from config.settings import settings
+
+
+def _mock_client(handler):
+    return httpx.AsyncClient(base_url=settings.suno_api_url, transport=httpx.MockTransport(handler))
+
+
+class TestHttpClient:
+
+    def test_client_is_reused_within_loop(self):
+        async def run():
+            first = http_client.get_client()
+            second = http_client.get_client()
+            await http_client.close_client()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second
+
+    def test_clients_are_kept_per_loop(self):
+        async def leave_open():
+            return http_client.get_client()
+
+        async def run():
+            client = http_client.get_client()
+            stale = len(http_client._clients)
+            await http_client.close_client()
+            await asyncio.sleep(0)
+            return client, stale
+
+        abandoned = asyncio.run(leave_open())
+        client, stale = asyncio.run(run())
+
+        assert client is not abandoned
+        assert stale == 1
+        assert client.is_closed and abandoned.is_closed
+        assert http_client._clients == {}
+
+    def test_client_uses_configured_limits(self):
+        async def run():
+            client = http_client.get_client()
+            pool = client._transport._pool
+            await http_client.close_client()
+            return pool
+
+        pool = asyncio.run(run())
+        assert pool._max_connections == settings.upstream_max_connections
+        assert pool._max_keepalive_connections == settings.upstream_max_keepalive_connections
+
+    def test_get_json_returns_payload(self, monkeypatch):
+        def handler(request):
+            assert request.url.path == "/api/clip/abc"
+            return httpx.Response(200, json={"id": "abc"})
+
+        monkeypatch.setattr(http_client, "create_client", lambda: _mock_client(handler))
+
+        async def run():
+            data = await http_client.get_json("/clip/abc")
+            await http_client.close_client()
+            return data
+
+        assert asyncio.run(run()) == {"id": "abc"}
+
+    def test_get_json_raises_on_error_status(self, monkeypatch):
+        monkeypatch.setattr(http_client, "create_client", lambda: _mock_client(lambda request: httpx.Response(500)))
+
+        async def run():
+            try:
+                await http_client.get_json("/clip/abc")
+            finally:
+                await http_client.close_client()
+
+        try:
+            asyncio.run(run())
+            assert False, "Expected HTTPStatusError"
+        except httpx.HTTPStatusError:
+            pass
+
+
+class TestConditionalGet:
+
+    def test_304_is_served_from_cache(self, tmp_path, monkeypatch):
+        from services import http_cache
+
+        monkeypatch.setattr(http_cache, "http_cache", http_cache.HttpCache(str(tmp_path / "http_cache.db")))
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"handle": "abc"}, headers={"ETag": '"v1"'})
+
+        monkeypatch.setattr(http_client, "create_client", lambda: _mock_client(handler))
+
+        async def run():
+            first = await http_client.get_json_response("/profiles/abc", params={"clips_sort_by": "created_at"})
+            second = await http_client.get_json_response("/profiles/abc", params={"clips_sort_by": "created_at"})
+            await http_client.close_client()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert seen_headers == [None, '"v1"']
+        assert not first.not_modified
+        assert second.not_modified
+        assert second.data == {"handle": "abc"}
+
+    def test_last_modified_is_revalidated(self, tmp_path, monkeypatch):
+        from services import http_cache
+
+        monkeypatch.setattr(http_cache, "http_cache", http_cache.HttpCache(str(tmp_path / "http_cache.db")))
+        stamp = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+        def handler(request):
+            if request.headers.get("If-Modified-Since") == stamp:
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": "p1"}, headers={"Last-Modified": stamp})
+
+        monkeypatch.setattr(http_client, "create_client", lambda: _mock_client(handler))
+
+        async def run():
+            await http_client.get_json("/playlist/p1")
+            response = await http_client.get_json_response("/playlist/p1")
+            await http_client.close_client()
+            return response
+
+        response = asyncio.run(run())
+        assert response.not_modified
+        assert response.data == {"id": "p1"}
+
+    def test_cache_io_runs_off_the_event_loop(self, tmp_path, monkeypatch):
+        from services import http_cache
+
+        threads = []
+
+        class RecordingCache(http_cache.HttpCache):
+            def get(self, url):
+                threads.append(threading.get_ident())
+                return super().get(url)
+
+            def put(self, *args):
+                threads.append(threading.get_ident())
+                return super().put(*args)
+
+            def touch(self, url):
+                threads.append(threading.get_ident())
+                return super().touch(url)
+
+        monkeypatch.setattr(http_cache, "http_cache", RecordingCache(str(tmp_path / "http_cache.db")))
+
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": "c1"}, headers={"ETag": '"v1"'})
+
+        monkeypatch.setattr(http_client, "create_client", lambda: _mock_client(handler))
+
+        async def run():
+            await http_client.get_json("/clip/c1")
+            await http_client.get_json("/clip/c1")
+            await http_client.close_client()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        assert len(threads) == 4
+        assert loop_thread not in threads
@@ -0,0 +1,160 @@
+import sys
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event
+
+from benchmarks.bench_loading import measure, seed
+from main import create_app
+from services import loading
+from services.dto_cache import dto_cache
+from storage import sql as sql_storage
+from v1 import dao_sqlite_async
+from models.clip import ClipDTO
+from models.entities import Clip, Playlist, Profile
+from services.loading import JOINED, SELECTIN, loader, profile_options
+from services.mappers import to_clip_dto, to_playlist, to_profile_dto
+from storage.projections import clip_page, playlist_page, profile_page
+from storage.sql import SqlRepository
+from test_profile_ingest import _profile_payload
+
+
+def _normalized(dto):
+    data = dto.model_dump()
+    data["clips"].sort(key=lambda clip: clip["id"])
+    data["playlists"].sort(key=lambda playlist: playlist["id"])
+    for playlist in data["playlists"]:
+        playlist["clips"].sort(key=lambda clip: clip["id"])
+    return data
+
+
+class TestLoadingStrategies:
+
+    def test_strategies_build_the_same_dto(self, sqlite_session_factory):
+        handle = seed(sqlite_session_factory, clips=12, playlists=3, per_playlist=4)
+
+        dtos = {}
+        for strategy in (JOINED, SELECTIN):
+            db = sqlite_session_factory()
+            try:
+                profile = db.query(Profile).options(*profile_options(strategy)).filter(Profile.handle == handle).first()
+                dtos[strategy] = _normalized(to_profile_dto(profile))
+            finally:
+                db.close()
+
+        assert dtos[JOINED] == dtos[SELECTIN]
+        assert len(dtos[SELECTIN]["clips"]) == 12
+
+    def test_selectin_avoids_cartesian_rows(self, sqlite_engine, sqlite_session_factory):
+        handle = seed(sqlite_session_factory, clips=20, playlists=4, per_playlist=5)
+
+        joined = measure(sqlite_engine, sqlite_session_factory, handle, JOINED, repeat=1)
+        selectin = measure(sqlite_engine, sqlite_session_factory, handle, SELECTIN, repeat=1)
+
+        assert joined["statements"] == 1
+        assert joined["rows"] == 20 * 4 * 5
+        assert selectin["rows"] == 1 + 20 + 4 + 4 * 5
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            loader("subquery-" + uuid.uuid4().hex)
+
+
+class TestEndpointStrategy:
+
+    @pytest.fixture
+    def sqlite_engine(self, sqlite_file_engine):
+        return sqlite_file_engine
+
+    @pytest.fixture
+    def chosen(self, monkeypatch):
+        chosen = []
+
+        def options(strategy=None, nested=True):
+            chosen.append(strategy)
+            return loading.profile_options(strategy, nested)
+
+        monkeypatch.setattr(dao_sqlite_async, "profile_options", options)
+        monkeypatch.setattr(sql_storage, "profile_options", options)
+        return chosen
+
+    @pytest.fixture
+    def client(self, async_sqlite_overrides, sqlite_session):
+        SqlRepository(sqlite_session).save_profiles([_profile_payload(3)])
+        dto_cache.clear()
+        yield TestClient(async_sqlite_overrides(create_app()))
+        dto_cache.clear()
+
+    def test_profile_detail_takes_the_strategy_from_the_query(self, client, chosen):
+        response = client.get("/api/v1/profiles/singer", params={"strategy": SELECTIN})
+
+        assert response.status_code == 200
+        assert len(response.json()["clips"]) == 3
+        assert chosen == [SELECTIN]
+
+    def test_profile_list_loads_entities_with_the_chosen_strategy(self, client, chosen):
+        response = client.get("/api/v1/profiles", params={"strategy": JOINED, "limit": 10})
+
+        assert response.status_code == 200
+        assert [len(profile["clips"]) for profile in response.json()] == [3]
+        assert chosen == [JOINED]
+
+    def test_profile_list_uses_projections_by_default(self, client, chosen):
+        assert client.get("/api/v1/profiles").status_code == 200
+        assert chosen == []
+
+    def test_unknown_strategy_is_rejected(self, client):
+        assert client.get("/api/v1/profiles/singer", params={"strategy": "subquery"}).status_code == 422
+
+
+class TestProjections:
+
+    def test_profile_page_matches_entity_dtos(self, sqlite_engine, sqlite_session):
+        SqlRepository(sqlite_session).save_profiles([_profile_payload(5, handle=f"user{i}") for i in range(3)])
+        statements = []
+        event.listen(sqlite_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+        views, next_cursor = profile_page(sqlite_session, 2)
+        rest, _ = profile_page(sqlite_session, 2, next_cursor)
+
+        assert len(statements) == 8
+        assert all("caption" not in statement for statement in statements)
+        for view in views + rest:
+            profile = sqlite_session.query(Profile).options(*profile_options()).filter(Profile.id == view.id).one()
+            assert _normalized(to_profile_dto(view)) == _normalized(to_profile_dto(profile))
+        assert len(views + rest) == 3
+
+    def test_playlist_page_matches_entity_dtos(self, sqlite_session):
+        SqlRepository(sqlite_session).save_profiles([_profile_payload(6, playlist_count=3)])
+
+        views, next_cursor = playlist_page(sqlite_session, 10)
+
+        assert next_cursor is None
+        for view in views:
+            playlist = sqlite_session.get(Playlist, view.id)
+            expected = to_playlist(playlist).model_dump()
+            actual = to_playlist(view).model_dump()
+            for data in (expected, actual):
+                data["clips"].sort(key=lambda clip: clip["id"])
+            assert actual == expected
+
+    def test_clip_page_selects_only_rendered_columns(self, sqlite_engine, sqlite_session):
+        SqlRepository(sqlite_session).save_clips([{"id": str(uuid.uuid4()), "title": f"clip {i}", "caption": "long"} for i in range(5)])
+        statements = []
+        event.listen(sqlite_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+        seen, cursor = [], None
+        while True:
+            views, cursor = clip_page(sqlite_session, ClipDTO, 2, cursor, sort="play_count")
+            seen.extend(views)
+            if not cursor:
+                break
+
+        assert len({view.id for view in seen}) == 5
+        assert all("caption" not in statement for statement in statements)
+        assert [to_clip_dto(view) for view in seen] == [to_clip_dto(sqlite_session.get(Clip, view.id)) for view in seen]
@@ -0,0 +1,82 @@
+import sys
+import os
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_mappers import build, indexed, quadratic
+from models.entities import Clip, Playlist, Profile
+from services.mappers import (
+    ClipIndex, create_playlist_dto_for_profile, to_clip_dto, to_playlist_dto, to_profile_dto,
+)
+
+
+class TestClipIndex:
+
+    def test_members_follow_profile_order(self):
+        profile = build(clips=10, playlists=1, per_playlist=4)
+        playlist = profile.playlists[0]
+        playlist.clips = list(reversed(playlist.clips))
+
+        members = ClipIndex(profile.clips).members(playlist.clips)
+
+        assert members == profile.clips[:4]
+
+    def test_members_drop_clips_outside_the_profile(self):
+        profile = build(clips=5, playlists=1, per_playlist=2)
+        playlist = profile.playlists[0]
+        playlist.clips.append(Clip(id=uuid.uuid4(), title="foreign"))
+
+        assert ClipIndex(profile.clips).members(playlist.clips) == profile.clips[:2]
+
+    def test_members_match_by_id_for_distinct_instances(self):
+        clip_id = uuid.uuid4()
+        profile = Profile(id=uuid.uuid4(), handle="h", display_name="H")
+        profile.clips = [Clip(id=clip_id, title="a")]
+        playlist = Playlist(id=uuid.uuid4(), name="p")
+        playlist.clips = [Clip(id=clip_id, title="a")]
+
+        dto = to_playlist_dto(playlist, profile.clips)
+
+        assert [clip.id for clip in dto.clips] == [str(clip_id)]
+
+    def test_duplicate_profile_clips_are_mapped_once(self):
+        profile = build(clips=3, playlists=0, per_playlist=0)
+        profile.clips.append(profile.clips[0])
+
+        assert len(to_profile_dto(profile).clips) == 3
+
+
+class TestPlaylistMapping:
+
+    def test_indexed_matches_quadratic(self):
+        profile = build(clips=40, playlists=6, per_playlist=9)
+
+        assert [[clip.model_dump() for clip in clips] for clips in indexed(profile)] == \
+            [[clip.model_dump() for clip in clips] for clips in quadratic(profile)]
+
+    def test_profile_and_helper_agree(self):
+        profile = build(clips=20, playlists=4, per_playlist=5)
+
+        from_profile = to_profile_dto(profile).playlists
+        from_helper = create_playlist_dto_for_profile(profile)
+
+        assert [p.clips for p in from_profile] == [p.clips for p in from_helper]
+        assert all(len(p.clips) == 5 for p in from_profile)
+
+
+class TestClipDtos:
+
+    def test_expired_attributes_are_loaded(self, sqlite_session):
+        clip_id = uuid.uuid4()
+        sqlite_session.add(Clip(id=clip_id, title="expired", audio_url="a.mp3", clip_metadata={"tags": "rock"}))
+        sqlite_session.commit()
+        clip = sqlite_session.get(Clip, clip_id)
+        sqlite_session.expire(clip)
+
+        dto = to_clip_dto(clip)
+
+        assert dto.id == str(clip_id)
+        assert dto.title == "expired"
+        assert dto.audio_url == "a.mp3"
+        assert dto.clip_metadata.tags == "rock"
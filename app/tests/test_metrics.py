@@ -0,0 +1,108 @@
+import asyncio
+import sys
+import os
+
+import httpx
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.settings import settings
+from main import app
+from services import http_cache, http_client
+from services.metrics import Histogram, UpstreamMetrics, endpoint_name, upstream_metrics
+
+
+def _run_get(monkeypatch, handler, path):
+    monkeypatch.setattr(
+        http_client,
+        "create_client",
+        lambda: httpx.AsyncClient(base_url=settings.suno_api_url, transport=httpx.MockTransport(handler)),
+    )
+
+    async def run():
+        try:
+            return await http_client.get_json_response(path)
+        finally:
+            await http_client.close_client()
+
+    return asyncio.run(run())
+
+
+class TestUpstreamMetrics:
+
+    def setup_method(self):
+        upstream_metrics.reset()
+
+    def test_endpoint_name(self):
+        assert endpoint_name("/clip/abc") == "clips"
+        assert endpoint_name("/profiles/singer?page=1") == "profiles"
+        assert endpoint_name("/playlist/xyz") == "playlists"
+
+    def test_histogram_buckets_and_quantiles(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        data = histogram.to_dict()
+        assert data["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+        assert data["p50"] == 0.1
+        assert data["p99"] == float("inf")
+
+    def test_success_records_latency_status_and_bytes(self, monkeypatch):
+        monkeypatch.setattr(http_cache, "http_cache", None)
+        _run_get(monkeypatch, lambda request: httpx.Response(200, json={"id": "abc"}), "/clip/abc")
+
+        clips = upstream_metrics.snapshot()["clips"]
+        assert clips["latency_seconds"]["count"] == 1
+        assert clips["status_codes"] == {"200": 1}
+        assert clips["bytes_downloaded"] == len(b'{"id":"abc"}')
+        assert clips["errors"] == {}
+
+    def test_errors_are_classified(self, monkeypatch):
+        monkeypatch.setattr(http_cache, "http_cache", None)
+
+        def timeout(request):
+            raise httpx.ReadTimeout("slow", request=request)
+
+        for handler in (timeout, lambda request: httpx.Response(503)):
+            try:
+                _run_get(monkeypatch, handler, "/playlist/xyz")
+            except httpx.HTTPError:
+                pass
+
+        errors = upstream_metrics.snapshot()["playlists"]["errors"]
+        assert errors == {"timeout": 1, "http_503": 1}
+
+    def test_cache_hits_and_misses(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(http_cache, "http_cache", http_cache.HttpCache(str(tmp_path / "cache.db")))
+
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": "abc"}, headers={"ETag": '"v1"'})
+
+        _run_get(monkeypatch, handler, "/clip/abc")
+        _run_get(monkeypatch, handler, "/clip/abc")
+
+        assert upstream_metrics.snapshot()["clips"]["cache"] == {"hit": 1, "miss": 1}
+
+    def test_prometheus_rendering(self):
+        metrics = UpstreamMetrics(buckets=(1.0,))
+        metrics.observe_response("clips", 200, 0.5, 10)
+        text = metrics.render_prometheus()
+
+        assert 'suno_upstream_request_seconds_bucket{endpoint="clips",le="1.0"} 1' in text
+        assert 'suno_upstream_responses_total{endpoint="clips",status="200"} 1' in text
+        assert 'suno_upstream_bytes_total{endpoint="clips"} 10' in text
+
+    def test_metrics_endpoint(self):
+        upstream_metrics.observe_response("profiles", 200, 0.2, 100)
+        client = TestClient(app)
+
+        data = client.get("/api/v1/metrics/upstream").json()
+        assert data["endpoints"]["profiles"]["status_codes"] == {"200": 1}
+        assert "rate_limiter" in data
+
+        text = client.get("/api/v1/metrics/upstream", params={"format": "prometheus"}).text
+        assert 'suno_upstream_responses_total{endpoint="profiles",status="200"} 1' in text
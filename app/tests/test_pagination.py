@@ -0,0 +1,132 @@
+import sys
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from main import create_app
+from models.entities import Clip, Playlist
+from services.pagination import CLIP_KEYSETS, PLAYLIST_KEYSET, InvalidCursor, decode_cursor, encode_cursor, paginate
+
+
+def _seed_clips(db, count=23):
+    base = datetime(2024, 1, 1)
+    for i in range(count):
+        created_at = None if i % 7 == 0 else base + timedelta(days=i % 5)
+        db.add(Clip(id=uuid.uuid4(), title=f"clip {i}", created_at=created_at, play_count=i % 4))
+    db.commit()
+
+
+def _walk(db, keyset, limit):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(db.query(Clip), keyset, limit, cursor)
+        seen.extend(row.id for row in rows)
+        if not cursor:
+            return seen
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_file_engine):
+    return sqlite_file_engine
+
+
+@pytest.fixture
+def client(async_sqlite_overrides):
+    return TestClient(async_sqlite_overrides(create_app()))
+
+
+class TestKeysetPagination:
+
+    @pytest.mark.parametrize("sort", sorted(CLIP_KEYSETS))
+    def test_walk_visits_every_row_once_in_order(self, sqlite_session, sort):
+        _seed_clips(sqlite_session)
+        keyset = CLIP_KEYSETS[sort]
+
+        walked = _walk(sqlite_session, keyset, limit=4)
+        expected = [clip.id for clip in sqlite_session.query(Clip).order_by(*keyset.order_by()).all()]
+
+        assert walked == expected
+        assert len(set(walked)) == 23
+
+    def test_pages_stay_full_across_the_null_tail(self, sqlite_session):
+        _seed_clips(sqlite_session)
+        keyset = CLIP_KEYSETS["created_at"]
+        sizes, cursor = [], None
+        while True:
+            rows, cursor = paginate(sqlite_session.query(Clip), keyset, 5, cursor)
+            sizes.append(len(rows))
+            if not cursor:
+                break
+
+        assert sizes == [5, 5, 5, 5, 3]
+
+    def test_inserts_do_not_shift_later_pages(self, sqlite_session):
+        _seed_clips(sqlite_session, 10)
+        keyset = CLIP_KEYSETS["created_at"]
+        first, cursor = paginate(sqlite_session.query(Clip), keyset, 5)
+
+        sqlite_session.add(Clip(id=uuid.uuid4(), title="newest", created_at=datetime(2030, 1, 1)))
+        sqlite_session.commit()
+        second, _ = paginate(sqlite_session.query(Clip), keyset, 5, cursor)
+
+        assert not {clip.id for clip in first} & {clip.id for clip in second}
+        assert "newest" not in [clip.title for clip in second]
+
+    def test_cursor_is_bound_to_sort_order(self):
+        cursor = encode_cursor(CLIP_KEYSETS["play_count"], [3, str(uuid.uuid4())])
+
+        assert decode_cursor(CLIP_KEYSETS["play_count"], cursor)[0] == 3
+        with pytest.raises(InvalidCursor):
+            decode_cursor(CLIP_KEYSETS["created_at"], cursor)
+        with pytest.raises(InvalidCursor):
+            decode_cursor(PLAYLIST_KEYSET, "not-a-cursor")
+
+
+class TestPaginatedEndpoints:
+
+    def test_clips_cursor_envelope_and_header(self, client, sqlite_session):
+        _seed_clips(sqlite_session, 5)
+
+        response = client.get("/api/v1/clips", params={"size": 2, "cursor": ""})
+        body = response.json()
+        assert len(body["items"]) == 2
+        assert body["next_cursor"] == response.headers["X-Next-Cursor"]
+
+        ids = [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        while cursor:
+            body = client.get("/api/v1/clips", params={"size": 2, "cursor": cursor}).json()
+            ids += [item["id"] for item in body["items"]]
+            cursor = body.get("next_cursor")
+        assert len(set(ids)) == 5
+
+    def test_clips_legacy_page_is_a_page_number(self, client, sqlite_session):
+        _seed_clips(sqlite_session, 5)
+
+        first = client.get("/api/v1/clips", params={"page": 0, "size": 2})
+        second = client.get("/api/v1/clips", params={"page": 1, "size": 2}).json()
+
+        assert isinstance(first.json(), list)
+        assert "X-Next-Cursor" in first.headers
+        assert not {c["id"] for c in first.json()} & {c["id"] for c in second}
+
+    def test_invalid_cursor_is_rejected(self, client):
+        assert client.get("/api/v1/clips", params={"cursor": "bogus"}).status_code == 400
+        assert client.get("/api/v1/playlists", params={"cursor": "bogus"}).status_code == 400
+
+    def test_playlists_cursor(self, client, sqlite_session):
+        for i in range(3):
+            sqlite_session.add(Playlist(id=uuid.uuid4(), name=f"playlist {i}"))
+        sqlite_session.commit()
+
+        body = client.get("/api/v1/playlists", params={"limit": 2, "cursor": ""}).json()
+        rest = client.get("/api/v1/playlists", params={"limit": 2, "cursor": body["next_cursor"]}).json()
+
+        assert len(body["items"]) == 2
+        assert len(rest["items"]) == 1
+        assert rest["next_cursor"] is None
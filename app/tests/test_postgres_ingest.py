@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import os
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.entities import Clip, EntityFetch, Profile
+from services.bulk import dedupe_rows, to_row, upsert_statement
+from services.refresh_scheduler import refresh_scheduler
+from v1.dao_sqlite import FreshnessDao, utcnow
+from v1.refresh_jobs import stale_entities
+from v3 import refresh_jobs
+from v3.postgres_dao import PostgresProfileDAO
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_file_engine):
+    return sqlite_file_engine
+
+
+def _payload(clip_count):
+    clips = [{"id": str(uuid.uuid4()), "title": f"clip {i}"} for i in range(clip_count)]
+    return {
+        "user_id": str(uuid.uuid4()),
+        "handle": "singer",
+        "display_name": "Singer",
+        "clips": clips,
+        "playlists": [{"id": str(uuid.uuid4()), "name": "Best", "clips": clips[:2]}],
+    }
+
+
+class TestPostgresIngest:
+
+    def test_upsert_compiles_to_on_conflict(self):
+        row = to_row(Clip(id=uuid.uuid4(), title="clip"))
+        sql = str(upsert_statement("postgresql", Clip.__table__, [row, dict(row, id=uuid.uuid4())], ["id"],
+                                   keep_existing=["profile_id"]).compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (id) DO UPDATE SET" in sql
+        assert "profile_id = coalesce(clips.profile_id, excluded.profile_id)" in sql
+        assert "title = coalesce(excluded.title, clips.title)" in sql
+
+    def test_duplicate_rows_are_merged(self):
+        clip_id = uuid.uuid4()
+        rows = dedupe_rows([
+            {"id": clip_id, "title": "full", "audio_url": "a.mp3", "profile_id": None},
+            {"id": clip_id, "title": "partial", "audio_url": None, "profile_id": "p"},
+        ], ["id"])
+
+        assert rows == [{"id": clip_id, "title": "full", "audio_url": "a.mp3", "profile_id": "p"}]
+
+    def test_unsupported_dialect_is_rejected(self):
+        with pytest.raises(ValueError, match="mysql"):
+            upsert_statement("mysql", Clip.__table__, [{"id": uuid.uuid4()}], ["id"])
+
+    def test_save_profile_with_relationships(self, sqlite_session):
+        data = _payload(5)
+
+        profile = PostgresProfileDAO(sqlite_session).save_profile_with_relationships(data)
+
+        assert profile.handle == "singer"
+        assert len(profile.clips) == 5
+        assert len(profile.playlists) == 1
+        assert len(profile.playlists[0].clips) == 2
+        assert profile.playlists[0].handle == "singer"
+
+        data["display_name"] = "Renamed"
+        PostgresProfileDAO(sqlite_session).save_profile_with_relationships(data)
+        assert sqlite_session.query(Profile).one().display_name == "Renamed"
+        assert sqlite_session.query(Clip).count() == 5
+
+    def test_saved_profile_records_fetched_at(self, sqlite_session):
+        PostgresProfileDAO(sqlite_session).save_profile_with_relationships(_payload(1))
+
+        assert FreshnessDao(sqlite_session).get_fetched_at("profile", "singer") is not None
+
+
+class TestPostgresRefresh:
+
+    def test_every_entity_type_has_a_refresher(self):
+        assert {("postgres", kind) for kind in ("profile", "playlist", "clip")} <= set(refresh_scheduler._refreshers)
+
+    def test_stale_source_reports_postgres_keys(self, sqlite_engine, sqlite_session):
+        clip_id = str(uuid.uuid4())
+        sqlite_session.add(EntityFetch(entity_type="clip", entity_id=clip_id, fetched_at=utcnow() - timedelta(days=365)))
+        sqlite_session.commit()
+
+        stale = stale_entities(10, store="postgres", session_factory=sessionmaker(bind=sqlite_engine))
+
+        assert [key for key, _ in stale] == [("postgres", "clip", clip_id)]
+
+    def test_clip_job_saves_and_marks_fetched(self, sqlite_session, async_sqlite_session_factory, monkeypatch):
+        clip_id = str(uuid.uuid4())
+
+        async def fetch(entity_id):
+            return {"id": entity_id, "title": "fresh"}
+
+        monkeypatch.setattr(refresh_jobs, "get_async_sessionmaker", lambda name: async_sqlite_session_factory)
+        monkeypatch.setattr(refresh_jobs, "fetch_clip_from_suno", fetch)
+
+        assert asyncio.run(refresh_jobs.refresh_clip_job(clip_id))
+        assert sqlite_session.get(Clip, uuid.UUID(clip_id)).title == "fresh"
+        assert FreshnessDao(sqlite_session).get_fetched_at("clip", clip_id) is not None
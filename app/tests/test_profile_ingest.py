@@ -0,0 +1,97 @@
+import sys
+import os
+import uuid
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.entities import Clip, Playlist, Profile
+from v1.dao_sqlite import ProfileDao
+
+
+def _profile_payload(clip_count, playlist_count=2, handle="singer", profile_id=None):
+    clips = [{"id": str(uuid.uuid4()), "title": f"clip {i}", "play_count": i} for i in range(clip_count)]
+    playlists = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"playlist {i}",
+            "playlist_clips": [{"clip": clip} for clip in clips[i::playlist_count]],
+        }
+        for i in range(playlist_count)
+    ]
+    return {
+        "user_id": profile_id or str(uuid.uuid4()),
+        "handle": handle,
+        "display_name": "Singer",
+        "clips": clips,
+        "playlists": playlists,
+    }
+
+
+def _count_statements(engine, fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+class TestProfileIngest:
+
+    def test_saves_profile_graph(self, sqlite_session):
+        data = _profile_payload(6)
+        profile = ProfileDao(sqlite_session).save_profile(data)
+
+        assert profile.handle == "singer"
+        assert len(profile.clips) == 6
+        assert len(profile.playlists) == 2
+        assert sorted(len(playlist.clips) for playlist in profile.playlists) == [3, 3]
+
+    def test_query_count_does_not_grow_with_clips(self, sqlite_engine, sqlite_session_factory):
+        def save(clip_count, handle):
+            db = sqlite_session_factory()
+            try:
+                ProfileDao(db).save_profile(_profile_payload(clip_count, handle=handle))
+            finally:
+                db.close()
+
+        small = _count_statements(sqlite_engine, lambda: save(5, "small"))
+        large = _count_statements(sqlite_engine, lambda: save(300, "large"))
+        assert small == large
+
+    def test_resave_updates_fields_and_keeps_ownership(self, sqlite_session):
+        data = _profile_payload(2)
+        dao = ProfileDao(sqlite_session)
+        dao.save_profile(data)
+
+        other = _profile_payload(0, handle="other")
+        other["clips"] = [dict(data["clips"][0], title="renamed")]
+        dao.save_profile(other)
+
+        clip = sqlite_session.get(Clip, uuid.UUID(data["clips"][0]["id"]))
+        assert clip.title == "renamed"
+        assert clip.play_count == 0
+        assert clip.profile_id == uuid.UUID(data["user_id"])
+
+        data["display_name"] = "Renamed Singer"
+        dao.save_profile(data)
+        assert sqlite_session.query(Profile).filter(Profile.handle == "singer").one().display_name == "Renamed Singer"
+        assert sqlite_session.query(Clip).count() == 2
+        assert sqlite_session.query(Playlist).filter(Playlist.profile_id == uuid.UUID(data["user_id"])).count() == 2
+
+    def test_existing_profile_id_is_kept(self, sqlite_session):
+        original = _profile_payload(1)
+        dao = ProfileDao(sqlite_session)
+        dao.save_profile(original)
+
+        profile = dao.save_profile(_profile_payload(1, profile_id=str(uuid.uuid4())))
+
+        assert profile.id == uuid.UUID(original["user_id"])
+        assert len(profile.clips) == 2
@@ -0,0 +1,72 @@
+import asyncio
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class TestAdaptiveRateLimiter:
+
+    def test_burst_is_served_immediately(self):
+        limiter = AdaptiveRateLimiter(rate=1, burst=5, max_in_flight=10)
+        for _ in range(5):
+            assert limiter.try_acquire() == 0.0
+        assert limiter.try_acquire() > 0
+
+    def test_acquire_paces_to_rate(self):
+        limiter = AdaptiveRateLimiter(rate=50, burst=1, max_in_flight=10)
+
+        async def run():
+            for _ in range(6):
+                await limiter.acquire()
+                limiter.release()
+
+        started = time.monotonic()
+        asyncio.run(run())
+        assert time.monotonic() - started >= 0.09
+
+    def test_max_in_flight_is_enforced(self):
+        limiter = AdaptiveRateLimiter(rate=1000, burst=100, max_in_flight=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.02)
+
+        async def run():
+            await asyncio.gather(*[call() for _ in range(8)])
+
+        asyncio.run(run())
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_throttle_response_lowers_rate(self):
+        limiter = AdaptiveRateLimiter(rate=10, burst=10, max_in_flight=10, min_rate=2)
+        limiter.observe(429)
+        assert limiter.rate == 5
+        limiter.observe(503)
+        limiter.observe(503)
+        assert limiter.rate == 2
+
+    def test_success_recovers_rate(self):
+        limiter = AdaptiveRateLimiter(rate=10, burst=10, max_in_flight=10, recovery_step=4)
+        limiter.observe(429)
+        limiter.observe(200)
+        assert limiter.rate == 9
+        limiter.observe(200)
+        assert limiter.rate == 10
+
+    def test_retry_after_blocks_acquire(self):
+        limiter = AdaptiveRateLimiter(rate=10, burst=10, max_in_flight=10)
+        limiter.observe(429, "2")
+        assert limiter.try_acquire() > 1.5
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
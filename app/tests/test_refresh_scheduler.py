@@ -0,0 +1,90 @@
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.refresh_scheduler import RefreshScheduler
+
+
+def _scheduler(budget=2, stale=None):
+    scheduler = RefreshScheduler(interval_seconds=60, budget=budget)
+    refreshed = []
+
+    async def refresh(entity_id):
+        refreshed.append(entity_id)
+        return True
+
+    scheduler.register("sqlite", "profile", refresh)
+    if stale is not None:
+        scheduler.register_stale_source(lambda limit: stale)
+    return scheduler, refreshed
+
+
+class TestRefreshScheduler:
+
+    def test_budget_limits_refreshes_per_cycle(self):
+        scheduler, refreshed = _scheduler(budget=2)
+        for handle in ["a", "b", "c"]:
+            scheduler.request_refresh("sqlite", "profile", handle)
+
+        assert asyncio.run(scheduler.run_once()) == 2
+        assert len(refreshed) == 2
+        assert asyncio.run(scheduler.run_once()) == 1
+        assert len(refreshed) == 3
+
+    def test_popular_entities_are_refreshed_first(self):
+        scheduler, refreshed = _scheduler(budget=1)
+        scheduler.request_refresh("sqlite", "profile", "quiet")
+        scheduler.request_refresh("sqlite", "profile", "popular")
+        for _ in range(5):
+            scheduler.record_request("sqlite", "profile", "popular")
+
+        asyncio.run(scheduler.run_once())
+        assert refreshed == ["popular"]
+
+    def test_older_entities_are_refreshed_first(self):
+        stale = [(("sqlite", "profile", "old"), 5.0), (("sqlite", "profile", "recent"), 1.2)]
+        scheduler, refreshed = _scheduler(budget=1, stale=stale)
+
+        asyncio.run(scheduler.run_once())
+        assert refreshed == ["old"]
+
+    def test_unregistered_entities_are_skipped(self):
+        scheduler, refreshed = _scheduler()
+        scheduler.request_refresh("postgres", "profile", "a")
+        assert scheduler.next_batch() == []
+
+    def test_failed_refresh_is_not_counted(self):
+        scheduler = RefreshScheduler(interval_seconds=60, budget=5)
+
+        async def broken(entity_id):
+            raise RuntimeError("upstream down")
+
+        scheduler.register("sqlite", "clip", broken)
+        scheduler.request_refresh("sqlite", "clip", "x")
+        assert asyncio.run(scheduler.run_once()) == 0
+        assert not scheduler.is_pending("sqlite", "clip", "x")
+
+    def test_popularity_decays_between_cycles(self):
+        scheduler, _ = _scheduler()
+        scheduler.record_request("sqlite", "profile", "a")
+        asyncio.run(scheduler.run_once())
+        assert scheduler.priority(("sqlite", "profile", "a"), 1.0) == 1.5
+
+    def test_only_the_lease_holder_scans_stale_sources(self, tmp_path):
+        lock_path = str(tmp_path / "refresh.lock")
+        leader, leader_refreshed = _scheduler(stale=[(("sqlite", "profile", "old"), 2.0)])
+        follower, follower_refreshed = _scheduler(stale=[(("sqlite", "profile", "old"), 2.0)])
+        leader.lock_path = follower.lock_path = lock_path
+        follower.request_refresh("sqlite", "profile", "asked")
+
+        asyncio.run(leader.run_once())
+        asyncio.run(follower.run_once())
+        assert leader_refreshed == ["old"]
+        assert follower_refreshed == ["asked"]
+
+        asyncio.run(leader.stop())
+        asyncio.run(follower.run_once())
+        assert follower_refreshed == ["asked", "old"]
+        follower.release_lease()
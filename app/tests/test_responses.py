@@ -0,0 +1,93 @@
+import sys
+import os
+import uuid
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.settings import settings
+from main import create_app
+from models.page import Page
+from services import responses
+from services.responses import MsgspecResponse, OrjsonResponse, response_class
+from storage import get_json_repository
+from test_profile_ingest import _profile_payload
+
+
+@pytest.fixture
+def json_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "json_storage_dir", str(tmp_path))
+    get_json_repository.cache_clear()
+    get_json_repository().save_profiles([_profile_payload(2, handle=f"user{i}") for i in range(3)])
+    yield tmp_path
+    get_json_repository.cache_clear()
+
+
+class TestResponseClass:
+
+    def test_selects_renderer_by_name(self):
+        assert response_class("json") is JSONResponse
+        assert response_class("orjson") is OrjsonResponse
+        assert response_class() is response_class(settings.json_renderer)
+        with pytest.raises(ValueError):
+            response_class("yaml")
+
+    def test_missing_library_falls_back_to_json(self, monkeypatch):
+        monkeypatch.setitem(responses.MODULES, "orjson", "not_a_real_module")
+        assert response_class("orjson") is JSONResponse
+
+    @pytest.mark.parametrize("renderer", [OrjsonResponse, MsgspecResponse])
+    def test_renders_models_and_non_string_keys(self, renderer):
+        if renderer is MsgspecResponse:
+            pytest.importorskip("msgspec")
+        clip_id = uuid.uuid4()
+        body = renderer({"page": Page(items=[clip_id], next_cursor=None)}).body
+
+        assert JSONResponse({"page": {"items": [str(clip_id)], "next_cursor": None}}).body == body
+
+    def test_app_uses_configured_renderer(self):
+        assert create_app("orjson").router.default_response_class is OrjsonResponse
+        assert create_app("json").router.default_response_class is JSONResponse
+
+
+class TestV2Rendering:
+
+    @pytest.mark.parametrize("renderer", ["json", "orjson"])
+    def test_list_keeps_cursor_header(self, json_dir, renderer):
+        client = TestClient(create_app(renderer))
+
+        first = client.get("/api/v2/profiles", params={"size": 2})
+        second = client.get("/api/v2/profiles", params={"size": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+        assert first.headers["content-type"] == "application/json"
+        assert [p["handle"] for p in first.json()] == ["user0", "user1"]
+        assert [p["handle"] for p in second.json()["items"]] == ["user2"]
+
+    def test_renderers_produce_the_same_document(self, json_dir):
+        bodies = [TestClient(create_app(name)).get("/api/v2/profiles", params={"size": 3}).json() for name in ("json", "orjson")]
+
+        assert bodies[0] == bodies[1]
+
+    def test_single_entity_is_served_from_file_bytes(self, json_dir):
+        response = TestClient(create_app()).get("/api/v2/profiles/user1")
+
+        assert response.content == (json_dir / "profiles" / "user1.json").read_bytes()
+        assert response.json()["handle"] == "user1"
+
+    def test_undecodable_file_is_not_found(self, json_dir):
+        (json_dir / "profiles" / "broken.json").write_bytes(b'{"handle": "bro')
+
+        assert TestClient(create_app()).get("/api/v2/profiles/broken").status_code == 404
+
+    def test_file_bytes_are_cached_until_the_file_changes(self, json_dir):
+        repository = get_json_repository()
+        first = repository.read_bytes("profile", "user1")
+        assert repository.read_bytes("profile", "user1") is first
+
+        path = json_dir / "profiles" / "user1.json"
+        path.write_bytes(b'{"handle": "user1", "display_name": "Changed"}')
+        os.utime(path, ns=(1, 1))
+        assert b"Changed" in repository.read_bytes("profile", "user1")
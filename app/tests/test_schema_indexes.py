@@ -0,0 +1,89 @@
+import sys
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import inspect, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config import migrations
+from config.migrations import MIGRATIONS, migrate
+from models.entities import Base, Clip, EntityFetch, Playlist, playlist_clips
+from services.pagination import CLIP_KEYSETS, encode_cursor, page_query
+
+
+def _index_names(engine):
+    inspector = inspect(engine)
+    return {index["name"] for table in Base.metadata.tables for index in inspector.get_indexes(table)}
+
+
+def _plan(session, query) -> str:
+    statement = query.statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestMigrations:
+
+    def test_migrate_adds_missing_indexes_once(self, sqlite_engine):
+        expected = {index.name for table in Base.metadata.sorted_tables for index in table.indexes}
+        with sqlite_engine.begin() as conn:
+            for name in expected:
+                conn.execute(text(f"DROP INDEX {name}"))
+        assert not expected & _index_names(sqlite_engine)
+
+        assert migrate(sqlite_engine) == [version for version, _, _ in MIGRATIONS]
+        assert expected <= _index_names(sqlite_engine)
+        assert migrate(sqlite_engine) == []
+
+    def test_version_recorded_by_another_process_counts_as_applied(self, sqlite_engine, monkeypatch):
+        migrate(sqlite_engine)
+        monkeypatch.setattr(migrations, "applied_versions", lambda engine: [])
+
+        assert migrate(sqlite_engine) == []
+
+    def test_concurrent_workers_apply_each_migration_once(self, sqlite_file_engine):
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: migrate(sqlite_file_engine), range(4)))
+
+        applied = sorted(version for ran in results for version in ran)
+        assert applied == [version for version, _, _ in MIGRATIONS]
+
+
+class TestQueryPlans:
+
+    @pytest.mark.parametrize("query, index", [
+        (lambda db: db.query(Clip).filter(Clip.user_id == uuid.uuid4()), "ix_clips_user_id"),
+        (lambda db: db.query(Clip).filter(Clip.profile_id == uuid.uuid4()), "ix_clips_profile_id"),
+        (lambda db: db.query(Playlist).filter(Playlist.profile_id == uuid.uuid4()), "ix_playlists_profile_id"),
+        (lambda db: db.query(playlist_clips).filter(playlist_clips.c.clip_id == uuid.uuid4()), "ix_playlist_clips_clip_id"),
+        (lambda db: db.query(EntityFetch).filter(EntityFetch.entity_type == "clip", EntityFetch.fetched_at < "2024-01-01"), "ix_entity_fetches_type_fetched_at"),
+    ])
+    def test_lookups_use_indexes(self, sqlite_session, query, index):
+        assert index in _plan(sqlite_session, query(sqlite_session))
+
+    @pytest.mark.parametrize("sort, index", [
+        ("created_at", "ix_clips_created_at_id"),
+        ("play_count", "ix_clips_play_count_id"),
+    ])
+    def test_first_page_scans_index_without_sorting(self, sqlite_session, sort, index):
+        plan = _plan(sqlite_session, page_query(sqlite_session.query(Clip), CLIP_KEYSETS[sort], 25))
+
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.parametrize("sort, index, value", [
+        ("created_at", "ix_clips_created_at_id", "2024-01-01T00:00:00"),
+        ("created_at", "ix_clips_created_at_id", None),
+        ("play_count", "ix_clips_play_count_id", 3),
+        ("play_count", "ix_clips_play_count_id", None),
+    ])
+    def test_keyset_pages_seek_index_without_sorting(self, sqlite_session, sort, index, value):
+        keyset = CLIP_KEYSETS[sort]
+        cursor = encode_cursor(keyset, [value, str(uuid.uuid4())])
+        plan = _plan(sqlite_session, page_query(sqlite_session.query(Clip), keyset, 25, cursor=cursor))
+
+        assert f"SEARCH clips USING INDEX {index}" in plan
+        assert "USE TEMP B-TREE" not in plan
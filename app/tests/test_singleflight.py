@@ -0,0 +1,156 @@
+import asyncio
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"handle": "abc"}
+
+        async def run():
+            return await asyncio.gather(*[flight.do(("profile", "abc"), fetch) for _ in range(10)])
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(result == {"handle": "abc"} for result in results)
+        assert not flight.in_flight(("profile", "abc"))
+
+    def test_different_keys_are_not_coalesced(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        async def run():
+            return await asyncio.gather(
+                flight.do(("profile", "a"), lambda: fetch("a")),
+                flight.do(("clip", "a"), lambda: fetch("b")),
+            )
+
+        assert asyncio.run(run()) == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    def test_errors_propagate_to_all_callers(self):
+        flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def run():
+            return await asyncio.gather(*[flight.do("key", fetch) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not flight.in_flight("key")
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        flight = SingleFlight("test")
+        started = []
+
+        async def fetch(name):
+            started.append(name)
+            await asyncio.sleep(0.05)
+            return name
+
+        async def run():
+            leader = asyncio.create_task(flight.do("key", lambda: fetch("leader")))
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(flight.do("key", lambda: fetch("follower")))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            result = await follower
+            return leader.cancelled(), follower.cancelled(), result
+
+        assert asyncio.run(run()) == (True, False, "follower")
+        assert started == ["leader", "follower"]
+        assert not flight.in_flight("key")
+
+    def test_cancelled_follower_leaves_the_flight_running(self):
+        flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            leader = asyncio.create_task(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            with_timeout = asyncio.create_task(asyncio.wait_for(flight.do("key", fetch), 0.01))
+            patient = asyncio.create_task(flight.do("key", fetch))
+            results = await asyncio.gather(leader, with_timeout, patient, return_exceptions=True)
+            return results[0], type(results[1]), results[2]
+
+        assert asyncio.run(run()) == ("done", asyncio.TimeoutError, "done")
+
+    def test_callers_in_other_threads_join_the_flight(self):
+        flight = SingleFlight("test")
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            started.set()
+            await asyncio.to_thread(release.wait, 5)
+            return "done"
+
+        results = []
+
+        def leader():
+            results.append(asyncio.run(flight.do("key", fetch)))
+
+        def follower():
+            results.append(asyncio.run(flight.do("key", fetch)))
+
+        leader_thread = threading.Thread(target=leader)
+        leader_thread.start()
+        assert started.wait(5)
+        follower_thread = threading.Thread(target=follower)
+        follower_thread.start()
+        time.sleep(0.1)
+        release.set()
+        leader_thread.join(5)
+        follower_thread.join(5)
+
+        assert len(calls) == 1
+        assert results == ["done", "done"]
+
+    def test_contended_file_lock_uses_recheck(self, tmp_path):
+        from filelock import FileLock
+
+        first = SingleFlight("test", lock_dir=str(tmp_path), lock_timeout=5)
+        second = SingleFlight("test", lock_dir=str(tmp_path), lock_timeout=5)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return "fetched"
+
+        lock = FileLock(second._lock_path("key"), thread_local=False)
+        lock.acquire()
+
+        async def run():
+            task = asyncio.create_task(first.do("key", fetch, recheck=lambda: "stored"))
+            await asyncio.sleep(0.1)
+            lock.release()
+            return await task
+
+        assert asyncio.run(run()) == "stored"
+        assert calls == []
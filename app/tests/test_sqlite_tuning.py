@@ -0,0 +1,65 @@
+import sys
+import os
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.session import create_sqlite_engine
+from config.settings import settings
+
+
+@pytest.fixture
+def engines(tmp_path):
+    path = str(tmp_path / "tuned.db")
+    writer = create_sqlite_engine(path, pool_size=2)
+    reader = create_sqlite_engine(path, read_only=True, pool_size=4)
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (name) VALUES ('first')"))
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+class TestSqliteTuning:
+
+    def test_pragmas_are_applied_to_every_connection(self, engines):
+        writer, reader = engines
+        for engine in (writer, reader):
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+                assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == settings.sqlite_cache_size
+
+    def test_read_engine_is_query_only(self, engines):
+        _, reader = engines
+        with reader.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO items (name) VALUES ('nope')"))
+
+    def test_readers_are_not_blocked_by_open_write_transaction(self, engines):
+        writer, reader = engines
+        results = []
+
+        with writer.connect() as conn:
+            conn.execute(text("BEGIN IMMEDIATE"))
+            conn.execute(text("INSERT INTO items (name) VALUES ('pending')"))
+
+            def read():
+                with reader.connect() as read_conn:
+                    results.append(read_conn.execute(text("SELECT COUNT(*) FROM items")).scalar())
+
+            threads = [threading.Thread(target=read) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=2)
+            conn.execute(text("COMMIT"))
+
+        assert results == [1, 1, 1, 1]
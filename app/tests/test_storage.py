@@ -0,0 +1,208 @@
+import sys
+import os
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from main import create_app
+from config.settings import settings
+from models.entities import EntityFetch, Playlist, Profile
+from services.pagination import InvalidCursor
+from storage import BACKENDS, JsonRepository, SqlRepository, create_repository, get_json_repository, register_backend
+from test_profile_ingest import _count_statements, _profile_payload
+
+
+def _playlist_payload(clip_count, playlist_id=None):
+    return {
+        "id": playlist_id or str(uuid.uuid4()),
+        "name": "Best of",
+        "playlist_clips": [{"clip": {"id": str(uuid.uuid4()), "title": f"clip {i}"}} for i in range(clip_count)],
+    }
+
+
+class TestSqlRepository:
+
+    def test_save_profiles_marks_them_fresh(self, sqlite_session):
+        repository = SqlRepository(sqlite_session)
+
+        assert repository.save("profile", [_profile_payload(3)]) == 1
+
+        profile = repository.get_profile("singer")
+        assert len(profile.clips) == 3
+        assert {playlist.handle for playlist in profile.playlists} == {"singer"}
+        assert sqlite_session.get(EntityFetch, ("profile", "singer")) is not None
+
+    def test_save_playlists_is_batched_and_keeps_owner(self, sqlite_engine, sqlite_session_factory):
+        data = _profile_payload(2)
+        owner_id = uuid.UUID(data["user_id"])
+        with SqlRepository(sqlite_session_factory(), owns_session=True) as repository:
+            repository.save_profiles([data])
+
+        def save(clip_count, playlist_id=None):
+            with SqlRepository(sqlite_session_factory(), owns_session=True) as repository:
+                repository.save_playlists([_playlist_payload(clip_count, playlist_id)])
+
+        assert _count_statements(sqlite_engine, lambda: save(5)) == _count_statements(sqlite_engine, lambda: save(200))
+
+        save(4, data["playlists"][0]["id"])
+        db = sqlite_session_factory()
+        playlist = db.get(Playlist, uuid.UUID(data["playlists"][0]["id"]))
+        assert playlist.profile_id == owner_id
+        assert len(playlist.clips) == 5
+        db.close()
+
+    def test_save_clips_skips_invalid_ids(self, sqlite_session):
+        repository = SqlRepository(sqlite_session)
+        clip_id = str(uuid.uuid4())
+
+        assert repository.save_clips([{"id": clip_id, "title": "one"}, {"id": "not-a-uuid"}]) == 1
+        assert repository.get_clip(clip_id).title == "one"
+        assert repository.get_clip("not-a-uuid") is None
+        clips, next_cursor = repository.list_clips(10)
+        assert [str(clip.id) for clip in clips] == [clip_id]
+        assert next_cursor is None
+
+
+class TestJsonRepository:
+
+    def test_roundtrip_builds_entities(self, tmp_path):
+        repository = JsonRepository(str(tmp_path))
+        data = _profile_payload(4)
+        repository.save("profile", [data])
+
+        assert repository.read("profile", "singer") == data
+        profile = repository.get_profile("singer")
+        assert isinstance(profile, Profile)
+        assert len(profile.clips) == 4
+        assert sorted(len(playlist.clips) for playlist in profile.playlists) == [2, 2]
+        assert repository.get_profile("missing") is None
+
+    def test_page_walks_keys_in_order(self, tmp_path):
+        repository = JsonRepository(str(tmp_path))
+        ids = sorted(str(uuid.uuid4()) for _ in range(7))
+        repository.save_clips([{"id": clip_id, "title": clip_id} for clip_id in reversed(ids)])
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = repository.page("clip", 3, cursor)
+            seen.extend(item["id"] for item in items)
+            if not cursor:
+                break
+
+        assert seen == ids
+        assert [clip.id for clip in repository.list_clips(2, offset=5, sort="id")[0]] == [uuid.UUID(i) for i in ids[5:]]
+        with pytest.raises(InvalidCursor):
+            repository.list_clips(2, sort="title")
+        with pytest.raises(InvalidCursor):
+            repository.page("clip", 3, "garbage")
+
+    def test_list_clips_sorts_like_the_sql_keysets(self, tmp_path):
+        repository = JsonRepository(str(tmp_path))
+        clips = [
+            {"id": str(uuid.uuid4()), "title": str(i), "created_at": None if i % 3 == 0 else f"2024-01-0{i % 4 + 1}T00:00:00Z"}
+            for i in range(8)
+        ]
+        repository.save_clips(clips)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = repository.list_clips(3, cursor)
+            seen.extend(str(clip.id) for clip in page)
+            if not cursor:
+                break
+
+        dated = sorted((c for c in clips if c["created_at"]), key=lambda c: (c["created_at"], c["id"]), reverse=True)
+        undated = sorted((c["id"] for c in clips if not c["created_at"]), reverse=True)
+        assert seen == [c["id"] for c in dated] + undated
+        with pytest.raises(InvalidCursor):
+            repository.list_clips(3, repository.list_clips(3)[1], sort="play_count")
+
+    def test_sort_order_follows_in_place_edits(self, tmp_path):
+        repository = JsonRepository(str(tmp_path))
+        clips = [{"id": str(uuid.uuid4()), "play_count": count} for count in (1, 2, 3)]
+        repository.save_clips(clips)
+        assert [clip["id"] for clip in repository.clip_page(3, sort="play_count")[0]] == [c["id"] for c in reversed(clips)]
+
+        folder = os.path.dirname(repository.path("clip", clips[0]["id"]))
+        folder_times = os.stat(folder)
+        path = repository.path("clip", clips[0]["id"])
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(clips[0], play_count=10), f)
+        os.utime(path, ns=(1, 1))
+        os.utime(folder, ns=(folder_times.st_atime_ns, folder_times.st_mtime_ns))
+
+        assert repository.clip_page(1, sort="play_count")[0][0]["id"] == clips[0]["id"]
+
+    def test_cache_follows_file_changes(self, tmp_path):
+        repository = JsonRepository(str(tmp_path), cache_size=1)
+        repository.save_playlists([_playlist_payload(1, "a")])
+
+        first = repository.read("playlist", "a")
+        assert repository.read("playlist", "a") is first
+
+        path = repository.path("playlist", "a")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"id": "a", "name": "changed"}, f)
+        os.utime(path, ns=(1, 1))
+        assert repository.read("playlist", "a")["name"] == "changed"
+
+        repository.save_playlists([_playlist_payload(0, "b")])
+        assert repository.keys("playlist") == ["a", "b"]
+
+    def test_keys_are_confined_to_the_root(self, tmp_path):
+        repository = JsonRepository(str(tmp_path / "store"))
+        (tmp_path / "secret.json").write_text("{}")
+
+        assert repository.read("profile", "../../secret") is None
+
+
+class TestBackends:
+
+    def test_registry(self):
+        class Fake(JsonRepository):
+            pass
+
+        register_backend("fake", lambda: Fake("unused"))
+        try:
+            assert isinstance(create_repository("fake"), Fake)
+            with pytest.raises(ValueError):
+                create_repository("missing")
+        finally:
+            BACKENDS.pop("fake")
+
+    def test_v2_lists_through_the_json_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "json_storage_dir", str(tmp_path))
+        get_json_repository.cache_clear()
+        try:
+            get_json_repository().save_profiles([_profile_payload(0, handle=f"user{i}") for i in range(3)])
+            client = TestClient(create_app())
+
+            first = client.get("/api/v2/profiles", params={"size": 2})
+            second = client.get("/api/v2/profiles", params={"size": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+            assert [p["handle"] for p in first.json()] == ["user0", "user1"]
+            assert [p["handle"] for p in second.json()["items"]] == ["user2"]
+            assert second.json()["next_cursor"] is None
+            assert client.get("/api/v2/profiles/user1").json()["handle"] == "user1"
+            assert client.get("/api/v2/profiles/nobody").status_code == 404
+        finally:
+            get_json_repository.cache_clear()
+
+    def test_v2_clips_take_a_sort_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "json_storage_dir", str(tmp_path))
+        get_json_repository.cache_clear()
+        try:
+            clips = [{"id": str(uuid.uuid4()), "play_count": count} for count in (5, 1, 3)]
+            get_json_repository().save_clips(clips)
+            client = TestClient(create_app())
+
+            response = client.get("/api/v2/clips", params={"sort": "play_count"})
+
+            assert [clip["play_count"] for clip in response.json()] == [5, 3, 1]
+            assert client.get("/api/v2/clips", params={"sort": "title"}).status_code == 422
+        finally:
+            get_json_repository.cache_clear()
@@ -0,0 +1,89 @@
+import sys
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from main import create_app
+from config.async_session import get_async_db_pg, get_async_db_pg_read
+from config.session import set_read_only
+from sqlalchemy.orm import sessionmaker
+from models.entities import Clip, Playlist
+
+
+class _Dialect:
+    def __init__(self, name):
+        self.name = name
+
+
+class _Connection:
+    def __init__(self, dialect):
+        self.dialect = _Dialect(dialect)
+        self.statements = []
+
+    def exec_driver_sql(self, sql):
+        self.statements.append(sql)
+
+
+@pytest.fixture
+def tracked_client(async_sqlite_session_factory):
+    app = create_app()
+    opened = []
+
+    async def override():
+        async with async_sqlite_session_factory() as db:
+            opened.append(db)
+            yield db
+
+    app.dependency_overrides[get_async_db_pg] = override
+    app.dependency_overrides[get_async_db_pg_read] = override
+    return TestClient(app), opened
+
+
+@pytest.fixture
+def file_session(sqlite_file_engine):
+    db = sessionmaker(bind=sqlite_file_engine)()
+    yield db
+    db.close()
+
+
+class TestReadOnlyTransactions:
+
+    def test_postgres_transactions_are_read_only(self):
+        connection = _Connection("postgresql")
+        set_read_only(None, None, connection)
+        assert connection.statements == ["SET TRANSACTION READ ONLY"]
+
+    def test_other_dialects_are_untouched(self):
+        connection = _Connection("sqlite")
+        set_read_only(None, None, connection)
+        assert connection.statements == []
+
+
+class TestRequestScopedSessions:
+
+    def test_clips_list_uses_injected_session(self, tracked_client, file_session):
+        client, opened = tracked_client
+        clip_id = uuid.uuid4()
+        file_session.add(Clip(id=clip_id, title="scoped"))
+        file_session.commit()
+
+        response = client.get("/api/v3/clips/")
+
+        assert response.status_code == 200
+        assert [clip["id"] for clip in response.json()] == [str(clip_id)]
+        assert len(opened) == 1
+
+    def test_playlists_list_is_serialised(self, tracked_client, file_session):
+        client, opened = tracked_client
+        file_session.add(Playlist(id=uuid.uuid4(), name="mix"))
+        file_session.commit()
+
+        response = client.get("/api/v3/playlists/")
+
+        assert response.status_code == 200
+        assert [playlist["name"] for playlist in response.json()] == ["mix"]
+        assert len(opened) == 1
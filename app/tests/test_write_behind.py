@@ -0,0 +1,228 @@
+import asyncio
+import json
+import sys
+import os
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.entities import Clip, EntityFetch, Profile
+from services.write_behind import WriteBehindQueue, read_journal
+from storage import BACKENDS, SqlRepository, register_backend
+from v1 import service_profile
+from v1.dao_sqlite_async import AsyncProfileDao
+from v1.service_profile import ProfileService
+from test_profile_ingest import _profile_payload
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_file_engine):
+    return sqlite_file_engine
+
+
+@pytest.fixture
+def backend(sqlite_session_factory):
+    register_backend("write-behind-test", lambda: SqlRepository(sqlite_session_factory(), owns_session=True))
+    yield "write-behind-test"
+    BACKENDS.pop("write-behind-test")
+
+
+def _clip(title, clip_id=None):
+    return {"id": clip_id or str(uuid.uuid4()), "title": title}
+
+
+class TestWriteBehindQueue:
+
+    def test_coalesces_and_flushes_in_batches(self, backend, sqlite_session):
+        queue = WriteBehindQueue(backend=backend, batch_size=2, flush_interval=60)
+        clip_id = str(uuid.uuid4())
+
+        queue.submit("clip", clip_id, _clip("first", clip_id))
+        queue.submit("clip", clip_id, _clip("second", clip_id))
+        for i in range(3):
+            queue.submit("clip", f"other-{i}", _clip(f"other {i}"))
+
+        assert queue.coalesced == 1
+        assert queue.pending("clip", clip_id)["title"] == "second"
+        assert sqlite_session.query(Clip).count() == 0
+
+        assert asyncio.run(queue.flush()) == 4
+
+        assert queue.size() == 0
+        assert queue.stats()["flushed"] == {"clip": 4}
+        assert sqlite_session.get(Clip, uuid.UUID(clip_id)).title == "second"
+        assert sqlite_session.query(EntityFetch).filter(EntityFetch.entity_type == "clip").count() == 4
+
+    def test_worker_flushes_when_batch_is_full(self, backend, sqlite_session):
+        queue = WriteBehindQueue(backend=backend, batch_size=3, flush_interval=60)
+
+        async def scenario():
+            queue.start()
+            for i in range(3):
+                queue.submit("clip", str(i), _clip(f"clip {i}"))
+            for _ in range(100):
+                if not queue.size():
+                    break
+                await asyncio.sleep(0.01)
+            await queue.stop()
+
+        asyncio.run(scenario())
+
+        assert sqlite_session.query(Clip).count() == 3
+
+    def test_failed_flush_keeps_entries(self):
+        def broken():
+            raise RuntimeError("database is locked")
+
+        register_backend("broken", broken)
+        try:
+            queue = WriteBehindQueue(backend="broken")
+            queue.submit("clip", "a", _clip("a"))
+
+            assert asyncio.run(queue.flush()) == 0
+            assert queue.failures == 1
+            assert queue.pending("clip", "a")["title"] == "a"
+        finally:
+            BACKENDS.pop("broken")
+
+    def test_poison_entries_are_isolated_and_dead_lettered(self, backend, sqlite_session, tmp_path):
+        class Picky(SqlRepository):
+            def save(self, kind, items):
+                if any(item["title"] == "poison" for item in items):
+                    raise ValueError("cannot store poison")
+                return super().save(kind, items)
+
+        register_backend("picky", lambda: Picky(sqlite_session.__class__(bind=sqlite_session.get_bind()), owns_session=True))
+        try:
+            journal = str(tmp_path / "journal")
+            queue = WriteBehindQueue(backend="picky", batch_size=8, journal_path=journal, max_attempts=2)
+
+            async def scenario():
+                queue.start()
+                for i in range(6):
+                    queue.submit("clip", str(i), _clip("poison" if i == 4 else f"clip {i}"))
+                saved = [await queue.flush() for _ in range(3)]
+                await queue.stop()
+                return saved
+
+            assert asyncio.run(scenario()) == [5, 0, 0]
+            assert sqlite_session.query(Clip).count() == 5
+            assert queue.size() == 0
+            assert queue.stats()["dead_lettered"] == 1
+            with open(f"{journal}.dead", encoding="utf-8") as f:
+                assert "cannot store poison" in f.read()
+        finally:
+            BACKENDS.pop("picky")
+
+    def test_backend_outage_dead_letters_nothing(self):
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise RuntimeError("database is locked")
+
+        register_backend("broken", broken)
+        try:
+            queue = WriteBehindQueue(backend="broken", max_attempts=2)
+            for i in range(8):
+                queue.submit("clip", str(i), _clip(str(i)))
+
+            for _ in range(2):
+                assert asyncio.run(queue.flush()) == 0
+            bisecting = len(calls)
+            for _ in range(2):
+                assert asyncio.run(queue.flush()) == 0
+
+            assert bisecting < 2 * 8
+            assert len(calls) - bisecting == 2
+            assert queue.size() == 8
+            assert queue.dead_lettered == 0
+        finally:
+            BACKENDS.pop("broken")
+
+    def test_journal_is_replayed_after_a_crash(self, backend, sqlite_session, tmp_path):
+        journal = str(tmp_path / "write-behind" / "journal")
+        crashed = WriteBehindQueue(backend=backend, flush_interval=60, journal_path=journal)
+
+        async def crash():
+            crashed.start()
+            crashed.submit("profile", "singer", _profile_payload(2))
+            crashed._task.cancel()
+
+        asyncio.run(crash())
+        crashed._journal.close()
+        crashed._journal_lock.release()
+        assert list(read_journal(f"{journal}.0")) == [("profile", "singer")]
+
+        recovered = WriteBehindQueue(backend=backend, flush_interval=60, journal_path=journal)
+
+        async def restart():
+            recovered.start()
+            assert recovered.pending("profile", "singer") is not None
+            await recovered.stop()
+
+        asyncio.run(restart())
+
+        assert sqlite_session.query(Profile).one().handle == "singer"
+        assert read_journal(f"{journal}.0") == {}
+
+    def test_orphaned_journals_are_replayed(self, backend, sqlite_session, tmp_path):
+        journal = str(tmp_path / "journal")
+        clip_id = str(uuid.uuid4())
+        with open(f"{journal}.5", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"kind": "clip", "key": clip_id, "data": _clip("orphan", clip_id)}) + "\n")
+        queue = WriteBehindQueue(backend=backend, flush_interval=60, journal_path=journal)
+
+        async def restart():
+            queue.start()
+            assert queue.pending("clip", clip_id)["title"] == "orphan"
+            assert list(read_journal(f"{journal}.0")) == [("clip", clip_id)]
+            await queue.stop()
+
+        asyncio.run(restart())
+
+        assert not os.path.exists(f"{journal}.5")
+        assert sqlite_session.get(Clip, uuid.UUID(clip_id)).title == "orphan"
+
+    def test_concurrent_workers_use_separate_journals(self, tmp_path):
+        journal = str(tmp_path / "journal")
+        first = WriteBehindQueue(journal_path=journal)
+        second = WriteBehindQueue(journal_path=journal)
+
+        async def scenario():
+            first.start()
+            second.start()
+            paths = first._journal.name, second._journal.name
+            await first.stop()
+            await second.stop()
+            return paths
+
+        assert asyncio.run(scenario()) == (f"{journal}.0", f"{journal}.1")
+
+
+class TestWriteBehindReads:
+
+    def test_request_is_answered_before_the_flush(self, backend, sqlite_session, async_sqlite_session_factory, monkeypatch):
+        queue = WriteBehindQueue(backend=backend, flush_interval=60)
+        monkeypatch.setattr(service_profile, "write_behind", queue)
+        monkeypatch.setattr(service_profile, "fetch_profile_from_suno", lambda handle: asyncio.sleep(0, _profile_payload(3, handle=handle)))
+
+        async def scenario():
+            queue.start()
+            try:
+                async with async_sqlite_session_factory() as db:
+                    profile = await ProfileService(AsyncProfileDao(db)).get_profile_by_handle("singer")
+                stored_before_flush = sqlite_session.query(Profile).count()
+            finally:
+                await queue.stop()
+            return profile, stored_before_flush
+
+        profile, stored_before_flush = asyncio.run(scenario())
+
+        assert profile.handle == "singer"
+        assert len(profile.clips) == 3
+        assert stored_before_flush == 0
+        assert sqlite_session.query(Profile).one().handle == "singer"
+        assert sqlite_session.query(Clip).count() == 3
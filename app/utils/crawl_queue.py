@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class QueueItem:
+    kind: str
+    key: str
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    next_attempt_at: float
+
+
+class CrawlQueue:
+    def __init__(self, path: str, max_attempts: int = 5, backoff_seconds: float = 30.0,
+                 max_backoff_seconds: float = 3600.0):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_queue ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, "
+                "next_attempt_at REAL NOT NULL DEFAULT 0, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (kind, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_crawl_queue_ready ON crawl_queue (status, next_attempt_at)")
+            self._local.conn = conn
+        return conn
+
+    def add(self, kind: str, keys: Iterable[str]) -> List[str]:
+        conn = self._conn()
+        now = time.time()
+        added = []
+        for key in keys:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO crawl_queue (kind, key, status, updated_at) VALUES (?, ?, ?, ?)",
+                (kind, key, PENDING, now),
+            )
+            if cursor.rowcount:
+                added.append(key)
+        conn.commit()
+        return added
+
+    def get(self, kind: str, key: str) -> Optional[QueueItem]:
+        row = self._conn().execute(
+            "SELECT kind, key, status, attempts, last_error, next_attempt_at FROM crawl_queue "
+            "WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return QueueItem(*row) if row else None
+
+    def is_ready(self, item: QueueItem) -> bool:
+        if item.status == DONE:
+            return False
+        if item.status == FAILED:
+            return item.attempts < self.max_attempts and item.next_attempt_at <= time.time()
+        return True
+
+    def recover(self) -> int:
+        conn = self._conn()
+        cursor = conn.execute(
+            "UPDATE crawl_queue SET status = ?, updated_at = ? WHERE status = ?", (PENDING, time.time(), IN_FLIGHT)
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    def ready(self, limit: Optional[int] = None) -> List[QueueItem]:
+        query = (
+            "SELECT kind, key, status, attempts, last_error, next_attempt_at FROM crawl_queue "
+            "WHERE (status = ? OR (status = ? AND attempts < ?)) AND next_attempt_at <= ? "
+            "ORDER BY next_attempt_at, kind, key"
+        )
+        params = [PENDING, FAILED, self.max_attempts, time.time()]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [QueueItem(*row) for row in self._conn().execute(query, params).fetchall()]
+
+    def start(self, kind: str, key: str):
+        conn = self._conn()
+        conn.execute(
+            "UPDATE crawl_queue SET status = ?, updated_at = ? WHERE kind = ? AND key = ?",
+            (IN_FLIGHT, time.time(), kind, key),
+        )
+        conn.commit()
+
+    def mark_done(self, kind: str, keys: Iterable[str]):
+        conn = self._conn()
+        now = time.time()
+        conn.executemany(
+            "UPDATE crawl_queue SET status = ?, last_error = NULL, updated_at = ? WHERE kind = ? AND key = ?",
+            [(DONE, now, kind, key) for key in keys],
+        )
+        conn.commit()
+
+    def mark_failed(self, kind: str, keys: Iterable[str], error: str, permanent: bool = False):
+        conn = self._conn()
+        now = time.time()
+        for key in keys:
+            item = self.get(kind, key)
+            attempts = self.max_attempts if permanent else (item.attempts if item else 0) + 1
+            conn.execute(
+                "UPDATE crawl_queue SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+                "WHERE kind = ? AND key = ?",
+                (FAILED, attempts, error, now + self.backoff(attempts), now, kind, key),
+            )
+        conn.commit()
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.max_backoff_seconds, self.backoff_seconds * 2 ** max(attempts - 1, 0))
+
+    def counts(self) -> Counter:
+        rows = self._conn().execute("SELECT kind, status, COUNT(*) FROM crawl_queue GROUP BY kind, status").fetchall()
+        return Counter({(kind, status): count for kind, status, count in rows})
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,326 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from config.settings import settings
+from config.logging_config import get_logger
+from services.api import PROFILE_PARAMS, save_to_file_json
+from services.circuit_breaker import get_breaker
+from services.http_client import close_client, get_json_response
+from services.metrics import classify_error
+from storage import BACKENDS, create_repository
+from utils.crawl_queue import CrawlQueue
+
+logger = get_logger(__name__)
+
+ENTITIES = {
+    "profile": ("profiles", "/profiles/", PROFILE_PARAMS),
+    "playlist": ("playlists", "/playlist/", None),
+    "clip": ("clips", "/clip/", None),
+}
+
+
+@dataclass
+class CrawlStats:
+    started_at: float = field(default_factory=time.monotonic)
+    fetched: Counter = field(default_factory=Counter)
+    not_modified: Counter = field(default_factory=Counter)
+    failed: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    saved: Counter = field(default_factory=Counter)
+    store_errors: Counter = field(default_factory=Counter)
+    retried: Counter = field(default_factory=Counter)
+
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started_at, 1e-9)
+
+    def requests(self) -> int:
+        return sum(self.fetched.values()) + sum(self.failed.values())
+
+    def summary(self) -> str:
+        lines = [
+            f"Elapsed: {self.elapsed():.1f}s, requests: {self.requests()}, "
+            f"throughput: {self.requests() / self.elapsed():.1f} req/s"
+        ]
+        for kind in ENTITIES:
+            lines.append(
+                f"{kind}: fetched={self.fetched[kind]} (not modified={self.not_modified[kind]}), "
+                f"failed={self.failed[kind]} (retried={self.retried[kind]}), saved={self.saved[kind]}, "
+                f"store errors={self.store_errors[kind]}"
+            )
+        if self.errors:
+            lines.append("Errors: " + ", ".join(f"{name}={count}" for name, count in self.errors.most_common()))
+        return "\n".join(lines)
+
+
+def is_permanent(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return 400 <= status < 500 and status != 429
+    return False
+
+
+def read_ids(path: Optional[str]) -> List[str]:
+    if not path:
+        return []
+    with open(path, "r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+class RepositoryStore:
+    def __init__(self, factory):
+        self.factory = factory
+
+    def save(self, kind: str, items: List[dict]) -> int:
+        with self.factory() as repository:
+            return repository.save(kind, items)
+
+
+class Crawler:
+    def __init__(self, store, concurrency: int = 20, batch_size: int = 50, expand: bool = True,
+                 fetch_clips: bool = False, snapshots: bool = True, queue: Optional[CrawlQueue] = None,
+                 retries: int = 2, retry_backoff: float = 1.0):
+        self.store = store
+        self.queue = queue
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.expand = expand
+        self.fetch_clips = fetch_clips
+        self.snapshots = snapshots
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.stats = CrawlStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._seen = set()
+        self._attempts: Counter = Counter()
+        self._retrying: set = set()
+        self._pending: Dict[str, List[Tuple[str, dict]]] = {kind: [] for kind in ENTITIES}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._queue_io: Optional[ThreadPoolExecutor] = None
+
+    async def queued(self, method, *args, **kwargs):
+        """Runs a CrawlQueue call on the crawler's single queue thread, keeping sqlite off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._queue_io, partial(method, *args, **kwargs))
+
+    def admit(self, kind: str, key: str) -> bool:
+        self.queue.add(kind, [key])
+        return self.queue.is_ready(self.queue.get(kind, key))
+
+    async def enqueue(self, kind: str, key: str):
+        if not key or (kind, key) in self._seen:
+            return
+        self._seen.add((kind, key))
+        if self.queue is not None and not await self.queued(self.admit, kind, key):
+            return
+        self._queue.put_nowait((kind, key))
+
+    async def enqueue_all(self, kind: str, keys: Iterable[str]):
+        for key in keys:
+            await self.enqueue(kind, key)
+
+    def retry(self, kind: str, keys: Iterable[str]):
+        """Puts transiently failed keys back on this run's queue after a doubling backoff, up to `retries` times."""
+        for key in keys:
+            self._attempts[(kind, key)] += 1
+            attempt = self._attempts[(kind, key)]
+            if attempt > self.retries:
+                continue
+            self.stats.retried[kind] += 1
+            task = asyncio.create_task(self._requeue(kind, key, self.retry_backoff * 2 ** (attempt - 1)))
+            self._retrying.add(task)
+            task.add_done_callback(self._retrying.discard)
+
+    async def _requeue(self, kind: str, key: str, delay: float):
+        await asyncio.sleep(delay)
+        self._queue.put_nowait((kind, key))
+
+    async def fetch(self, kind: str, key: str) -> Optional[dict]:
+        folder, path, params = ENTITIES[kind]
+        try:
+            response = await get_breaker(folder).call(lambda: get_json_response(path + key, params=params))
+        except Exception as e:
+            self.stats.failed[kind] += 1
+            self.stats.errors[classify_error(e)] += 1
+            logger.warning(f"Failed to fetch {kind} {key}: {classify_error(e)}")
+            if self.queue is not None:
+                await self.queued(self.queue.mark_failed, kind, [key], f"{classify_error(e)}: {e}", permanent=is_permanent(e))
+            if not is_permanent(e):
+                self.retry(kind, [key])
+            return None
+        self.stats.fetched[kind] += 1
+        if response.not_modified:
+            self.stats.not_modified[kind] += 1
+        elif self.snapshots:
+            await asyncio.to_thread(save_to_file_json, folder, key, response.data)
+        return response.data
+
+    async def fail(self, kind: str, key: str, error: Exception):
+        self.stats.failed[kind] += 1
+        self.stats.errors[classify_error(error)] += 1
+        logger.exception(f"Failed to crawl {kind} {key}: {error}")
+        if self.queue is None:
+            return
+        try:
+            await self.queued(self.queue.mark_failed, kind, [key], f"{classify_error(error)}: {error}")
+        except Exception as e:
+            logger.error(f"Failed to record crawl failure for {kind} {key}: {e}")
+
+    async def expand_entity(self, kind: str, data: dict):
+        if kind == "profile":
+            await self.enqueue_all("playlist", [p.get("id") for p in data.get("playlists", []) if isinstance(p, dict)])
+            if self.fetch_clips:
+                await self.enqueue_all("clip", [c.get("id") for c in data.get("clips", []) if isinstance(c, dict)])
+        elif kind == "playlist" and self.fetch_clips:
+            for entry in data.get("playlist_clips", []) or data.get("clips", []):
+                clip = entry.get("clip", entry) if isinstance(entry, dict) else {}
+                await self.enqueue("clip", clip.get("id"))
+
+    async def flush(self, kind: str, force: bool = False):
+        async with self._flush_lock:
+            if not self._pending[kind] or (not force and len(self._pending[kind]) < self.batch_size):
+                return
+            batch, self._pending[kind] = self._pending[kind], []
+            keys = [key for key, _ in batch]
+            try:
+                self.stats.saved[kind] += await asyncio.to_thread(self.store.save, kind, [data for _, data in batch])
+            except Exception as e:
+                self.stats.store_errors[kind] += len(batch)
+                logger.error(f"Failed to store {len(batch)} {kind} entities: {e}")
+                if self.queue is not None:
+                    await self.queued(self.queue.mark_failed, kind, keys, f"store: {e}")
+                self.retry(kind, keys)
+                return
+            if self.queue is not None:
+                await self.queued(self.queue.mark_done, kind, keys)
+
+    async def worker(self):
+        while True:
+            kind, key = await self._queue.get()
+            try:
+                if self.queue is not None:
+                    await self.queued(self.queue.start, kind, key)
+                data = await self.fetch(kind, key)
+                if data:
+                    if self.expand:
+                        await self.expand_entity(kind, data)
+                    self._pending[kind].append((key, data))
+                    await self.flush(kind)
+                elif data is not None and self.queue is not None:
+                    await self.queued(self.queue.mark_done, kind, [key])
+            except Exception as e:
+                await self.fail(kind, key, e)
+            finally:
+                self._queue.task_done()
+
+    async def run(self, handles: Iterable[str] = (), playlist_ids: Iterable[str] = (), clip_ids: Iterable[str] = ()) -> CrawlStats:
+        self._queue = asyncio.Queue()
+        self._flush_lock = asyncio.Lock()
+        self._queue_io = ThreadPoolExecutor(1, thread_name_prefix="crawl-queue")
+        self._attempts.clear()
+        self.stats = CrawlStats()
+        try:
+            if self.queue is not None:
+                recovered = await self.queued(self.queue.recover)
+                if recovered:
+                    logger.info(f"Recovered {recovered} interrupted crawl items")
+            await self.enqueue_all("profile", handles)
+            await self.enqueue_all("playlist", playlist_ids)
+            await self.enqueue_all("clip", clip_ids)
+            if self.queue is not None:
+                for item in await self.queued(self.queue.ready):
+                    await self.enqueue(item.kind, item.key)
+
+            workers = [asyncio.create_task(self.worker()) for _ in range(self.concurrency)]
+            try:
+                while True:
+                    await self.drain()
+                    for kind in ENTITIES:
+                        await self.flush(kind, force=True)
+                    # A failed final flush schedules retries of its own; go round again for them.
+                    if not self._retrying:
+                        break
+            finally:
+                for task in workers + list(self._retrying):
+                    task.cancel()
+                await asyncio.gather(*workers, *self._retrying, return_exceptions=True)
+            return self.stats
+        finally:
+            if self.queue is not None:
+                await self.queued(self.queue.close)
+            self._queue_io.shutdown(wait=True)
+
+    async def drain(self):
+        """Waits for the queue to empty, including the items that scheduled retries put back."""
+        while True:
+            await self._queue.join()
+            if not self._retrying:
+                return
+            await asyncio.wait(list(self._retrying))
+
+
+async def crawl(args) -> CrawlStats:
+    queue = CrawlQueue(args.queue, max_attempts=args.max_attempts, backoff_seconds=args.backoff) if args.queue else None
+    crawler = Crawler(
+        RepositoryStore(lambda: create_repository(args.backend)),
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        expand=not args.no_expand,
+        fetch_clips=args.fetch_clips,
+        snapshots=not args.no_snapshots,
+        queue=queue,
+        retries=args.retries,
+        retry_backoff=args.retry_backoff,
+    )
+    try:
+        return await crawler.run(read_ids(args.handles), read_ids(args.playlists), read_ids(args.clips))
+    finally:
+        await close_client()
+        if queue is not None:
+            queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl Suno profiles, playlists and clips into a storage backend')
+    parser.add_argument('--handles', help='File with one profile handle per line')
+    parser.add_argument('--playlists', help='File with one playlist ID per line')
+    parser.add_argument('--clips', help='File with one clip ID per line')
+    parser.add_argument('--concurrency', type=int, default=20, help='Number of concurrent upstream fetches')
+    parser.add_argument('--batch-size', type=int, default=50, help='Entities written per store transaction')
+    parser.add_argument('--no-expand', action='store_true', help='Do not follow profiles into their playlists')
+    parser.add_argument('--fetch-clips', action='store_true', help='Also fetch every clip referenced by profiles and playlists')
+    parser.add_argument('--no-snapshots', action='store_true', help='Do not write json/ snapshots')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=settings.storage_backend, help='Storage backend the crawl writes into')
+    parser.add_argument('--queue', help='SQLite file with the persistent crawl queue; resumes unfinished work on restart')
+    parser.add_argument('--max-attempts', type=int, default=5, help='Attempts before a failed item is given up')
+    parser.add_argument('--backoff', type=float, default=30.0, help='Base retry backoff in seconds, doubled per attempt')
+    parser.add_argument('--retries', type=int, default=2, help='Retries of a transiently failed item within the same run')
+    parser.add_argument('--retry-backoff', type=float, default=1.0, help='Base in-run retry delay in seconds, doubled per retry')
+    parser.add_argument('--status', action='store_true', help='Print crawl queue counts and exit')
+
+    args = parser.parse_args()
+    if args.status:
+        if not args.queue:
+            parser.error("--status requires --queue")
+        for (kind, status), count in sorted(CrawlQueue(args.queue).counts().items()):
+            print(f"{kind} {status}: {count}")
+        return
+    if not (args.handles or args.playlists or args.clips or args.queue):
+        parser.error("at least one of --handles, --playlists, --clips or --queue is required")
+
+    stats = asyncio.run(crawl(args))
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ from v1.router_playlists import router as playlists_router
 from v1.router_users import router as users_router
 from v1.router_profiles import router as profiles_router
 from v1.router_clips import router as clips_router
+from v1.router_metrics import router as metrics_router
+import v1.refresh_jobs  # noqa: F401
 
 router = APIRouter()
 
@@ -10,6 +12,7 @@ router.include_router(playlists_router, prefix="/playlists", tags=["playlist"])
 router.include_router(users_router, prefix="/users", tags=["users"])
 router.include_router(profiles_router, prefix="/profiles", tags=["profiles"])
 router.include_router(clips_router, prefix="/clips", tags=["clip"])
+router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
 from .router_clips import router as clips_router
 from .router_playlists import router as playlists_router
@@ -1,12 +1,13 @@
-from typing import List
-from fastapi import Depends, HTTPException
-from config.session import get_db_sqlite
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from services.dto_cache import dto_cache
+from services.loading import JOINED
 from services.mappers import to_playlist
-from models.entities import Profile, Clip, Playlist
-from sqlalchemy.orm import joinedload
+from models.entities import Profile, EntityFetch
+from sqlalchemy import and_, or_
 from config.logging_config import get_logger
-from uuid import UUID
-import uuid
+from storage.sql import SqlRepository, invalidate_dependents, profile_children, profile_dependents, retire, utcnow
 
 logger = get_logger(__name__)
 
@@ -15,153 +16,46 @@ class PlaylistDao:
     def __init__(self, db_session=None):
         self.db = db_session
 
-    def get_all(self, skip, limit):
+    def repository(self) -> SqlRepository:
         if self.db is None:
             raise HTTPException(status_code=500, detail="Database session not available")
+        return SqlRepository(self.db)
 
-        playlists = self.db.query(Playlist).options(joinedload(Playlist.profile), joinedload(Playlist.clips)).offset(skip).limit(limit).all()
-        playlist_dtos = []
-        for playlist in playlists:
-            playlist_dtos.append(to_playlist(playlist))
-        return playlist_dtos
+    def get_all(self, skip, limit):
+        return self.get_page(limit, skip=skip)[0]
 
-    def get_by_id(self, playlist_id):
-        if self.db is None:
-            raise HTTPException(status_code=500, detail="Database session not available")
+    def get_page(self, limit: int, cursor: Optional[str] = None, skip: int = 0):
+        playlists, next_cursor = self.repository().list_playlists(limit, cursor, skip)
+        return [to_playlist(playlist) for playlist in playlists], next_cursor
 
+    def get_by_id(self, playlist_id, strategy: Optional[str] = JOINED):
         if not playlist_id or isinstance(playlist_id, dict):
             logger.warning(f"Invalid playlist_id: {playlist_id}")
             return None
-
-        if isinstance(playlist_id, str):
-            try:
-                uuid_obj = UUID(playlist_id)
-            except ValueError as e:
-                logger.warning(f"Invalid UUID string '{playlist_id}': {e}")
-                return None
-            playlist_id = uuid_obj
-
-        return self.db.query(Playlist).options(joinedload(Playlist.profile), joinedload(Playlist.clips)).filter(Playlist.id == playlist_id).first()
+        return self.repository().get_playlist(playlist_id, strategy)
 
     def save_playlist_clips(self, playlist_clips: list):
-        if self.db is None:
-            raise HTTPException(status_code=500, detail="Database session not available")
-
-        for playlist_data in playlist_clips:
-            if not isinstance(playlist_data, dict):
-                continue
-
-            if "id" in playlist_data:
-                playlist_id = playlist_data["id"]
-                if isinstance(playlist_id, str):
-                    try:
-                        playlist_id = UUID(playlist_id)
-                    except ValueError as e:
-                        logger.warning(f"Invalid UUID string '{playlist_id}': {e}")
-                        continue
-                elif hasattr(playlist_id, 'hex'):
-                    logger.info(f"playlist_id is already a UUID object: {playlist_id}")
-                else:
-                    logger.warning(f"Unexpected playlist_id type: {type(playlist_id)}, value: {playlist_id}")
-                    continue
-
-                playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
-                if not playlist:
-                    playlist = create_playlist(playlist_data)
-                    self.db.add(playlist)
-                    self.db.commit()
-                    self.db.refresh(playlist)
-            else:
-                continue
-
-            self.set_playlist(playlist, playlist_data)
-
-            playlist_clips_data = playlist_data.get("playlist_clips", [])
-            if not playlist_clips_data:
-                playlist_clips_data = playlist_data.get("clips", [])
-
-            for playlist_clip_entry in playlist_clips_data:
-
-                if not isinstance(playlist_clip_entry, dict):
-                    continue
-
-                if "clip" in playlist_clip_entry:
-                    clip_data = playlist_clip_entry["clip"]
-                else:
-                    clip_data = playlist_clip_entry
-
-                if "id" in clip_data:
-                    clip_id = clip_data["id"]
-                    if not clip_id or isinstance(clip_id, dict):
-                        logger.warning(f"Invalid clip_id: {clip_id}")
-                        continue
-
-                    if isinstance(clip_id, str):
-                        try:
-                            clip_id = UUID(clip_id)
-                        except ValueError as e:
-                            logger.warning(f"Invalid clip UUID string '{clip_id}': {e}")
-                            continue
-                    elif hasattr(clip_id, 'hex'):
-                        logger.info(f"clip_id is already a UUID object: {clip_id}")
-                    else:
-                        logger.warning(f"Unexpected clip_id type: {type(clip_id)}, value: {clip_id}")
-                        continue
-
-                    clip = self.db.query(Clip).filter(Clip.id == clip_id).first()
-                    if not clip:
-                        clip = create_clip(clip_data)
-                        self.db.add(clip)
-                        self.db.commit()
-                        self.db.refresh(clip)
-
-                    if playlist and clip not in playlist.clips:
-                        playlist.clips.append(clip)
-
+        self.repository().upsert_playlists(playlist_clips)
         self.db.commit()
 
 
-    def set_playlist(self, playlist, playlist_data):
-        if playlist:
-            original_profile_id = playlist.profile_id
-            playlist.name = playlist_data.get("name", playlist.name)
-            playlist.description = playlist_data.get("description", playlist.description)
-            playlist.image_url = playlist_data.get("image_url", playlist.image_url)
-            playlist.upvote_count = playlist_data.get("upvote_count", playlist.upvote_count)
-            playlist.play_count = playlist_data.get("play_count", playlist.play_count)
-            playlist.song_count = playlist_data.get("song_count", playlist.song_count)
-            playlist.is_public = playlist_data.get("is_public", playlist.is_public)
-            playlist.entity_type = playlist_data.get("entity_type", playlist.entity_type)
-            playlist.num_total_results = playlist_data.get("num_total_results", playlist.num_total_results)
-            playlist.current_page = playlist_data.get("current_page", playlist.current_page)
-            playlist.is_owned = playlist_data.get("is_owned", playlist.is_owned)
-            playlist.is_trashed = playlist_data.get("is_trashed", playlist.is_trashed)
-            playlist.is_hidden = playlist_data.get("is_hidden", playlist.is_hidden)
-            playlist.user_display_name = playlist_data.get("user_display_name", playlist.user_display_name)
-            playlist.user_handle = playlist_data.get("user_handle", playlist.user_handle)
-            playlist.user_avatar_image_url = playlist_data.get("user_avatar_image_url",
-                                                               playlist.user_avatar_image_url)
-            playlist.dislike_count = playlist_data.get("dislike_count", playlist.dislike_count)
-            playlist.flag_count = playlist_data.get("flag_count", playlist.flag_count)
-            playlist.skip_count = playlist_data.get("skip_count", playlist.skip_count)
-            playlist.is_discover_playlist = playlist_data.get("is_discover_playlist", playlist.is_discover_playlist)
-            playlist.next_cursor = playlist_data.get("next_cursor", playlist.next_cursor)
-
-            playlist.profile_id = original_profile_id
-
 class ProfileDao:
     def __init__(self, db):
         self.db = db
 
-    def get_profile_by_handle(self, handle):
+    def repository(self) -> SqlRepository:
         if self.db is None:
             raise HTTPException(status_code=500, detail="Database session not available")
-        return self.db.query(Profile).options(joinedload(Profile.clips), joinedload(Profile.playlists)).filter(Profile.handle == handle).first()
+        return SqlRepository(self.db)
+
+    def get_profile_by_handle(self, handle, strategy: Optional[str] = None):
+        return self.repository().get_profile(handle, strategy)
 
     def get_all(self, skip: int = 0, limit: int = 200) -> List[Profile]:
-        if self.db is None:
-            raise HTTPException(status_code=500, detail="Database session not available")
-        return self.db.query(Profile).options(joinedload(Profile.clips), joinedload(Profile.playlists)).offset(skip).limit(limit).all()
+        return self.get_page(limit, skip=skip)[0]
+
+    def get_page(self, limit: int, cursor: Optional[str] = None, skip: int = 0):
+        return self.repository().list_profiles(limit, cursor, skip)
 
     def delete(self, profile_id: str) -> None:
         if self.db is None:
@@ -169,273 +63,54 @@ class ProfileDao:
         profile = self.db.query(Profile).filter(Profile.id == profile_id).first()
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
+        found = profile_dependents(self.db, profile.id)
+        retire(self.db, {"profile": [profile.handle], **profile_children(self.db, profile.id)}, found)
         self.db.delete(profile)
         self.db.commit()
+        dto_cache.invalidate("profile", [profile.handle])
+        invalidate_dependents(found)
 
     def save_profile(self, data: dict):
-        if self.db is None:
-            raise HTTPException(status_code=500, detail="Database session not available")
-        profile = self.db.query(Profile).filter(Profile.handle == data["handle"]).first()
-        if not profile:
-            profile = create_profile(data)
-            self.db.add(profile)
-            self.db.commit()
-            self.db.refresh(profile)
-
-        for c in data.get("clips", []):
-            if not c.get("id"):
-                continue
-            clip_id = uuid.UUID(c["id"]) if isinstance(c["id"], str) else c["id"]
-            clip = self.db.query(Clip).filter(Clip.id == clip_id).first()
-            if not clip:
-                clip = create_clip_profile(c=c, profile=profile)
-                self.db.add(clip)
-            else:
-                if clip.profile_id is None:
-                    clip.profile_id = profile.id
-                    self.db.flush()
-
-        for p in data.get("playlists", []):
-            if not p.get("id"):
-                continue
-            playlist_id = UUID(p["id"]) if isinstance(p["id"], str) else p["id"]
-            playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
-            if not playlist:
-                playlist_id = UUID(p["id"]) if isinstance(p["id"], str) else p["id"]
-
-                playlist = Playlist(
-                    id=playlist_id,
-                    profile_id=profile.id,
-                    name=p.get("name"),
-                    description=p.get("description"),
-                    image_url=p.get("image_url"),
-                    upvote_count=p.get("upvote_count", 0),
-                    play_count=p.get("play_count", 0),
-                    song_count=p.get("song_count", 0),
-                    is_public=p.get("is_public", True),
-                    entity_type=p.get("entity_type"),
-                    num_total_results=p.get("num_total_results"),
-                    current_page=p.get("current_page"),
-                    is_owned=p.get("is_owned"),
-                    is_trashed=p.get("is_trashed"),
-                    is_hidden=p.get("is_hidden"),
-                    user_display_name=p.get("user_display_name"),
-                    user_handle=p.get("user_handle"),
-                    user_avatar_image_url=p.get("user_avatar_image_url"),
-                    dislike_count=p.get("dislike_count"),
-                    flag_count=p.get("flag_count"),
-                    skip_count=p.get("skip_count"),
-                    is_discover_playlist=p.get("is_discover_playlist"),
-                    next_cursor=p.get("next_cursor")
-                )
-                self.db.add(playlist)
-                self.db.flush() # Use flush instead of commit for better performance
-            else:
-                if playlist.profile_id is None:
-                    playlist.profile_id = profile.id
-                    self.db.flush()
-
-            playlist_clips_data = p.get("playlist_clips", [])
-            if playlist_clips_data:
-                for playlist_clip_entry in playlist_clips_data:
-                    if "clip" in playlist_clip_entry:
-                        clip_data = playlist_clip_entry["clip"]
-                    else:
-                        clip_data = playlist_clip_entry
-
-                    if "id" in clip_data and clip_data["id"]:
-                        clip_id = UUID(clip_data["id"]) if isinstance(clip_data["id"], str) else clip_data["id"]
-                        clip = self.db.query(Clip).filter(Clip.id == clip_id).first()
-                        if not clip:
-                            clip = create_clip_profile(c=clip_data, profile=profile)
-                            self.db.add(clip)
-                            self.db.flush()
-
-                        if clip not in playlist.clips:
-                            playlist.clips.append(clip)
-                            self.db.flush()
-
+        repository = self.repository()
+        repository.upsert_profile(data)
         self.db.commit()
-        self.db.refresh(profile)
-        profile_with_relationships = self.db.query(Profile).options(joinedload(Profile.clips), joinedload(Profile.playlists)).filter(Profile.handle == data["handle"]).first()
 
+        profile_with_relationships = repository.get_profile(data["handle"])
         if profile_with_relationships:
             return profile_with_relationships
         raise HTTPException(status_code=404, detail=f"Profile not saved: {data}")
 
-def create_profile(data) -> Profile:
-        id_value = data.get("id", data.get("user_id", data["handle"]))
-        if isinstance(id_value, str):
-            id_value = uuid.UUID(id_value)
-        return Profile(
-            id=id_value,
-            handle=data["handle"],
-            display_name=data["display_name"],
-            profile_description=data.get("profile_description"),
-            avatar_image_url=data.get("avatar_image_url")
-        )
-
-def create_playlist(playlist_data):
-        playlist_id = uuid.UUID(playlist_data["id"]) if isinstance(playlist_data["id"], str) else playlist_data["id"]
-        return Playlist(
-            id=playlist_id,
-            name=playlist_data.get("name"),
-            description=playlist_data.get("description"),
-            image_url=playlist_data.get("image_url"),
-            upvote_count=playlist_data.get("upvote_count", 0),
-            play_count=playlist_data.get("play_count", 0),
-            song_count=playlist_data.get("song_count", 0),
-            is_public=playlist_data.get("is_public", True),
-            entity_type=playlist_data.get("entity_type"),
-            num_total_results=playlist_data.get("num_total_results"),
-            current_page=playlist_data.get("current_page"),
-            is_owned=playlist_data.get("is_owned"),
-            is_trashed=playlist_data.get("is_trashed"),
-            is_hidden=playlist_data.get("is_hidden"),
-            user_display_name=playlist_data.get("user_display_name"),
-            user_handle=playlist_data.get("user_handle"),
-            user_avatar_image_url=playlist_data.get("user_avatar_image_url"),
-            dislike_count=playlist_data.get("dislike_count"),
-            flag_count=playlist_data.get("flag_count"),
-            skip_count=playlist_data.get("skip_count"),
-            is_discover_playlist=playlist_data.get("is_discover_playlist"),
-            next_cursor=playlist_data.get("next_cursor")
-        )
-
-
-def create_playlist_profile(p, profile):
-        playlist_id = UUID(p["id"]) if isinstance(p["id"], str) else p["id"]
-        return Playlist(
-            id=playlist_id,
-            profile_id=profile.id,
-            name=p.get("name"),
-            description=p.get("description"),
-            image_url=p.get("image_url"),
-            upvote_count=p.get("upvote_count", 0),
-            play_count=p.get("play_count", 0),
-            song_count=p.get("song_count", 0),
-            is_public=p.get("is_public", True),
-            entity_type=p.get("entity_type"),
-            num_total_results=p.get("num_total_results"),
-            current_page=p.get("current_page"),
-            is_owned=p.get("is_owned"),
-            is_trashed=p.get("is_trashed"),
-            is_hidden=p.get("is_hidden"),
-            user_display_name=p.get("user_display_name"),
-            user_handle=p.get("user_handle"),
-            user_avatar_image_url=p.get("user_avatar_image_url"),
-            dislike_count=p.get("dislike_count"),
-            flag_count=p.get("flag_count"),
-            skip_count=p.get("skip_count"),
-            is_discover_playlist=p.get("is_discover_playlist"),
-            next_cursor=p.get("next_cursor")
-        )
-
-def create_clip_profile(c, profile):
-        import uuid
-        clip_id = uuid.UUID(c["id"]) if isinstance(c["id"], str) else c["id"]
-        user_id = uuid.UUID(c["user_id"]) if c.get("user_id") and isinstance(c["user_id"], str) else c.get("user_id")
-
-        profile_id = profile.id if hasattr(profile, 'id') and profile.id else None
-
-        return Clip(
-            id=clip_id,
-            profile_id=profile_id,  # Use profile_id instead of profile object to avoid issues
-            title=c.get("title"),
-            status=c.get("status"),
-            play_count=c.get("play_count", 0),
-            upvote_count=c.get("upvote_count", 0),
-            audio_url=c.get("audio_url"),
-            video_url=c.get("video_url"),
-            image_url=c.get("image_url"),
-            image_large_url=c.get("image_large_url"),
-            allow_comments=c.get("allow_comments"),
-            entity_type=c.get("entity_type"),
-            major_model_version=c.get("major_model_version"),
-            model_name=c.get("model_name"),
-            clip_metadata=c.get("metadata"),
-            caption=c.get("caption"),
-            type=c.get("type"),
-            duration=str(c.get("duration")) if c.get("duration") is not None else None,
-            refund_credits=c.get("refund_credits"),
-            stream=c.get("stream"),
-            make_instrumental=c.get("make_instrumental"),
-            can_remix=c.get("can_remix"),
-            is_remix=c.get("is_remix"),
-            priority=c.get("priority"),
-            has_stem=c.get("has_stem"),
-            video_is_stale=c.get("video_is_stale"),
-            uses_latest_model=c.get("uses_latest_model"),
-            is_liked=c.get("is_liked"),
-            user_id=user_id,
-            display_name=c.get("display_name"),
-            handle=c.get("handle"),
-            is_handle_updated=c.get("is_handle_updated"),
-            avatar_image_url=c.get("avatar_image_url"),
-            is_trashed=c.get("is_trashed"),
-            is_public=c.get("is_public"),
-            explicit=c.get("explicit"),
-            comment_count=c.get("comment_count"),
-            flag_count=c.get("flag_count"),
-            is_contest_clip=c.get("is_contest_clip"),
-            has_hook=c.get("has_hook"),
-            batch_index=c.get("batch_index"),
-            is_pinned=c.get("is_pinned")
-        )
-
-def create_clip(clip_data):
-        clip_id = UUID(clip_data["id"]) if isinstance(clip_data["id"], str) else clip_data["id"]
-        user_id = UUID(clip_data["user_id"]) if clip_data.get("user_id") and isinstance(clip_data["user_id"], str) else clip_data.get("user_id")
+class FreshnessDao:
+    def __init__(self, db):
+        self.db = db
 
-        return Clip(
-            id=clip_id,
-            title=clip_data.get("title"),
-            status=clip_data.get("status"),
-            play_count=clip_data.get("play_count", 0),
-            upvote_count=clip_data.get("upvote_count", 0),
-            audio_url=clip_data.get("audio_url"),
-            video_url=clip_data.get("video_url"),
-            image_url=clip_data.get("image_url"),
-            image_large_url=clip_data.get("image_large_url"),
-            allow_comments=clip_data.get("allow_comments"),
-            entity_type=clip_data.get("entity_type"),
-            major_model_version=clip_data.get("major_model_version"),
-            model_name=clip_data.get("model_name"),
-            clip_metadata=clip_data.get("metadata"),
-            caption=clip_data.get("caption"),
-            type=clip_data.get("type"),
-            duration=str(clip_data.get("duration")) if clip_data.get("duration") is not None else None,
-            refund_credits=clip_data.get("refund_credits"),
-            stream=clip_data.get("stream"),
-            make_instrumental=clip_data.get("make_instrumental"),
-            can_remix=clip_data.get("can_remix"),
-            is_remix=clip_data.get("is_remix"),
-            priority=clip_data.get("priority"),
-            has_stem=clip_data.get("has_stem"),
-            video_is_stale=clip_data.get("video_is_stale"),
-            uses_latest_model=clip_data.get("uses_latest_model"),
-            is_liked=clip_data.get("is_liked"),
-            user_id=user_id,
-            display_name=clip_data.get("display_name"),
-            handle=clip_data.get("handle"),
-            is_handle_updated=clip_data.get("is_handle_updated"),
-            avatar_image_url=clip_data.get("avatar_image_url"),
-            is_trashed=clip_data.get("is_trashed"),
-            is_public=clip_data.get("is_public"),
-            explicit=clip_data.get("explicit"),
-            comment_count=clip_data.get("comment_count"),
-            flag_count=clip_data.get("flag_count"),
-            is_contest_clip=clip_data.get("is_contest_clip"),
-            has_hook=clip_data.get("has_hook"),
-            batch_index=clip_data.get("batch_index"),
-            is_pinned=clip_data.get("is_pinned")
-        )
+    def get_fetched_at(self, entity_type: str, entity_id) -> Optional[datetime]:
+        if self.db is None:
+            raise HTTPException(status_code=500, detail="Database session not available")
+        fetch = self.db.get(EntityFetch, (entity_type, str(entity_id)))
+        return fetch.fetched_at if fetch else None
 
+    def mark_fetched(self, entity_type: str, entity_id, commit: bool = True):
+        if self.db is None:
+            raise HTTPException(status_code=500, detail="Database session not available")
+        self.db.merge(EntityFetch(entity_type=entity_type, entity_id=str(entity_id), fetched_at=utcnow()))
+        dto_cache.invalidate(entity_type, [entity_id])
+        if commit:
+            self.db.commit()
 
-def get_profile_dao(db=Depends(get_db_sqlite)):
-   return ProfileDao(db)
+    def is_stale(self, entity_type: str, entity_id, ttl_seconds: int) -> bool:
+        return expired(self.get_fetched_at(entity_type, entity_id), ttl_seconds)
 
+    def get_stale(self, ttls: Dict[str, int], limit: int) -> List[EntityFetch]:
+        if self.db is None:
+            raise HTTPException(status_code=500, detail="Database session not available")
+        now = utcnow()
+        conditions = [
+            and_(EntityFetch.entity_type == entity_type, EntityFetch.fetched_at < now - timedelta(seconds=ttl))
+            for entity_type, ttl in ttls.items()
+        ]
+        return self.db.query(EntityFetch).filter(or_(*conditions)).order_by(EntityFetch.fetched_at).limit(limit).all()
 
-def get_playlist_dao(db=Depends(get_db_sqlite)):
-   return PlaylistDao(db)
 
+def expired(fetched_at: Optional[datetime], ttl_seconds: int) -> bool:
+    return fetched_at is None or utcnow() - fetched_at > timedelta(seconds=ttl_seconds)
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.async_session import get_async_db_sqlite
+from config.logging_config import get_logger
+from models.entities import EntityFetch, Playlist, Profile
+from services.dto_cache import dto_cache
+from services.loading import JOINED, playlist_options, profile_options
+from storage.builders import parse_uuid
+from storage.sql import SqlRepository, dependents, invalidate_dependents, profile_children, profile_dependents, retire
+from v1.dao_sqlite import PlaylistDao, ProfileDao, expired, utcnow
+
+logger = get_logger(__name__)
+
+
+async def first(db: AsyncSession, stmt):
+    result = await db.execute(stmt.execution_options(populate_existing=True))
+    return result.scalars().unique().first()
+
+
+class AsyncPlaylistDao:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_page(self, limit: int, cursor: Optional[str] = None, skip: int = 0):
+        return await self.db.run_sync(lambda db: PlaylistDao(db).get_page(limit, cursor, skip))
+
+    async def delete(self, playlist_id) -> None:
+        playlist_id = parse_uuid(playlist_id)
+        playlist = await self.db.get(Playlist, playlist_id) if playlist_id else None
+        if not playlist:
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        found = await self.db.run_sync(lambda db: dependents(db, playlist_ids=[playlist_id]))
+        await self.db.run_sync(lambda db: retire(db, {"playlist": [playlist_id]}, found))
+        await self.db.delete(playlist)
+        await self.db.commit()
+        invalidate_dependents(found)
+
+    async def get_by_id(self, playlist_id, strategy: Optional[str] = JOINED):
+        if not playlist_id or isinstance(playlist_id, dict):
+            logger.warning(f"Invalid playlist_id: {playlist_id}")
+            return None
+        playlist_id = parse_uuid(playlist_id)
+        if playlist_id is None:
+            return None
+        return await first(self.db, select(Playlist).options(*playlist_options(strategy)).where(Playlist.id == playlist_id))
+
+    async def save_playlist_clips(self, playlist_clips: list):
+        await self.db.run_sync(lambda db: PlaylistDao(db).save_playlist_clips(playlist_clips))
+
+
+class AsyncProfileDao:
+    def __init__(self, db: AsyncSession, strategy: Optional[str] = None):
+        self.db = db
+        self.strategy = strategy
+
+    async def get_profile_by_handle(self, handle, strategy: Optional[str] = None):
+        options = profile_options(strategy or self.strategy)
+        return await first(self.db, select(Profile).options(*options).where(Profile.handle == handle))
+
+    async def get_page(self, limit: int, cursor: Optional[str] = None, skip: int = 0):
+        return await self.db.run_sync(lambda db: SqlRepository(db, self.strategy).list_profiles(limit, cursor, skip))
+
+    async def delete(self, profile_id) -> None:
+        profile_id = parse_uuid(profile_id)
+        profile = await self.db.get(Profile, profile_id) if profile_id else None
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        found = await self.db.run_sync(lambda db: profile_dependents(db, profile_id))
+        await self.db.run_sync(lambda db: retire(db, {"profile": [profile.handle], **profile_children(db, profile_id)}, found))
+        await self.db.delete(profile)
+        await self.db.commit()
+        dto_cache.invalidate("profile", [profile.handle])
+        invalidate_dependents(found)
+
+    async def save_profile(self, data: dict):
+        return await self.db.run_sync(lambda db: ProfileDao(db).save_profile(data))
+
+
+class AsyncFreshnessDao:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_fetched_at(self, entity_type: str, entity_id) -> Optional[datetime]:
+        fetch = await self.db.get(EntityFetch, (entity_type, str(entity_id)))
+        return fetch.fetched_at if fetch else None
+
+    async def mark_fetched(self, entity_type: str, entity_id, commit: bool = True):
+        await self.db.merge(EntityFetch(entity_type=entity_type, entity_id=str(entity_id), fetched_at=utcnow()))
+        dto_cache.invalidate(entity_type, [entity_id])
+        if commit:
+            await self.db.commit()
+
+    async def is_stale(self, entity_type: str, entity_id, ttl_seconds: int) -> bool:
+        return expired(await self.get_fetched_at(entity_type, entity_id), ttl_seconds)
+
+    async def get_stale(self, ttls: Dict[str, int], limit: int) -> List[EntityFetch]:
+        now = utcnow()
+        conditions = [
+            and_(EntityFetch.entity_type == entity_type, EntityFetch.fetched_at < now - timedelta(seconds=ttl))
+            for entity_type, ttl in ttls.items()
+        ]
+        stmt = select(EntityFetch).where(or_(*conditions)).order_by(EntityFetch.fetched_at).limit(limit)
+        return list((await self.db.execute(stmt)).scalars())
+
+
+def get_async_profile_dao(db=Depends(get_async_db_sqlite)):
+    return AsyncProfileDao(db)
+
+
+def get_async_playlist_dao(db=Depends(get_async_db_sqlite)):
+    return AsyncPlaylistDao(db)
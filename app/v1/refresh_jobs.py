@@ -0,0 +1,56 @@
+from typing import List, Tuple
+
+from config.async_session import get_async_sessionmaker
+from config.session import SessionLocal
+from config.settings import settings
+from config.logging_config import get_logger
+from services.refresh_scheduler import refresh_scheduler
+from v1.dao_sqlite import FreshnessDao, utcnow
+from v1.dao_sqlite_async import AsyncPlaylistDao, AsyncProfileDao
+from v1.service_clip import ClipService
+from v1.service_playlist import PlaylistService
+from v1.service_profile import ProfileService
+
+logger = get_logger(__name__)
+
+
+def entity_ttls() -> dict:
+    return {
+        "clip": settings.clip_ttl_seconds,
+        "profile": settings.profile_ttl_seconds,
+        "playlist": settings.playlist_ttl_seconds,
+    }
+
+
+def stale_entities(limit: int, store: str = "sqlite", session_factory=None) -> List[Tuple[Tuple[str, str, str], float]]:
+    ttls = entity_ttls()
+    now = utcnow()
+    db = (session_factory or SessionLocal)()
+    try:
+        return [
+            ((store, fetch.entity_type, fetch.entity_id), (now - fetch.fetched_at).total_seconds() / ttls[fetch.entity_type])
+            for fetch in FreshnessDao(db).get_stale(ttls, limit)
+        ]
+    finally:
+        db.close()
+
+
+async def refresh_profile_job(handle: str) -> bool:
+    async with get_async_sessionmaker("sqlite")() as db:
+        return await ProfileService(AsyncProfileDao(db)).refresh_profile(handle) is not None
+
+
+async def refresh_playlist_job(playlist_id: str) -> bool:
+    async with get_async_sessionmaker("sqlite")() as db:
+        return await PlaylistService(AsyncPlaylistDao(db)).refresh_playlist(playlist_id) is not None
+
+
+async def refresh_clip_job(clip_id: str) -> bool:
+    async with get_async_sessionmaker("sqlite")() as db:
+        return await ClipService(db).refresh_clip(clip_id)
+
+
+refresh_scheduler.register("sqlite", "profile", refresh_profile_job)
+refresh_scheduler.register("sqlite", "playlist", refresh_playlist_job)
+refresh_scheduler.register("sqlite", "clip", refresh_clip_job)
+refresh_scheduler.register_stale_source(stale_entities)
@@ -1,13 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
 
 from v1.service_clip import ClipService
-from services.api import fetch_clip_from_suno
-from services.mappers import to_clip_dto
-from config.session import get_db_sqlite
+from services.responses import raw_json
+from services.pagination import InvalidCursor, invalid_cursor, page_response
+from config.async_session import get_async_db_sqlite, get_async_db_sqlite_read
 from models.clip import ClipDTO
-from models.entities import Clip
+from models.page import Page
 
 from config.logging_config import get_logger
 
@@ -16,36 +16,38 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("", response_model=List[ClipDTO], response_model_exclude_none=True)
-def get_clips(
+@router.get("", response_model=Union[List[ClipDTO], Page[ClipDTO]], response_model_exclude_none=True)
+async def get_clips(
+    response: Response,
     page: int = 0,
     size: int = 25,
-    db: Session = Depends(get_db_sqlite)
+    cursor: Optional[str] = None,
+    sort: Literal["created_at", "play_count", "id"] = Query("created_at"),
+    db: AsyncSession = Depends(get_async_db_sqlite_read)
 ):
-    logger.info(f"Fetching clips with page={page}, size={size}")
-    clips = db.query(Clip).offset(page).limit(size).all()
-    clip_dtos = [to_clip_dto(clip) for clip in clips]
+    logger.info(f"Fetching clips with page={page}, size={size}, cursor={cursor}, sort={sort}")
+    try:
+        clip_dtos, next_cursor = await ClipService(db).get_page(size, cursor, page * size, sort)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
     logger.info(f"Successfully get {len(clip_dtos)} clips")
-    return clip_dtos
+    return page_response(response, clip_dtos, next_cursor, cursor)
 
 
 @router.get("/{clip_id}", response_model=ClipDTO, response_model_exclude_none=True)
-def get_clip(clip_id: str, db: Session = Depends(get_db_sqlite)):
-    clip_service = ClipService(db)
-    fetch_clip_from_suno(clip_id)
-    clip = clip_service.get_clip_by_id(clip_id)
-    if not clip:
+async def get_clip(
+    clip_id: str,
+    freshness: Literal["cached", "live"] = Query("cached"),
+    db: AsyncSession = Depends(get_async_db_sqlite)
+):
+    body = await ClipService(db).get_clip_json(clip_id, freshness)
+    if not body:
         logger.warning(f"Clip not found with ID: {clip_id}")
         raise HTTPException(status_code=404, detail="Clip not found")
-    return clip
+    return raw_json(body)
 
 
 @router.delete("/{clip_id}")
-def delete_clip(clip_id: str, db: Session = Depends(get_db_sqlite)):
-    clip = db.query(Clip).filter(Clip.id == clip_id).first()
-    if not clip:
-        raise HTTPException(status_code=404, detail="Clip not found")
-    
-    db.delete(clip)
-    db.commit()
+async def delete_clip(clip_id: str, db: AsyncSession = Depends(get_async_db_sqlite)):
+    await ClipService(db).delete(clip_id)
     return {"message": "Clip deleted successfully"}
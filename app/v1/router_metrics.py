@@ -0,0 +1,29 @@
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
+
+from services.circuit_breaker import breaker_states
+from services.dto_cache import dto_cache
+from services.metrics import upstream_metrics
+from services.rate_limiter import upstream_limiter
+from services.write_behind import write_behind
+
+router = APIRouter()
+
+
+@router.get("/upstream")
+def get_upstream_metrics(format: Literal["json", "prometheus"] = Query("json")):
+    if format == "prometheus":
+        return PlainTextResponse(upstream_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+    return {
+        "endpoints": upstream_metrics.snapshot(),
+        "rate_limiter": {
+            "rate": upstream_limiter.rate,
+            "max_rate": upstream_limiter.max_rate,
+            "in_flight": upstream_limiter.in_flight,
+        },
+        "circuit_breakers": breaker_states(),
+        "write_behind": write_behind.stats(),
+        "dto_cache": dto_cache.stats(),
+    }
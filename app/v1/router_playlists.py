@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from config.session import get_db_sqlite
-from v1.dao_sqlite import PlaylistDao
+from config.async_session import get_async_db_sqlite, get_async_db_sqlite_read
+from v1.dao_sqlite_async import AsyncPlaylistDao
 from v1.service_playlist import PlaylistService
-from models.playlist import PlaylistDTO, PlaylistDTO
-from models.entities import Playlist
+from models.playlist import PlaylistDTO
+from models.page import Page
+from services.responses import raw_json
+from services.pagination import InvalidCursor, invalid_cursor, page_response
 
 from config.logging_config import get_logger
 
@@ -15,28 +17,29 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("", response_model=List[PlaylistDTO])
-def get_playlists(
+@router.get("", response_model=Union[List[PlaylistDTO], Page[PlaylistDTO]])
+async def get_playlists(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db_sqlite)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db_sqlite_read)
 ):
-    logger.info(f"Fetching playlists with skip={skip}, limit={limit}")
-    return PlaylistService(PlaylistDao(db)).get_all(skip, limit)
+    logger.info(f"Fetching playlists with skip={skip}, limit={limit}, cursor={cursor}")
+    try:
+        playlists, next_cursor = await PlaylistService(AsyncPlaylistDao(db)).get_page(limit, cursor, skip)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
+    return page_response(response, playlists, next_cursor, cursor)
 
 @router.get("/{playlist_id}", response_model=PlaylistDTO)
-def get_playlist_by_id(playlist_id: str, db: Session = Depends(get_db_sqlite)):
-    playlist = PlaylistService(PlaylistDao(db)).get_playlist_by_id(playlist_id)
-    if not playlist:
+async def get_playlist_by_id(playlist_id: str, db: AsyncSession = Depends(get_async_db_sqlite)):
+    body = await PlaylistService(AsyncPlaylistDao(db)).get_playlist_json(playlist_id)
+    if not body:
         raise HTTPException(status_code=404, detail=playlist_id + " playlist not found")
-    return playlist
+    return raw_json(body)
 
 @router.delete("/{playlist_id}")
-def delete_playlist(playlist_id: str, db: Session = Depends(get_db_sqlite)):
-    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-    if not playlist:
-        raise HTTPException(status_code=404, detail="Playlist not found")
-    
-    db.delete(playlist)
-    db.commit()
+async def delete_playlist(playlist_id: str, db: AsyncSession = Depends(get_async_db_sqlite)):
+    await PlaylistService(AsyncPlaylistDao(db)).delete(playlist_id)
     return {"message": "Playlist deleted successfully"}
@@ -1,27 +1,38 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import List, Optional, Union
+from models.page import Page
 from models.profile import ProfileDTO
+from services.loading import loading_strategy
+from services.responses import raw_json
+from services.pagination import InvalidCursor, invalid_cursor, page_response
 from config.logging_config import get_logger
 from v1.service_profile import ProfileService
-from v1.dao_sqlite import ProfileDao
-from config.session import get_db_sqlite
+from v1.dao_sqlite_async import AsyncProfileDao
+from config.async_session import get_async_db_sqlite, get_async_db_sqlite_read
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
-@router.get("", response_model=List[ProfileDTO])
-def get_profiles(skip: int = 0, limit: int = 100, db=Depends(get_db_sqlite)):
-    logger.info(f"Get profiles from page={skip}, size={limit}")
-    return ProfileService(ProfileDao(db)).get_all(skip, limit)
+@router.get("", response_model=Union[List[ProfileDTO], Page[ProfileDTO]])
+async def get_profiles(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, strategy: Optional[str] = Depends(loading_strategy), db=Depends(get_async_db_sqlite_read)):
+    logger.info(f"Get profiles from page={skip}, size={limit}, cursor={cursor}")
+    try:
+        profiles, next_cursor = await ProfileService(AsyncProfileDao(db, strategy)).get_page(limit, cursor, skip)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
+    return page_response(response, profiles, next_cursor, cursor)
 
 @router.get("/{handle}", response_model=ProfileDTO)
-def get_profile(handle: str, db=Depends(get_db_sqlite)):
+async def get_profile(handle: str, strategy: Optional[str] = Depends(loading_strategy), db=Depends(get_async_db_sqlite)):
     logger.info(f"Get {handle} profile")
-    return ProfileService(ProfileDao(db)).get_profile_by_handle(handle)
+    body = await ProfileService(AsyncProfileDao(db, strategy)).get_profile_json(handle)
+    if not body:
+        raise HTTPException(status_code=404, detail=f"Profile {handle} not found")
+    return raw_json(body)
 
 
 @router.delete("/{handle}")
-def delete_profile(handle: str, db=Depends(get_db_sqlite)):
-    ProfileService(ProfileDao(db)).delete(handle)
+async def delete_profile(handle: str, db=Depends(get_async_db_sqlite)):
+    await ProfileService(AsyncProfileDao(db)).delete(handle)
     return {"message": f"Profile {handle} deleted successfully"}
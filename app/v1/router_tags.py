@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from config.session import get_db_sqlite
+from config.async_session import get_async_db_sqlite, get_async_db_sqlite_read
 
 from models import (
     TagResponse,
@@ -18,7 +18,7 @@ async def get_tags(
     limit: int = Query(100, ge=1, le=1000),
     tag_type: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
-    db: Session = Depends(get_db_sqlite)
+    db: AsyncSession = Depends(get_async_db_sqlite_read)
 ):
     return await TagService.get_tags(
         db,
@@ -32,7 +32,7 @@ async def get_tags(
 @router.get("/{tag_id}", response_model=TagResponse)
 async def get_tag(
     tag_id: str,
-    db: Session = Depends(get_db_sqlite)
+    db: AsyncSession = Depends(get_async_db_sqlite_read)
 ):
     """Get a specific tag by ID"""
     tag = await TagService.get_tag(db, tag_id)
@@ -44,7 +44,7 @@ async def get_tag(
 @router.post("/", response_model=TagResponse)
 async def create_tag(
     tag: TagCreate,
-    db: Session = Depends(get_db_sqlite)
+    db: AsyncSession = Depends(get_async_db_sqlite)
 ):
     return await TagService.create_tag(db, tag)
 
@@ -53,7 +53,7 @@ async def create_tag(
 async def update_tag(
     tag_id: str,
     tag: TagCreate,
-    db: Session = Depends(get_db_sqlite)
+    db: AsyncSession = Depends(get_async_db_sqlite)
 ):
     updated_tag = await TagService.update_tag(db, tag_id, tag)
     if not updated_tag:
@@ -64,7 +64,7 @@ async def update_tag(
 @router.delete("/{tag_id}")
 async def delete_tag(
     tag_id: str,
-    db: Session = Depends(get_db_sqlite)
+    db: AsyncSession = Depends(get_async_db_sqlite)
 ):
     """Delete a tag"""
     success = await TagService.delete_tag(db, tag_id)
@@ -77,6 +77,6 @@ async def delete_tag(
 async def search_tags(
     name: str = Query(..., min_length=1),
     tag_type: Optional[str] = Query(None),
-    db: Session = Depends(get_db_sqlite)
+    db: AsyncSession = Depends(get_async_db_sqlite_read)
 ):
     return await TagService.search_tags(db, name, tag_type)
\ No newline at end of file
@@ -1,56 +1,121 @@
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 
+from config.settings import settings
 from models.clip import ClipDTO
 from models.entities import Clip
-from services.api import *
+from v1.dao_sqlite import expired
+from v1.dao_sqlite_async import AsyncFreshnessDao, first
+from services.api import fetch_clip_from_suno, fetch_profile_from_suno, is_live, is_snapshot
+from services.dto_cache import dto_cache
+from services.refresh_scheduler import refresh_scheduler
+from services.singleflight import get_flight
 from config.logging_config import get_logger
-from services.mappers import to_clip_dto, create_clip_slim
+from services.mappers import to_clip_dto
+from services.write_behind import write_behind
+from storage.builders import create_clip, parse_uuid
+from storage.sql import SqlRepository, dependents, invalidate_dependents, retire
 
 logger = get_logger(__name__)
 
 
 class ClipService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_clip_by_id(self, clip_id: str) -> Optional[ClipDTO]:
-        try:
-            # Try to convert string ID to UUID for the query
-            import uuid
-            uuid_id = uuid.UUID(clip_id) if isinstance(clip_id, str) and clip_id else clip_id
-            clip = self.db.query(Clip).filter(Clip.id == uuid_id).first()
-        except (ValueError, AttributeError):
-            # If conversion fails, try with the original string
-            clip = self.db.query(Clip).filter(Clip.id == clip_id).first()
-        
+    async def get_page(self, limit: int, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at") -> Tuple[List[ClipDTO], Optional[str]]:
+        clips, next_cursor = await self.db.run_sync(lambda db: SqlRepository(db).list_clips(limit, cursor, offset, sort))
+        return [to_clip_dto(clip) for clip in clips], next_cursor
+
+    async def delete(self, clip_id: str):
+        clip_id = parse_uuid(clip_id)
+        clip = await self.db.get(Clip, clip_id) if clip_id else None
         if not clip:
+            raise HTTPException(status_code=404, detail="Clip not found")
+        found = await self.db.run_sync(lambda db: dependents(db, clip_ids=[clip_id]))
+        await self.db.run_sync(lambda db: retire(db, {"clip": [clip_id]}, found))
+        await self.db.delete(clip)
+        await self.db.commit()
+        invalidate_dependents(found)
+
+    async def get_clip_by_id(self, clip_id: str, freshness: str = "cached") -> Optional[ClipDTO]:
+        clip = await self.find_clip(clip_id)
+        refresh_scheduler.record_request("sqlite", "clip", clip_id)
+        
+        if not clip or freshness == "live":
             try:
-                clip_data = fetch_clip_from_suno(clip_id)
-                self.save_clip(clip_data)
-                clip = create_clip_slim(clip_data)
+                clip_data = await self.fetch_once(clip_id)
+                clip = await self.find_clip(clip_id) or (create_clip(clip_data) if is_snapshot(clip_data) else None)
             except Exception as e:
                 logger.error(f"Failed to fetch clip from remote API: {str(e)}")
-                return None
-        return to_clip_dto(clip)
-
-    def save_clip(self, data: dict):
-        try:
-            # Try to convert string ID to UUID for the query
-            import uuid
-            clip_id = data["id"]
-            if isinstance(clip_id, str):
-                uuid_id = uuid.UUID(clip_id)
-                clip = self.db.query(Clip).filter(Clip.id == uuid_id).first()
-            else:
-                clip = self.db.query(Clip).filter(Clip.id == clip_id).first()
-        except (ValueError, TypeError):
-            # If conversion fails, try with the original value
-            clip = self.db.query(Clip).filter(Clip.id == data["id"]).first()
-        
+        elif await self.is_stale(clip.id):
+            logger.info(f"Clip {clip_id} is stale, scheduling refresh")
+            refresh_scheduler.request_refresh("sqlite", "clip", clip_id)
+        return to_clip_dto(clip) if clip else None
+
+    async def get_clip_json(self, clip_id: str, freshness: str = "cached") -> Optional[bytes]:
+        stamp = await self.cache_stamp(clip_id) if freshness == "cached" else None
+        body = dto_cache.get("clip", clip_id, stamp)
+        if body is not None:
+            refresh_scheduler.record_request("sqlite", "clip", clip_id)
+            if expired(stamp, settings.clip_ttl_seconds):
+                refresh_scheduler.request_refresh("sqlite", "clip", clip_id)
+            return body
+
+        clip = await self.get_clip_by_id(clip_id, freshness)
         if not clip:
-            self.db.add(create_clip_slim(data))
-            self.db.commit()
+            return None
+        body = clip.model_dump_json(exclude_none=True).encode()
+        dto_cache.put("clip", clip_id, stamp, body)
+        return body
+
+    async def cache_stamp(self, clip_id: str):
+        if not dto_cache.enabled or write_behind.pending("clip", clip_id) is not None:
+            return None
+        return await AsyncFreshnessDao(self.db).get_fetched_at("clip", clip_id)
+
+    async def find_clip(self, clip_id: str) -> Optional[Clip]:
+        pending = write_behind.pending("clip", clip_id)
+        if pending:
+            return create_clip(pending)
+        clip_id = parse_uuid(clip_id)
+        if clip_id is None:
+            return None
+        return await first(self.db, select(Clip).where(Clip.id == clip_id))
+
+    async def is_stale(self, clip_id) -> bool:
+        if write_behind.pending("clip", clip_id) is not None:
+            return False
+        return await AsyncFreshnessDao(self.db).is_stale("clip", clip_id, settings.clip_ttl_seconds)
+
+    async def refresh_clip(self, clip_id: str) -> bool:
+        return is_live(await self.fetch_once(clip_id))
+
+    async def fetch_once(self, clip_id: str):
+        async def recheck():
+            clip = await self.find_clip(clip_id)
+            return True if clip and not await self.is_stale(clip.id) else None
+
+        return await get_flight("sqlite").do(("clip", clip_id), lambda: self.fetch_and_save(clip_id), recheck)
+
+    async def fetch_and_save(self, clip_id: str) -> dict:
+        clip_data = await fetch_clip_from_suno(clip_id)
+        if not is_live(clip_data):
+            return clip_data
+        if write_behind.running:
+            write_behind.submit("clip", clip_id, clip_data)
+        else:
+            await self.save_clip(clip_data)
+        return clip_data
+
+    async def save_clip(self, data: dict):
+        await self.save_clips([data])
+
+    async def save_clips(self, clips_data: list):
+        await self.db.run_sync(lambda db: SqlRepository(db).save_clips(clips_data))
+
+    async def fetch_profile_from_suno(self, handle: str) -> dict:
+        return await fetch_profile_from_suno(handle)
 
-    def fetch_profile_from_suno(self, handle: str) -> dict:
-        return fetch_profile_from_suno(handle)
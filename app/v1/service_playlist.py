@@ -1,39 +1,98 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from v1.dao_sqlite import PlaylistDao
+from config.settings import settings
+from v1.dao_sqlite import expired
+from v1.dao_sqlite_async import AsyncFreshnessDao, AsyncPlaylistDao
 from models.playlist import PlaylistDTO
-from services.api import *
+from services.api import fetch_playlist_from_suno, is_live, is_snapshot
+from services.dto_cache import dto_cache
+from services.refresh_scheduler import refresh_scheduler
+from services.singleflight import get_flight
+from services.write_behind import write_behind
+from storage.builders import build_playlist
 from config.logging_config import get_logger
 from services.mappers import to_playlist
-from v1.dao_sqlite import PlaylistDao
 
 logger = get_logger(__name__)
 
 class PlaylistService:
-    def __init__(self, dao: PlaylistDao):
+    def __init__(self, dao: AsyncPlaylistDao):
         self.dao = dao
 
-    def get_all(self, skip, limit) -> List[PlaylistDTO]:
-        return self.dao.get_all(skip, limit)
+    async def get_all(self, skip, limit) -> List[PlaylistDTO]:
+        return (await self.dao.get_page(limit, skip=skip))[0]
 
-    def get_playlist_by_id(self, playlist_id: str) -> Optional[PlaylistDTO]:
-        playlist = self.dao.get_by_id(playlist_id)
+    async def get_page(self, limit: int, cursor: Optional[str] = None, skip: int = 0) -> Tuple[List[PlaylistDTO], Optional[str]]:
+        return await self.dao.get_page(limit, cursor, skip)
+
+    async def delete(self, playlist_id: str):
+        await self.dao.delete(playlist_id)
+
+    async def get_playlist_by_id(self, playlist_id: str) -> Optional[PlaylistDTO]:
+        playlist = await self.find_playlist(playlist_id)
+        refresh_scheduler.record_request("sqlite", "playlist", playlist_id)
         
         if not playlist:
-            playlist_data = fetch_playlist_from_suno(playlist_id)
-            if playlist_data:
-                self.dao.save_playlist_clips([playlist_data])
-                playlist = self.dao.get_by_id(playlist_id)
-        else:
-            if hasattr(playlist, 'clips'):
-                if len(playlist.clips) == 0:
-                    playlist_data = fetch_playlist_from_suno(playlist_id)
-                    if playlist_data:
-                        self.dao.save_playlist_clips([playlist_data])
-                        playlist = self.dao.get_by_id(playlist_id)
+            playlist = await self.refresh_playlist(playlist_id)
+        elif not playlist.clips:
+            refresh_scheduler.request_refresh("sqlite", "playlist", playlist_id, staleness=2.0)
+        elif await self.is_stale(playlist_id):
+            refresh_scheduler.request_refresh("sqlite", "playlist", playlist_id)
         
         return to_playlist(playlist) if playlist else None
 
+    async def get_playlist_json(self, playlist_id: str) -> Optional[bytes]:
+        stamp = await self.cache_stamp(playlist_id)
+        body = dto_cache.get("playlist", playlist_id, stamp)
+        if body is not None:
+            refresh_scheduler.record_request("sqlite", "playlist", playlist_id)
+            if expired(stamp, settings.playlist_ttl_seconds):
+                refresh_scheduler.request_refresh("sqlite", "playlist", playlist_id)
+            return body
+
+        playlist = await self.get_playlist_by_id(playlist_id)
+        if not playlist:
+            return None
+        body = playlist.model_dump_json().encode()
+        if playlist.clips:
+            dto_cache.put("playlist", playlist_id, stamp, body)
+        return body
+
+    async def cache_stamp(self, playlist_id: str):
+        if not dto_cache.enabled or write_behind.pending("playlist", playlist_id) is not None:
+            return None
+        return await AsyncFreshnessDao(self.dao.db).get_fetched_at("playlist", playlist_id)
+
+    async def is_stale(self, playlist_id: str) -> bool:
+        if write_behind.pending("playlist", playlist_id) is not None:
+            return False
+        return await AsyncFreshnessDao(self.dao.db).is_stale("playlist", playlist_id, settings.playlist_ttl_seconds)
+
+    async def refresh_playlist(self, playlist_id: str):
+        async def fetch_and_save():
+            playlist_data = await fetch_playlist_from_suno(playlist_id)
+            if not is_live(playlist_data):
+                return playlist_data
+            if write_behind.running:
+                write_behind.submit("playlist", playlist_id, playlist_data)
+            else:
+                await self.dao.save_playlist_clips([playlist_data])
+                await AsyncFreshnessDao(self.dao.db).mark_fetched("playlist", playlist_id)
+            return playlist_data
+
+        async def recheck():
+            return True if await self.find_playlist(playlist_id) and not await self.is_stale(playlist_id) else None
+
+        playlist_data = await get_flight("sqlite").do(("playlist", playlist_id), fetch_and_save, recheck)
+        playlist = await self.find_playlist(playlist_id)
+        if playlist is None and is_snapshot(playlist_data):
+            return build_playlist(playlist_data)
+        return playlist
+
+    async def find_playlist(self, playlist_id: str):
+        pending = write_behind.pending("playlist", playlist_id)
+        return build_playlist(pending) if pending else await self.dao.get_by_id(playlist_id)
+
     def getPlaylistIds(self, profile_data: dict) -> list:
         return [playlist['id'] for playlist in profile_data.get('playlists', []) if 'id' in playlist]
 
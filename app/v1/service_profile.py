@@ -1,8 +1,14 @@
-from typing import List, Optional
-from config.session import get_db_sqlite
-from v1.dao_sqlite import ProfileDao
+from typing import List, Optional, Tuple
+from config.settings import settings
+from v1.dao_sqlite import expired
+from v1.dao_sqlite_async import AsyncFreshnessDao, AsyncProfileDao
 from models.profile import ProfileDTO
-from services.api import fetch_profile_from_suno
+from services.api import fetch_profile_from_suno, is_live, is_snapshot
+from services.dto_cache import dto_cache
+from services.refresh_scheduler import refresh_scheduler
+from services.singleflight import get_flight
+from services.write_behind import write_behind
+from storage.builders import build_profile
 from config.logging_config import get_logger
 from services.mappers import to_profile_dto
 
@@ -10,35 +16,90 @@ from services.mappers import to_profile_dto
 logger = get_logger(__name__)
 
 class ProfileService:
-    def __init__(self, dao: ProfileDao):
+    def __init__(self, dao: AsyncProfileDao):
         self.dao = dao
 
-    def delete(self, profile_id: str):
-        self.dao.delete(profile_id)
+    async def delete(self, profile_id: str):
+        await self.dao.delete(profile_id)
 
-    def get_all(self, skip, limit) -> List[ProfileDTO]:
-        return [to_profile_dto(profile) for profile in self.dao.get_all(skip, limit)]
+    async def get_all(self, skip, limit) -> List[ProfileDTO]:
+        return (await self.get_page(limit, skip=skip))[0]
 
-    def get_profile_by_handle(self, handle: str) -> Optional[ProfileDTO]:
-        profile = self.dao.get_profile_by_handle(handle)
+    async def get_page(self, limit: int, cursor: Optional[str] = None, skip: int = 0) -> Tuple[List[ProfileDTO], Optional[str]]:
+        profiles, next_cursor = await self.dao.get_page(limit, cursor, skip)
+        return [to_profile_dto(profile) for profile in profiles], next_cursor
+
+    async def get_profile_by_handle(self, handle: str) -> Optional[ProfileDTO]:
+        profile = await self.find_profile(handle)
         logger.info(f"Found profile in DAO: {profile is not None}")
+        refresh_scheduler.record_request("sqlite", "profile", handle)
         if not profile:
             logger.info(f"Locally profile not found {handle}")
-            data = fetch_profile_from_suno(handle)
-            logger.info(f"Fetched data from Suno API, clips count: {len(data.get('clips', []))}, playlists count: {len(data.get('playlists', []))}")
-            profile = self.dao.save_profile(data)
+            profile = await self.refresh_profile(handle)
             logger.info(f"Saved profile with id: {profile.id if profile else 'None'}")
-        else:
-            clips_count = len(profile.clips) if profile.clips else 0
-            playlists_count = len(profile.playlists) if profile.playlists else 0
-            logger.info(f"Profile exists: {profile.handle}, clips count: {clips_count}, playlists count: {playlists_count}")
-            has_no_clips = clips_count == 0
-            has_no_playlists = playlists_count == 0
-            logger.info(f"Has no clips: {has_no_clips}, Has no playlists: {has_no_playlists}")
-            
-            if has_no_clips or has_no_playlists:
-                logger.info(f"Profile {handle} has no clips or playlists, fetching fresh data to update relationships")
-                data = fetch_profile_from_suno(handle)
-                profile = self.dao.save_profile(data)
-        
-        return to_profile_dto(profile)
+        elif needs_refresh(profile):
+            logger.info(f"Profile {handle} has no clips or playlists, scheduling refresh")
+            refresh_scheduler.request_refresh("sqlite", "profile", handle, staleness=2.0)
+        elif await self.is_stale(handle):
+            refresh_scheduler.request_refresh("sqlite", "profile", handle)
+
+        return to_profile_dto(profile) if profile else None
+
+    async def get_profile_json(self, handle: str) -> Optional[bytes]:
+        stamp = await self.cache_stamp(handle)
+        body = dto_cache.get("profile", handle, stamp)
+        if body is not None:
+            refresh_scheduler.record_request("sqlite", "profile", handle)
+            if expired(stamp, settings.profile_ttl_seconds):
+                refresh_scheduler.request_refresh("sqlite", "profile", handle)
+            return body
+
+        profile = await self.get_profile_by_handle(handle)
+        if not profile:
+            return None
+        body = profile.model_dump_json().encode()
+        if profile.clips and profile.playlists:
+            dto_cache.put("profile", handle, stamp, body)
+        return body
+
+    async def cache_stamp(self, handle: str):
+        if not dto_cache.enabled or write_behind.pending("profile", handle) is not None:
+            return None
+        return await AsyncFreshnessDao(self.dao.db).get_fetched_at("profile", handle)
+
+    async def is_stale(self, handle: str) -> bool:
+        if write_behind.pending("profile", handle) is not None:
+            return False
+        return await AsyncFreshnessDao(self.dao.db).is_stale("profile", handle, settings.profile_ttl_seconds)
+
+    async def refresh_profile(self, handle: str):
+        async def fetch_and_save():
+            data = await fetch_profile_from_suno(handle)
+            logger.info(f"Fetched data from Suno API, clips count: {len(data.get('clips', []))}, playlists count: {len(data.get('playlists', []))}")
+            if not is_live(data):
+                return data
+            if write_behind.running:
+                write_behind.submit("profile", handle, data)
+            else:
+                await self.dao.save_profile(data)
+                await AsyncFreshnessDao(self.dao.db).mark_fetched("profile", handle)
+            return data
+
+        async def recheck():
+            return True if await self.find_profile(handle) and not await self.is_stale(handle) else None
+
+        data = await get_flight("sqlite").do(("profile", handle), fetch_and_save, recheck)
+        profile = await self.find_profile(handle)
+        if profile is None and is_snapshot(data):
+            return build_profile(data)
+        return profile
+
+    async def find_profile(self, handle: str):
+        pending = write_behind.pending("profile", handle)
+        return build_profile(pending) if pending else await self.dao.get_profile_by_handle(handle)
+
+
+def needs_refresh(profile) -> bool:
+    if profile is None:
+        return True
+    return not profile.clips or not profile.playlists
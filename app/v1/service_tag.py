@@ -1,27 +1,31 @@
-from sqlalchemy.orm import Session
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from models.entities import Tag
 from models import TagResponse, TagCreate
+from v1.dao_sqlite import utcnow
+from storage.builders import parse_uuid
 
 
 class TagService:
     @staticmethod
     async def get_tags(
-        db: Session, 
+        db: AsyncSession, 
         skip: int = 0, 
         limit: int = 100,
         tag_type: Optional[str] = None,
         name: Optional[str] = None
     ) -> List[TagResponse]:
-        query = db.query(Tag)
+        query = select(Tag)
         
         if tag_type:
-            query = query.filter(Tag.tag_type == tag_type)
+            query = query.where(Tag.tag_type == tag_type)
         if name:
-            query = query.filter(Tag.name.like(f"%{name}%"))
+            query = query.where(Tag.name.like(f"%{name}%"))
         
-        tags = query.offset(skip).limit(limit).all()
+        tags = (await db.execute(query.offset(skip).limit(limit))).scalars()
         
         return [
             TagResponse.model_validate(tag)
@@ -29,29 +33,36 @@ class TagService:
         ]
 
     @staticmethod
-    async def get_tag(db: Session, tag_id: str) -> Optional[TagResponse]:
-        tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    async def _find(db: AsyncSession, tag_id: str) -> Optional[Tag]:
+        tag_id = parse_uuid(tag_id)
+        return await db.get(Tag, tag_id) if tag_id else None
+
+    @staticmethod
+    async def get_tag(db: AsyncSession, tag_id: str) -> Optional[TagResponse]:
+        tag = await TagService._find(db, tag_id)
         if tag:
             return TagResponse.model_validate(tag)
         return None
 
     @staticmethod
-    async def create_tag(db: Session, tag_create: TagCreate) -> TagResponse:
+    async def create_tag(db: AsyncSession, tag_create: TagCreate) -> TagResponse:
         db_tag = Tag(
+            id=uuid.uuid4(),
             name=tag_create.name,
             description=tag_create.description,
-            tag_type=tag_create.tag_type
+            tag_type=tag_create.tag_type,
+            created_at=utcnow()
         )
         
         db.add(db_tag)
-        db.commit()
-        db.refresh(db_tag)
+        await db.commit()
+        await db.refresh(db_tag)
         
         return TagResponse.model_validate(db_tag)
 
     @staticmethod
-    async def update_tag(db: Session, tag_id: str, tag_update: TagCreate) -> Optional[TagResponse]:
-        db_tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    async def update_tag(db: AsyncSession, tag_id: str, tag_update: TagCreate) -> Optional[TagResponse]:
+        db_tag = await TagService._find(db, tag_id)
         if not db_tag:
             return None
         
@@ -59,31 +70,31 @@ class TagService:
         db_tag.description = tag_update.description
         db_tag.tag_type = tag_update.tag_type
         
-        db.commit()
-        db.refresh(db_tag)
+        await db.commit()
+        await db.refresh(db_tag)
         
         return TagResponse.model_validate(db_tag)
 
     @staticmethod
-    async def delete_tag(db: Session, tag_id: str) -> bool:
-        db_tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    async def delete_tag(db: AsyncSession, tag_id: str) -> bool:
+        db_tag = await TagService._find(db, tag_id)
         if not db_tag:
             return False
         
-        db.delete(db_tag)
-        db.commit()
+        await db.delete(db_tag)
+        await db.commit()
         return True
 
     @staticmethod
-    async def search_tags(db: Session, name: str, tag_type: Optional[str] = None) -> List[TagResponse]:
-        query = db.query(Tag).filter(Tag.name.like(f"%{name}%"))
+    async def search_tags(db: AsyncSession, name: str, tag_type: Optional[str] = None) -> List[TagResponse]:
+        query = select(Tag).where(Tag.name.like(f"%{name}%"))
         
         if tag_type:
-            query = query.filter(Tag.tag_type == tag_type)
+            query = query.where(Tag.tag_type == tag_type)
         
-        tags = query.all()
+        tags = (await db.execute(query)).scalars()
         
         return [
             TagResponse.model_validate(tag)
             for tag in tags
-        ]
\ No newline at end of file
+        ]
@@ -1,24 +1,32 @@
-from fastapi import APIRouter, HTTPException
-from .utils import read_json_file, read_json_from_folder
-
-CLIPS_DIR = "json/clips"
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from services.pagination import InvalidCursor, invalid_cursor, page_response
+from services.responses import raw_json, render
+from storage import get_json_repository
 
 router = APIRouter()
 
 
 @router.get("")
-def get_clips_v2():
-    clips_data = read_json_from_folder(CLIPS_DIR)
-    if clips_data is None:
-        raise HTTPException(status_code=404, detail="Clip data not found")
-    return clips_data
+def get_clips_v2(
+    request: Request,
+    response: Response,
+    page: int = Query(0, ge=0),
+    size: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: Literal["id", "created_at", "play_count"] = Query("id"),
+):
+    try:
+        clips_data, next_cursor = get_json_repository().clip_page(size, cursor, page * size, sort)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
+    return render(request, page_response(response, clips_data, next_cursor, cursor), response)
 
 
 @router.get("/{clip_id}")
 def get_clip_by_id_v2(clip_id: str):
-    file_path =  f"{CLIPS_DIR}/{clip_id}.json"
-    clips_data = read_json_file(file_path)
+    clips_data = get_json_repository().read_bytes("clip", clip_id)
     
     if clips_data is None:
         raise HTTPException(status_code=404, detail=f"Clip {clip_id} not found")
-    return clips_data
+    return raw_json(clips_data)
@@ -1,26 +1,31 @@
-from fastapi import APIRouter, HTTPException
-from .utils import read_json_file, read_json_from_folder
-
-PLAYLISTS_DIR = "json/playlists"
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from services.pagination import InvalidCursor, invalid_cursor, page_response
+from services.responses import raw_json, render
+from storage import get_json_repository
 
 router = APIRouter()
 
 
 @router.get("")
-def get_playlists_v2():
-    playlists_data = read_json_from_folder(PLAYLISTS_DIR)
-    if playlists_data is None:
-        raise HTTPException(status_code=404, detail=f"Playlists not found")
-
-    return playlists_data
+def get_playlists_v2(
+    request: Request,
+    response: Response,
+    page: int = Query(0, ge=0),
+    size: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    try:
+        playlists_data, next_cursor = get_json_repository().page("playlist", size, cursor, page * size)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
+    return render(request, page_response(response, playlists_data, next_cursor, cursor), response)
 
 
 @router.get("/{playlist_id}")
 def get_playlist_by_id_v2(playlist_id: str):
-    file_path =  f"{PLAYLISTS_DIR}/{playlist_id}.json"
-    playlist_data = read_json_file(file_path)
+    playlist_data = get_json_repository().read_bytes("playlist", playlist_id)
     
     if playlist_data is None:
         raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
-    
-    return playlist_data
\ No newline at end of file
+    return raw_json(playlist_data)
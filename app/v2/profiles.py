@@ -1,27 +1,31 @@
-from fastapi import APIRouter, HTTPException
-from .utils import read_json_file, read_json_from_folder
-
-PROFILES_DIR = "json/profiles"
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from services.pagination import InvalidCursor, invalid_cursor, page_response
+from services.responses import raw_json, render
+from storage import get_json_repository
 
 router = APIRouter()
 
 
 @router.get("")
-def get_profiles_v2():
-    profile_data = read_json_from_folder(PROFILES_DIR)
+def get_profiles_v2(
+    request: Request,
+    response: Response,
+    page: int = Query(0, ge=0),
+    size: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    try:
+        profile_data, next_cursor = get_json_repository().page("profile", size, cursor, page * size)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
+    return render(request, page_response(response, profile_data, next_cursor, cursor), response)
 
-    if profile_data is None:
-        raise HTTPException(status_code=404, detail=f"Profiles not found")
-
-    return profile_data
-    
 
 @router.get("/{profile_handle}")
 def get_profile_by_handle_v2(profile_handle: str):
-    file_path =  f"{PROFILES_DIR}/{profile_handle}.json"
-    profile_data = read_json_file(file_path)
+    profile_data = get_json_repository().read_bytes("profile", profile_handle)
     
     if profile_data is None:
         raise HTTPException(status_code=404, detail=f"Profile '{profile_handle}' not found")
-    
-    return profile_data
+    return raw_json(profile_data)
@@ -1,8 +1,11 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Literal, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from services.mappers import to_clip_dto
+from services.pagination import InvalidCursor, invalid_cursor, page_response
 from models.clip import ClipDTO
-from v3.postgres_dao import PostgresClipDAO
+from models.page import Page
+from config.async_session import get_async_db_pg_read
+from v3.postgres_dao_async import AsyncPostgresClipDAO
 from config.logging_config import get_logger
 from typing import List, Optional
 
@@ -10,24 +13,30 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
-@router.get("")
-def get_clips_v3(
+@router.get("", response_model=Union[List[ClipDTO], Page[ClipDTO]])
+async def get_clips_v3(
+    response: Response,
     page: int = Query(1, description="Page number", ge=1),
-    size: int = Query(20, description="Items per page", ge=1, le=100)
-) -> List[ClipDTO]:
+    size: int = Query(20, description="Items per page", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor or next_cursor"),
+    sort: Literal["created_at", "play_count", "id"] = Query("created_at"),
+    db=Depends(get_async_db_pg_read),
+):
     try:
         offset = (page - 1) * size
-        clips = PostgresClipDAO().get_all_clips(offset=offset, limit=size)
-        return [to_clip_dto(clip) for clip in clips]
+        clips, next_cursor = await AsyncPostgresClipDAO(db).get_clips_page(size, cursor, offset, sort)
+        return page_response(response, [to_clip_dto(clip) for clip in clips], next_cursor, cursor)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
     except Exception as e:
         logger.error(f"Error retrieving clips: {e}")
         return []
 
 
 @router.get("/{clip_id}")
-def get_clip_by_id_v3(clip_id: str) -> Optional[ClipDTO]:
+async def get_clip_by_id_v3(clip_id: str, db=Depends(get_async_db_pg_read)) -> Optional[ClipDTO]:
     try:
-        return to_clip_dto(PostgresClipDAO().get_clip_by_id(clip_id))
+        return to_clip_dto(await AsyncPostgresClipDAO(db).get_clip_by_id(clip_id))
     except Exception as e:
         logger.error(f"Error retrieving clip {clip_id}: {e}")
         raise HTTPException(status_code=404, detail=f"Clip {clip_id} not found")
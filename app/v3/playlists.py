@@ -1,27 +1,32 @@
-from fastapi import APIRouter, HTTPException
-from app.services.mappers import to_playlist_dto
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from services.mappers import to_playlist, to_playlist_dto
+from config.async_session import get_async_db_pg_read
 from config.logging_config import get_logger
 from models.playlist import PlaylistDTO
-from v3.postgres_dao import PostgresPlaylistDAO
+from services.pagination import InvalidCursor, invalid_cursor, page_response
+from v3.postgres_dao_async import AsyncPostgresPlaylistDAO
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.get("")
-async def get_playlists_v3():
+async def get_playlists_v3(response: Response, limit: int = Query(25, ge=1, le=100), cursor: Optional[str] = None, db=Depends(get_async_db_pg_read)):
     try:
-        return PostgresPlaylistDAO().get_all_playlists()
+        playlists, next_cursor = await AsyncPostgresPlaylistDAO(db).get_playlists_page(limit, cursor)
+        return page_response(response, [to_playlist(playlist) for playlist in playlists], next_cursor, cursor)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
     except Exception as e:
         logger.error(f"Error retrieving playlists: {e}")
         return []
 
 
 @router.get("/{playlist_id}")
-async def get_playlist_by_id_v3(playlist_id: str) -> PlaylistDTO:
+async def get_playlist_by_id_v3(playlist_id: str, db=Depends(get_async_db_pg_read)) -> PlaylistDTO:
     try:
-        dao = PostgresPlaylistDAO()
-        playlist = dao.get_playlist_by_id(playlist_id)
+        playlist = await AsyncPostgresPlaylistDAO(db).get_playlist_by_id(playlist_id)
         all_clips = getattr(playlist, 'clips', []) or []
         return to_playlist_dto(playlist, all_clips)
     except Exception as e:
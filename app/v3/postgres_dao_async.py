@@ -0,0 +1,87 @@
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.logging_config import get_logger
+from models.entities import Clip, Playlist, Profile
+from services.loading import JOINED, playlist_options, profile_options
+from services.pagination import InvalidCursor
+from storage.builders import parse_uuid
+from storage.sql import SqlRepository
+from v1.dao_sqlite_async import first
+from v3.postgres_dao import PostgresClipDAO, PostgresPlaylistDAO, PostgresProfileDAO
+
+logger = get_logger(__name__)
+
+
+class AsyncPostgresClipDAO:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_clip(self, clip_data: dict):
+        return await self.db.run_sync(lambda db: PostgresClipDAO(db).create_clip(clip_data))
+
+    async def get_clip_by_id(self, clip_id: str) -> Optional[Clip]:
+        try:
+            return await first(self.db, select(Clip).where(Clip.id == parse_uuid(clip_id)))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error getting clips: {e}")
+
+    async def get_clips_page(self, limit: int = 25, cursor: Optional[str] = None, offset: int = 0, sort: str = "created_at"):
+        try:
+            return await self.db.run_sync(lambda db: SqlRepository(db).list_clips(limit, cursor, offset, sort))
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error getting clips: {e}")
+
+
+class AsyncPostgresPlaylistDAO:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_playlist(self, playlist_data: dict):
+        return await self.db.run_sync(lambda db: PostgresPlaylistDAO(db).create_playlist(playlist_data))
+
+    async def get_playlist_by_id(self, playlist_id: str, strategy: Optional[str] = JOINED) -> Optional[Playlist]:
+        try:
+            return await first(self.db, select(Playlist).options(*playlist_options(strategy)).where(Playlist.id == parse_uuid(playlist_id)))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error getting Playlist: {e}")
+
+    async def get_playlists_page(self, limit: int = 25, cursor: Optional[str] = None, skip: int = 0):
+        try:
+            return await self.db.run_sync(lambda db: SqlRepository(db).list_playlists(limit, cursor, skip))
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error getting Playlist: {e}")
+
+
+class AsyncPostgresProfileDAO:
+    def __init__(self, db: AsyncSession, strategy: Optional[str] = None):
+        self.db = db
+        self.strategy = strategy
+
+    async def create_profile(self, profile_data: dict):
+        return await self.db.run_sync(lambda db: PostgresProfileDAO(db).create_profile(profile_data))
+
+    async def get_profile_by_handle(self, handle: str, strategy: Optional[str] = None) -> Optional[Profile]:
+        try:
+            options = profile_options(strategy or self.strategy)
+            return await first(self.db, select(Profile).options(*options).where(Profile.handle == handle))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error getting profile: {e}")
+
+    async def save_profile_with_relationships(self, data: dict):
+        return await self.db.run_sync(lambda db: PostgresProfileDAO(db).save_profile_with_relationships(data))
+
+    async def get_profiles_page(self, limit: int = 25, cursor: Optional[str] = None, skip: int = 0):
+        try:
+            return await self.db.run_sync(lambda db: SqlRepository(db, self.strategy).list_profiles(limit, cursor, skip))
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error getting profile: {e}")
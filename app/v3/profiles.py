@@ -1,9 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
-from v3.postgres_dao import PostgresProfileDAO
+from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from config.async_session import get_async_db_pg, get_async_db_pg_read, get_async_sessionmaker
+from v3.postgres_dao_async import AsyncPostgresProfileDAO
 from config.logging_config import get_logger
+from services.loading import loading_strategy
 from services.mappers import to_profile_dto
+from models.page import Page
 from models.profile import ProfileDTO
-from services.api import fetch_profile_from_suno
+from services.pagination import InvalidCursor, invalid_cursor, page_response
+from services.api import fetch_profile_from_suno, is_live, is_snapshot
+from storage.builders import build_profile
+from services.refresh_scheduler import refresh_scheduler
+from services.singleflight import get_flight
 
 
 logger = get_logger(__name__)
@@ -11,31 +19,29 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("")
-def get_profiles_v3() -> list[ProfileDTO]:
+@router.get("", response_model=Union[List[ProfileDTO], Page[ProfileDTO]])
+async def get_profiles_v3(response: Response, limit: int = Query(25, ge=1, le=100), cursor: Optional[str] = None, strategy: Optional[str] = Depends(loading_strategy), db=Depends(get_async_db_pg_read)):
     try:
-        dao = PostgresProfileDAO()
-        profiles = dao.get_all_profiles()
+        profiles, next_cursor = await AsyncPostgresProfileDAO(db, strategy).get_profiles_page(limit, cursor)
         if profiles is None or (hasattr(profiles, '__len__') and len(profiles) == 0):
-            return []
-        return [to_profile_dto(profile) for profile in profiles]
+            return page_response(response, [], None, cursor)
+        return page_response(response, [to_profile_dto(profile) for profile in profiles], next_cursor, cursor)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
     except Exception as e:
         logger.error(f"Error retrieving profiles: {e}")
         return []
 
 
 @router.get("/{profile_handle}")
-def get_profile_by_handle_v3(profile_handle: str) -> ProfileDTO:
+async def get_profile_by_handle_v3(profile_handle: str, strategy: Optional[str] = Depends(loading_strategy), db=Depends(get_async_db_pg)) -> ProfileDTO:
     try:
-        dao = PostgresProfileDAO()
-        profile = dao.get_profile_by_handle(profile_handle)
+        dao = AsyncPostgresProfileDAO(db, strategy)
+        profile = await dao.get_profile_by_handle(profile_handle)
+        refresh_scheduler.record_request("postgres", "profile", profile_handle)
         
         if not profile:
-
-            data = fetch_profile_from_suno(profile_handle)
-            if not data:
-                raise HTTPException(status_code=404, detail=f"Profile '{profile_handle}' not found")
-            profile = dao.save_profile_with_relationships(data)
+            profile = await refresh_profile(dao, profile_handle)
             if profile:
                 return to_profile_dto(profile)
             else:
@@ -46,13 +52,7 @@ def get_profile_by_handle_v3(profile_handle: str) -> ProfileDTO:
             
             
             if clips_count == 0 or playlists_count == 0:
-                data = fetch_profile_from_suno(profile_handle)
-                if data:
-                    profile = dao.save_profile_with_relationships(data)
-                else:
-                    profile = dao.get_profile_by_handle(profile_handle)
-            else:
-                profile = dao.get_profile_by_handle(profile_handle)
+                refresh_scheduler.request_refresh("postgres", "profile", profile_handle, staleness=2.0)
         
             if profile:
                 return to_profile_dto(profile)
@@ -61,3 +61,29 @@ def get_profile_by_handle_v3(profile_handle: str) -> ProfileDTO:
     
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Profile '{profile_handle}' not found or database unavailable")
+
+
+async def refresh_profile(dao: AsyncPostgresProfileDAO, profile_handle: str):
+    async def fetch_and_save():
+        data = await fetch_profile_from_suno(profile_handle)
+        if is_live(data):
+            await dao.save_profile_with_relationships(data)
+        return data
+
+    async def recheck():
+        profile = await dao.get_profile_by_handle(profile_handle)
+        return True if profile and profile.clips and profile.playlists else None
+
+    data = await get_flight("postgres").do(("profile", profile_handle), fetch_and_save, recheck)
+    profile = await dao.get_profile_by_handle(profile_handle)
+    if profile is None and is_snapshot(data):
+        return build_profile(data)
+    return profile
+
+
+async def refresh_profile_job(profile_handle: str) -> bool:
+    async with get_async_sessionmaker("postgres")() as db:
+        return await refresh_profile(AsyncPostgresProfileDAO(db), profile_handle) is not None
+
+
+refresh_scheduler.register("postgres", "profile", refresh_profile_job)
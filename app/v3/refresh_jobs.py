@@ -0,0 +1,33 @@
+from functools import partial
+
+from config.async_session import get_async_sessionmaker
+from config.session import SessionPG
+from services.api import fetch_clip_from_suno, fetch_playlist_from_suno, is_live
+from services.refresh_scheduler import refresh_scheduler
+from services.singleflight import get_flight
+from storage.sql import SqlRepository
+from v1.refresh_jobs import stale_entities
+
+
+async def refresh_entity(kind: str, entity_id: str, fetch) -> bool:
+    async def fetch_and_save():
+        data = await fetch(entity_id)
+        if is_live(data):
+            async with get_async_sessionmaker("postgres")() as db:
+                await db.run_sync(lambda sync_db: SqlRepository(sync_db).save(kind, [data]))
+        return data
+
+    return is_live(await get_flight("postgres").do((kind, entity_id), fetch_and_save))
+
+
+async def refresh_playlist_job(playlist_id: str) -> bool:
+    return await refresh_entity("playlist", playlist_id, fetch_playlist_from_suno)
+
+
+async def refresh_clip_job(clip_id: str) -> bool:
+    return await refresh_entity("clip", clip_id, fetch_clip_from_suno)
+
+
+refresh_scheduler.register("postgres", "playlist", refresh_playlist_job)
+refresh_scheduler.register("postgres", "clip", refresh_clip_job)
+refresh_scheduler.register_stale_source(partial(stale_entities, store="postgres", session_factory=SessionPG))